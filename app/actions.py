@@ -5,39 +5,45 @@ from typing import List, Dict, Optional
 from dateutil import parser as date_parser
 from rapidfuzz import process as rf_process, fuzz as rf_fuzz
 import os
+import time
+from datetime import date
 
-# Transformers imports
-from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
-import torch
+from . import metrics, thread_budget
+from .ml_registry import ML_BACKEND, registry
+from .nlp.cache import MISS, sentence_cache
+
+# transformers / torch are imported inside the loader so importing this module is cheap
 
 # Model names (can be overridden via env)
 NER_MODEL = os.getenv("NER_MODEL", "dslim/bert-base-NER")
 HF_CACHE = os.getenv("HF_CACHE_DIR", r"D:\projects\ai-meeting-notes\models\hf_cache")
 
-# Lazy-loaded HF pipeline
-_NER_PIPE = None
-
 def _device_idx():
     try:
+        import torch
         return 0 if torch.cuda.is_available() else -1
     except Exception:
         return -1
 
+def _load_ner_pipeline():
+    """Registry loader; use get_ner_pipeline() instead of calling this directly."""
+    device = _device_idx()
+    try:
+        from transformers import pipeline, AutoModelForTokenClassification
+        from .model_loading import load_model, load_tokenizer
+
+        # load with explicit cache_dir to avoid network at runtime
+        tokenizer = load_tokenizer(NER_MODEL, cache_dir=HF_CACHE)
+        model = load_model(AutoModelForTokenClassification, NER_MODEL, cache_dir=HF_CACHE)
+        return pipeline("ner", model=model, tokenizer=tokenizer,
+                        aggregation_strategy="simple", device=device)
+    except Exception as e:
+        # if HF pipeline fails, return None and fall back to regex
+        print("NER pipeline load failed:", e)
+        return None
+
 def get_ner_pipeline():
-    global _NER_PIPE
-    if _NER_PIPE is None:
-        device = _device_idx()
-        try:
-            # load with explicit cache_dir to avoid network at runtime
-            tokenizer = AutoTokenizer.from_pretrained(NER_MODEL, cache_dir=HF_CACHE)
-            model = AutoModelForTokenClassification.from_pretrained(NER_MODEL, cache_dir=HF_CACHE)
-            _NER_PIPE = pipeline("ner", model=model, tokenizer=tokenizer,
-                                 aggregation_strategy="simple", device=device)
-        except Exception as e:
-            # if HF pipeline fails, set to None and fall back to regex
-            print("NER pipeline load failed:", e)
-            _NER_PIPE = None
-    return _NER_PIPE
+    return registry.get("ner")
 
 # Simple name regex fallback
 NAME_PATTERN = r"\b([A-Z][a-z]{1,}\s?[A-Z]?[a-z]{0,})\b"
@@ -53,7 +59,7 @@ DEADLINE_PATTERNS = [
     r"\b(?P<deadline>next\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday))\b",
 ]
 
-def _parse_deadline(text: str) -> Optional[str]:
+def _parse_deadline_uncached(text: str) -> Optional[str]:
     for pat in DEADLINE_PATTERNS:
         m = re.search(pat, text, flags=re.IGNORECASE)
         if m and m.groupdict().get("deadline"):
@@ -70,13 +76,38 @@ def _parse_deadline(text: str) -> Optional[str]:
     except Exception:
         return None
 
+def _parse_deadline(text: str) -> Optional[str]:
+    # relative phrases resolve against today, so the date is part of the key
+    today = date.today().isoformat()
+    deadline = sentence_cache.get("deadline", today, text)
+    if deadline is MISS:
+        deadline = _parse_deadline_uncached(text)
+        sentence_cache.put("deadline", today, text, deadline)
+    return deadline
+
+# cached NER results are only valid for the model that produced them
+_NER_CACHE_NS = f"{ML_BACKEND}:{NER_MODEL}"
+
+def _ner_persons(pipe, sentence: str) -> List[str]:
+    """Person-like entities in the sentence, memoized per sentence (see app/nlp/cache.py)."""
+    persons = sentence_cache.get("ner", _NER_CACHE_NS, sentence)
+    if persons is not MISS:
+        return persons
+    with thread_budget.stage("torch"):
+        started = time.perf_counter()
+        ents = pipe(sentence)
+    metrics.NER_SECONDS.observe(time.perf_counter() - started)
+    metrics.NER_BATCH_SIZE.observe(1)
+    # ents is a list of aggregated dicts: [{'entity_group':'PER','score':..,'word':'John Doe'}]
+    persons = [e['word'].strip() for e in ents if e.get('entity_group') in ('PER','PERSON','ORG','MISC')]
+    sentence_cache.put("ner", _NER_CACHE_NS, sentence, persons)
+    return persons
+
 def _find_assignee_hf(sentence: str, participants: Optional[List[str]] = None) -> Optional[str]:
     pipe = get_ner_pipeline()
     if pipe:
         try:
-            ents = pipe(sentence)
-            # ents is a list of aggregated dicts: [{'entity_group':'PER','score':..,'word':'John Doe'}]
-            persons = [e['word'].strip() for e in ents if e.get('entity_group') in ('PER','PERSON','ORG','MISC')]
+            persons = _ner_persons(pipe, sentence)
             if persons:
                 candidate = persons[0]
                 if participants:
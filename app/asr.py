@@ -1,17 +1,21 @@
 # backend/app/asr.py
 from __future__ import annotations
 
+import io
 import os
 import tempfile
+import wave
 import asyncio
-from typing import Dict, Any, List
+import importlib.util
+import time
+import threading
+from typing import Dict, Any, AsyncIterator, Iterator
 
-# Attempt to import faster-whisper but do NOT raise during import; support lazy init
-HAS_FASTER_WHISPER = True
-try:
-    from faster_whisper import WhisperModel
-except Exception:
-    HAS_FASTER_WHISPER = False
+from . import metrics, thread_budget
+from .ml_registry import registry
+
+# faster-whisper is imported lazily by _load_model so importing this module stays cheap
+HAS_FASTER_WHISPER = importlib.util.find_spec("faster_whisper") is not None
 
 # ===============================
 # CONFIG (SAFE DEFAULTS)
@@ -22,77 +26,162 @@ WHISPER_MODEL_PATH = "tiny"
 
 # IMPORTANT: int8 is best for CPU, float16 ONLY for CUDA
 COMPUTE_TYPE = "int8"
-MODEL: WhisperModel | None = None
+MODEL = None  # faster_whisper.WhisperModel once loaded
 
 
 # ===============================
 # MODEL INIT
 # ===============================
 
-def init_model(device_preference: str = None, model_path: str = None, compute_type: str = None):
+def _load_model():
+    """Registry loader; use get_model() instead of calling this directly."""
     global MODEL, WHISPER_DEVICE, WHISPER_MODEL_PATH, COMPUTE_TYPE
 
     if not HAS_FASTER_WHISPER:
         print("[asr] faster-whisper not installed; ASR disabled.")
-        return
+        return None
 
     WHISPER_DEVICE = "cpu"
     WHISPER_MODEL_PATH = "tiny"
     COMPUTE_TYPE = "int8"
 
     try:
+        from faster_whisper import WhisperModel
+
         print(f"[asr] initializing whisper model from: {WHISPER_MODEL_PATH} device={WHISPER_DEVICE} compute_type={COMPUTE_TYPE}")
+        from .model_loading import MODEL_OFFLINE
         MODEL = WhisperModel(
             WHISPER_MODEL_PATH,
             device=WHISPER_DEVICE,
             compute_type=COMPUTE_TYPE,
+            cpu_threads=thread_budget.threads("asr"),
+            local_files_only=MODEL_OFFLINE,
         )
         print("[asr] ASR model initialized successfully")
     except Exception as e:
         print("[asr] ASR completely unavailable:", e)
         MODEL = None
+    return MODEL
+
+
+def get_model():
+    return registry.get("whisper")
+
+
+def init_model(device_preference: str = None, model_path: str = None, compute_type: str = None):
+    """Eagerly load the model (kept for scripts; the app loads lazily)."""
+    return get_model()
 
 # ===============================
 # TRANSCRIPTION
 # ===============================
 
+def _unavailable(contents: bytes, filename: str) -> str:
+    return f"[Audio uploaded: {filename} | {len(contents)} bytes]\n\n⚠️ Automatic transcription is currently unavailable."
+
+
+def estimate_seconds(contents: bytes, filename: str = "upload") -> float:
+    """Audio duration for scheduling: read from the header for WAV, ~128 kbit/s otherwise."""
+    try:
+        with wave.open(io.BytesIO(contents), "rb") as w:
+            return w.getnframes() / float(w.getframerate())
+    except Exception:
+        return len(contents) / 16000.0
+
+
+def _write_temp(contents: bytes, filename: str) -> str:
+    suffix = os.path.splitext(filename)[-1] or ".wav"
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tf:
+        tf.write(contents)
+        return tf.name
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except Exception:
+        pass
+
+
 async def transcribe_bytes(contents: bytes, filename: str = "upload") -> Dict[str, Any]:
     """
     Transcribe given audio bytes.
     Gracefully degrades if ASR unavailable.
     """
-    if MODEL is None:
+    loop = asyncio.get_running_loop()
+    # first call pays the model load, off the event loop
+    model = await loop.run_in_executor(None, get_model)
+    if model is None:
         return {
-            "text": f"[Audio uploaded: {filename} | {len(contents)} bytes]\n\n⚠️ Automatic transcription is currently unavailable.",
+            "text": _unavailable(contents, filename),
             "segments": [],
             "duration_seconds": 0.0,
         }
 
-    suffix = os.path.splitext(filename)[-1] or ".wav"
-
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tf:
-        tf.write(contents)
-        tmp_path = tf.name
-
+    tmp_path = _write_temp(contents, filename)
     try:
-        loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(None, _sync_transcribe, tmp_path)
     finally:
-        try:
-            os.remove(tmp_path)
-        except Exception:
-            pass
+        _remove(tmp_path)
 
     return result
 
 
-def _sync_transcribe(path: str) -> Dict[str, Any]:
+async def stream_transcribe_bytes(contents: bytes, filename: str = "upload") -> AsyncIterator[Dict[str, Any]]:
     """
-    Blocking whisper call (runs in executor).
+    Like transcribe_bytes, but yields events while Whisper decodes:
+    {"type": "info"}, then one {"type": "segment"} per segment, then {"type": "end"}.
+    Closing the iterator early stops decoding.
     """
-    segments = []
+    loop = asyncio.get_running_loop()
+    model = await loop.run_in_executor(None, get_model)
+    if model is None:
+        yield {"type": "error", "detail": _unavailable(contents, filename)}
+        return
+
+    events: asyncio.Queue = asyncio.Queue()   # event dicts, then None once produce() exits
+    stop = threading.Event()
 
-    transcribe_result = MODEL.transcribe(
+    def put(event):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    def produce(path):
+        # runs in the executor; segments cross to the loop as soon as each is decoded
+        end = 0.0
+        try:
+            # decoding is lazy, so the share is held until the last segment
+            with thread_budget.stage("asr"):
+                started = time.perf_counter()
+                seg_iter, info = _start_transcription(path)
+                put({"type": "info", "language": getattr(info, "language", None), "duration": getattr(info, "duration", None)})
+                for segment in _segment_dicts(seg_iter):
+                    if stop.is_set():
+                        return
+                    end = segment["end"]
+                    put({"type": "segment", **segment})
+            _record_asr(started, info, end)
+            put({"type": "end", "duration_seconds": end})
+        except Exception as e:
+            print("[asr] streaming transcription failed:", e)
+            put({"type": "error", "detail": "transcription failed"})
+        finally:
+            _remove(path)
+            put(None)
+
+    loop.run_in_executor(None, produce, _write_temp(contents, filename))
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield event
+    finally:
+        # consumer gone (e.g. client disconnected): the producer exits after its current segment
+        stop.set()
+
+
+def _start_transcription(path: str):
+    transcribe_result = get_model().transcribe(
         path,
         beam_size=5,
         language=None,
@@ -100,23 +189,42 @@ def _sync_transcribe(path: str) -> Dict[str, Any]:
     )
 
     if isinstance(transcribe_result, tuple) and len(transcribe_result) == 2:
-        seg_iter, _info = transcribe_result
-    else:
-        seg_iter = transcribe_result
+        return transcribe_result
+    return transcribe_result, None
 
-    full_text_parts: List[str] = []
 
+def _segment_dicts(seg_iter) -> Iterator[Dict[str, Any]]:
     for seg in seg_iter:
         start = float(getattr(seg, "start", 0.0))
         end = float(getattr(seg, "end", 0.0))
         text = str(getattr(seg, "text", "")).strip()
 
         if text:
-            segments.append({"start": start, "end": end, "text": text})
-            full_text_parts.append(text)
+            yield {"start": start, "end": end, "text": text}
+
+
+def _record_asr(started: float, info, duration_seconds: float):
+    # faster-whisper decodes lazily, so the wall time only ends once seg_iter is drained
+    elapsed = time.perf_counter() - started
+    audio_seconds = float(getattr(info, "duration", None) or duration_seconds)
+    metrics.ASR_SECONDS.observe(elapsed)
+    metrics.ASR_AUDIO_SECONDS.inc(audio_seconds)
+    if elapsed > 0 and audio_seconds > 0:
+        metrics.ASR_RTF.observe(audio_seconds / elapsed)
+
+
+def _sync_transcribe(path: str) -> Dict[str, Any]:
+    """
+    Blocking whisper call (runs in executor).
+    """
+    with thread_budget.stage("asr"):
+        started = time.perf_counter()
+        seg_iter, info = _start_transcription(path)
+        segments = list(_segment_dicts(seg_iter))
 
-    full_text = " ".join(full_text_parts).strip()
+    full_text = " ".join(s["text"] for s in segments).strip()
     duration_seconds = max((s["end"] for s in segments), default=0.0)
+    _record_asr(started, info, duration_seconds)
 
     return {
         "text": full_text,
@@ -3,10 +3,13 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .security import SECRET_KEY, ALGORITHM
-from ..database import get_db
+from .principal_cache import principal_cache, Principal, AUTH_TRUST_CLAIMS
+from ..database import get_db, get_async_db
 from .. import models
 
 oauth2_scheme_optional = OAuth2PasswordBearer(
@@ -18,6 +21,40 @@ oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/api/auth/login"
 )
 
+def _decode(token: str):
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    return payload if payload.get("sub") else None
+
+
+def _user_filter(sub):
+    # ✅ BACKWARD-COMPAT FIX
+    if str(sub).isdigit():
+        return models.User.id == int(sub)
+    return models.User.email == sub
+
+
+def _cached_principal(payload: dict):
+    """Return (cache key, principal or None) without touching the DB."""
+    key = (str(payload["sub"]), payload.get("exp"))
+    principal = principal_cache.get(key)
+    if principal is None and AUTH_TRUST_CLAIMS:
+        principal = Principal.from_claims(payload)
+        if principal is not None:
+            principal_cache.put(key, principal, payload.get("exp"))
+    return key, principal
+
+
+def _remember(key, payload: dict, user):
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    principal_cache.put(key, principal, payload.get("exp"))
+    return principal
+
+
 def get_current_user_optional(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme_optional),
@@ -25,25 +62,36 @@ def get_current_user_optional(
     if not token:
         return None
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        sub = payload.get("sub")
-        if not sub:
-            return None
-
-        # ✅ BACKWARD-COMPAT FIX
-        if str(sub).isdigit():
-            return db.query(models.User).filter(
-                models.User.id == int(sub)
-            ).first()
-        else:
-            return db.query(models.User).filter(
-                models.User.email == sub
-            ).first()
+    payload = _decode(token)
+    if not payload:
+        return None
 
-    except JWTError:
+    key, principal = _cached_principal(payload)
+    if principal is not None:
+        return principal
+
+    user = db.query(models.User).filter(_user_filter(payload["sub"])).first()
+    return _remember(key, payload, user)
+
+
+async def get_current_user_optional_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme_optional),
+):
+    if not token:
+        return None
+
+    payload = _decode(token)
+    if not payload:
         return None
 
+    key, principal = _cached_principal(payload)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(select(models.User).where(_user_filter(payload["sub"])))
+    return _remember(key, payload, result.scalars().first())
+
 def get_current_user_required(
     user=Depends(get_current_user_optional),
 ):
@@ -48,6 +48,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
     # ✅ JWT sub MUST BE USER.ID (NOT EMAIL)
     access_token = create_access_token({
         "sub": str(user.id),
+        "email": user.email,
         "name": user.name,
     })
 
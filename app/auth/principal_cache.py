@@ -0,0 +1,125 @@
+# backend/app/auth/principal_cache.py
+# Short-lived cache of authenticated principals so token checks skip the users
+# SELECT on every request.
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+
+from .. import models
+
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+# build the principal from the signed token alone (no DB hit, no revocation until exp)
+AUTH_TRUST_CLAIMS = os.getenv("AUTH_TRUST_CLAIMS", "false").lower() == "true"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Slim, session-independent view of a User."""
+    id: int
+    email: Optional[str] = None
+    name: Optional[str] = None
+    full_name: Optional[str] = None
+    is_active: bool = True
+
+    @classmethod
+    def from_user(cls, user: "models.User") -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            full_name=user.full_name,
+            is_active=bool(user.is_active) if user.is_active is not None else True,
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["Principal"]:
+        sub = payload.get("sub")
+        if sub is None or not str(sub).isdigit():
+            # legacy email subjects need the DB to resolve the id
+            return None
+        return cls(id=int(sub), email=payload.get("email"), name=payload.get("name"))
+
+
+class PrincipalCache:
+    """Bounded LRU of (sub, exp) -> Principal with a TTL capped at the token expiry."""
+
+    def __init__(self, maxsize: int = AUTH_CACHE_MAX_ENTRIES, ttl: float = AUTH_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (expires_at, principal)
+        self._by_user = {}              # user id -> set of keys
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[Principal]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, principal: Principal, token_exp: Optional[float] = None):
+        expires_at = time.time() + self.ttl
+        if token_exp:
+            expires_at = min(expires_at, float(token_exp))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires_at, principal)
+            self._by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[1].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[1].id]
+
+
+principal_cache = PrincipalCache()
+
+
+# Drop cached principals as soon as this process changes or deletes the user.
+# Other workers converge within AUTH_CACHE_TTL_SECONDS.
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_user(_mapper, _connection, target):
+    principal_cache.invalidate_user(target.id)
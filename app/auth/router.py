@@ -1,33 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
+import time
 from .schemas import UserSignup, UserLogin, TokenOut
-from .security import hash_password, verify_password, create_access_token
+from .security import (
+    create_access_token,
+    hash_password_async,
+    verify_and_update_async,
+    record_login,
+    hashing_stats,
+    PasswordHasherBusy,
+)
 from ..database import get_db
+from ..routers.admin import require_admin
 from .. import models
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+
+def _user_by_email(db: Session, email: str):
+    return db.query(models.User).filter(models.User.email == email).first()
+
+
+def _save(db: Session, obj):
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+def _busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent sign-ins, please retry",
+        headers={"Retry-After": "1"},
+    )
+
 # =====================
 # SIGNUP
 # =====================
 
 @router.post("/signup", response_model=TokenOut)
-def signup(payload: UserSignup, db: Session = Depends(get_db)):
-    existing = db.query(models.User).filter(models.User.email == payload.email).first()
+async def signup(payload: UserSignup, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(_user_by_email, db, payload.email)
     if existing:
         raise HTTPException(400, "Email already registered")
 
+    try:
+        hashed = await hash_password_async(payload.password)
+    except PasswordHasherBusy:
+        raise _busy()
+
     user = models.User(
         email=payload.email,
         full_name=payload.full_name,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    user = await run_in_threadpool(_save, db, user)
 
-    token = create_access_token({"sub": user.id})
+    token = create_access_token({"sub": str(user.id), "email": user.email})
     return {"access_token": token}
 
 # =====================
@@ -35,29 +67,56 @@ def signup(payload: UserSignup, db: Session = Depends(get_db)):
 # =====================
 
 @router.post("/login")
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
-    user = db.query(models.User).filter(
-        models.User.email == form_data.username
-    ).first()
+    started = time.perf_counter()
+    user = await run_in_threadpool(_user_by_email, db, form_data.username)
+
+    ok, new_hash = False, None
+    if user and user.hashed_password:
+        try:
+            ok, new_hash = await verify_and_update_async(form_data.password, user.hashed_password)
+        except PasswordHasherBusy:
+            raise _busy()
+        except ValueError:
+            # not a bcrypt hash (e.g. the google-oauth placeholder)
+            ok = False
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not ok:
+        record_login(time.perf_counter() - started, ok=False)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
+    # read before a commit expires the instance
+    user_id, email, full_name = user.id, user.email, user.full_name
+
+    if new_hash:
+        # cost factor changed since this hash was made: upgrade it transparently
+        user.hashed_password = new_hash
+        await run_in_threadpool(db.commit)
+
     access_token = create_access_token(
-        data={"sub": str(user.id)}
+        data={"sub": str(user_id), "email": email}
     )
+    record_login(time.perf_counter() - started, ok=True, rehashed=bool(new_hash))
 
     return {
         "access_token": access_token,
         "token_type": "bearer",
         "user": {
-        "name": user.full_name,
-        "email": user.email
+        "name": full_name,
+        "email": email
     }
     }
+
+# =====================
+# STATS
+# =====================
+
+@router.get("/stats", dependencies=[Depends(require_admin)])
+def auth_stats():
+    return hashing_stats()
@@ -1,7 +1,12 @@
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from jose import jwt
 from passlib.context import CryptContext
+import asyncio
 import os
+import threading
+import time
 
 # =====================
 # CONFIG
@@ -11,7 +16,20 @@ SECRET_KEY = os.getenv("SECRET_KEY", "CHANGE_THIS_IN_PRODUCTION")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt work factor; hashes made at any other cost are upgraded on next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# dedicated hashing threads so login bursts don't starve the request threadpool
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
 
 # =====================
 # PASSWORD HASHING
@@ -28,6 +46,103 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(safe_plain, hashed)
 
 
+def verify_and_update(plain: str, hashed: str):
+    """Verify and, if the stored hash uses another cost, return a fresh hash.
+
+    Returns (ok, new_hash_or_None).
+    """
+    safe_plain = plain.encode("utf-8")[:72].decode("utf-8", errors="ignore")
+    return pwd_context.verify_and_update(safe_plain, hashed)
+
+
+# =====================
+# HASHING EXECUTOR
+# =====================
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; callers should answer 503."""
+
+
+_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="pwhash",
+)
+_pending = 0
+_pending_lock = threading.Lock()
+
+_STATS_WINDOW = 2048
+_stats_lock = threading.Lock()
+_hash_latencies = deque(maxlen=_STATS_WINDOW)
+_login_latencies = deque(maxlen=_STATS_WINDOW)
+_login_times = deque(maxlen=_STATS_WINDOW)
+_counters = {"logins": 0, "login_failures": 0, "rehashes": 0, "rejected": 0}
+
+
+async def _run_hashing(fn, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= PASSWORD_HASH_MAX_PENDING:
+            _counters["rejected"] += 1
+            raise PasswordHasherBusy()
+        _pending += 1
+
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, fn, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+        with _stats_lock:
+            _hash_latencies.append(time.perf_counter() - started)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+
+async def verify_and_update_async(plain: str, hashed: str):
+    return await _run_hashing(verify_and_update, plain, hashed)
+
+
+def record_login(seconds: float, ok: bool, rehashed: bool = False):
+    with _stats_lock:
+        _login_latencies.append(seconds)
+        _login_times.append(time.time())
+        _counters["logins"] += 1
+        if not ok:
+            _counters["login_failures"] += 1
+        if rehashed:
+            _counters["rehashes"] += 1
+
+
+def _percentiles(samples) -> dict:
+    data = sorted(samples)
+    if not data:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+
+    def pct(p):
+        return round(data[min(len(data) - 1, int(len(data) * p))] * 1000, 2)
+
+    return {"p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99)}
+
+
+def hashing_stats() -> dict:
+    now = time.time()
+    with _stats_lock:
+        recent = sum(1 for t in _login_times if now - t <= 60)
+        stats = {
+            **_counters,
+            "bcrypt_rounds": BCRYPT_ROUNDS,
+            "workers": PASSWORD_HASH_WORKERS,
+            "pending": _pending,
+            "logins_per_second_1m": round(recent / 60, 3),
+            "login": _percentiles(_login_latencies),
+            "hash": _percentiles(_hash_latencies),
+        }
+    return stats
+
+
 # =====================
 # JWT
 # =====================
@@ -0,0 +1,104 @@
+# backend/app/batch_export.py
+# Batch PDF export: renders many meetings in a process pool and writes them into
+# a ZIP file that the client downloads once the job is done.
+import multiprocessing
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional
+
+from sqlalchemy.orm import selectinload
+
+from . import models, pdf_export
+from .database import SessionLocal
+from .jobs import jobs, Job
+
+EXPORT_PROCESSES = int(os.getenv("EXPORT_PROCESSES", str(min(4, os.cpu_count() or 1))))
+EXPORT_MAX_MEETINGS = int(os.getenv("EXPORT_MAX_MEETINGS", "1000"))
+EXPORT_TRANSCRIPT_CHARS = int(os.getenv("EXPORT_TRANSCRIPT_CHARS", "2000"))
+# meetings loaded per DB round-trip; keeps the session's identity map small
+_LOAD_CHUNK = 50
+# renders in flight per job; bounds the snapshots and PDFs held in memory
+_WINDOW = 2 * EXPORT_PROCESSES
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the API process has threads and open DB connections
+            _pool = ProcessPoolExecutor(
+                max_workers=EXPORT_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _snapshots(meeting_ids: List[int], transcript_chars: int):
+    db = SessionLocal()
+    try:
+        for i in range(0, len(meeting_ids), _LOAD_CHUNK):
+            chunk = meeting_ids[i:i + _LOAD_CHUNK]
+            meetings = (
+                db.query(models.Meeting)
+                .options(selectinload(models.Meeting.tasks))
+                .filter(models.Meeting.id.in_(chunk))
+                .all()
+            )
+            for m in meetings:
+                yield pdf_export.meeting_snapshot(m, tasks=m.tasks, transcript_chars=transcript_chars)
+            db.expunge_all()
+    finally:
+        db.close()
+
+
+def _run(job: Job, meeting_ids: List[int], transcript_chars: int):
+    jobs.start(job)
+    fd, path = tempfile.mkstemp(prefix=f"export-{job.id}-", suffix=".zip")
+    os.close(fd)
+    snapshots = _snapshots(meeting_ids, transcript_chars)
+    try:
+        pool = get_pool()
+        pending = {}
+
+        def submit_next():
+            snap = next(snapshots, None)
+            if snap is not None:
+                pending[pool.submit(pdf_export.render_pdf, snap)] = snap["id"]
+
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as zf:
+            for _ in range(_WINDOW):
+                submit_next()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    # PDFs are already compressed; store them as-is
+                    zf.writestr(f"meeting-{pending.pop(fut)}.pdf", fut.result())
+                    jobs.progress(job)
+                    submit_next()
+        jobs.finish(job, result_path=path, result_name=f"meetings-export-{job.id[:8]}.zip")
+    except Exception as e:
+        print("[batch_export] job failed:", e)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        jobs.fail(job, str(e))
+    finally:
+        snapshots.close()
+
+
+def start(meeting_ids: List[int], owner_id: Optional[int], transcript_chars: int = EXPORT_TRANSCRIPT_CHARS) -> Job:
+    job = jobs.create("meetings_pdf_zip", owner_id, total=len(meeting_ids))
+    threading.Thread(
+        target=_run,
+        args=(job, meeting_ids, transcript_chars),
+        name=f"export-{job.id[:8]}",
+        daemon=True,
+    ).start()
+    return job
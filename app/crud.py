@@ -1,23 +1,31 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import json
 
-from . import models, schemas
+from . import models, schemas, quota, search, semantic
 
 
-def add_transcript_and_summary(
-    db: Session,
-    meeting_id: int,
-    transcript: str = None,
-    summary: str = None,
-):
+def _get_or_create_meeting(db: Session, meeting_id: int):
     meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
     if meeting is None:
         meeting = models.Meeting(id=meeting_id, title=f"Meeting {meeting_id}")
         db.add(meeting)
+        quota.increment(db, quota.MEETINGS_TOTAL)
+        quota.increment(db, quota.ANON_MEETINGS)
         db.commit()
         db.refresh(meeting)
+    return meeting
+
+
+def add_transcript_and_summary(
+    db: Session,
+    meeting_id: int,
+    transcript: str = None,
+    summary: str = None,
+):
+    meeting = _get_or_create_meeting(db, meeting_id)
 
     if transcript is not None:
         meeting.transcript = transcript
@@ -26,16 +34,26 @@ def add_transcript_and_summary(
 
     db.commit()
     db.refresh(meeting)
+    if transcript is not None or summary is not None:
+        semantic.schedule_index(meeting.id)
     return meeting
 
 
-def create_task(
+def append_transcript(
     db: Session,
     meeting_id: int,
-    task_obj,
+    text: str,
 ):
-    title_val = ""
-    assigned = None
+    """Append finalized live-transcription text to the meeting transcript."""
+    meeting = _get_or_create_meeting(db, meeting_id)
+    meeting.transcript = f"{meeting.transcript} {text}".strip() if meeting.transcript else text
+    db.commit()
+    semantic.schedule_index(meeting_id)
+    return meeting
+
+
+def _task_values(meeting_id: int, task_obj) -> Dict[str, Any]:
+    """Normalize a TaskCreate / dict / plain value into Task column values."""
     due_dt = None
     metadata_content = None
 
@@ -50,7 +68,9 @@ def create_task(
     assigned = tdict.get("assigned_to") or tdict.get("assignee")
 
     due_date_raw = tdict.get("due_date")
-    if due_date_raw:
+    if isinstance(due_date_raw, datetime):
+        due_dt = due_date_raw
+    elif due_date_raw:
         try:
             from dateutil import parser as date_parser
             due_dt = date_parser.parse(due_date_raw)
@@ -59,16 +79,24 @@ def create_task(
 
     meta = {k: v for k, v in tdict.items() if k not in ("title", "assigned_to", "assignee", "due_date")}
     if meta:
-        metadata_content = json.dumps(meta)
-
-    task = models.Task(
-        meeting_id=meeting_id,
-        title=title_val,
-        assigned_to=assigned,
-        due_date=due_dt,
-        completed=False,
-        metadata_json=metadata_content,
-    )
+        metadata_content = json.dumps(meta, default=str)
+
+    return {
+        "meeting_id": meeting_id,
+        "title": title_val,
+        "assigned_to": assigned,
+        "due_date": due_dt,
+        "completed": False,
+        "metadata_json": metadata_content,
+    }
+
+
+def create_task(
+    db: Session,
+    meeting_id: int,
+    task_obj,
+):
+    task = models.Task(**_task_values(meeting_id, task_obj))
 
     db.add(task)
     db.commit()
@@ -76,21 +104,153 @@ def create_task(
     return task
 
 
+def bulk_create_tasks(
+    db: Session,
+    meeting_id: int,
+    task_objs: List[Any],
+):
+    """Insert many tasks for one meeting in a single transaction.
+
+    On Postgres this is one multi-row INSERT ... RETURNING; elsewhere the rows
+    go through bulk_insert_mappings and are read back with one SELECT.
+    """
+    rows = [_task_values(meeting_id, t) for t in task_objs]
+    if not rows:
+        return []
+
+    if db.bind.dialect.name == "postgresql":
+        table = models.Task.__table__
+        # the Core table names the metadata column "metadata", not "metadata_json"
+        values = [
+            {("metadata" if k == "metadata_json" else k): v for k, v in r.items()}
+            for r in rows
+        ]
+        created = db.execute(table.insert().values(values).returning(*table.c)).all()
+        search.index_meetings(db, [meeting_id])
+        db.commit()
+        return created
+
+    db.bulk_insert_mappings(models.Task, rows, return_defaults=True)
+    ids = [r["id"] for r in rows]
+    # bulk mappings skip the flush events that keep the search index current
+    search.index_meetings(db, [meeting_id])
+    db.commit()
+    return (
+        db.query(models.Task)
+        .filter(models.Task.id.in_(ids))
+        .order_by(models.Task.id)
+        .all()
+    )
+
+
+def bulk_update_tasks(
+    db: Session,
+    updates: List[Any],
+):
+    """Apply partial updates to many tasks with executemany UPDATEs and one commit.
+
+    Each update is a TaskBulkUpdateItem (or dict) carrying the task ``id`` plus
+    only the fields to change.
+    """
+    mappings = []
+    ids = []
+    for u in updates:
+        data = u.dict(exclude_unset=True) if hasattr(u, "dict") else dict(u)
+        ids.append(data["id"])
+        if len(data) > 1:
+            mappings.append(data)
+
+    if mappings:
+        db.bulk_update_mappings(models.Task, mappings)
+        retitled = [m["id"] for m in mappings if "title" in m]
+        if retitled:
+            meeting_ids = db.query(models.Task.meeting_id).filter(models.Task.id.in_(retitled)).distinct()
+            search.index_meetings(db, [mid for (mid,) in meeting_ids])
+    db.commit()
+
+    return (
+        db.query(models.Task)
+        .filter(models.Task.id.in_(ids))
+        .order_by(models.Task.id)
+        .all()
+    )
+
+
+def task_filters(
+    meeting_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+) -> list:
+    """WHERE clauses for task listings; shared with crud_async."""
+    clauses = []
+    if user_id:
+        clauses.append(models.Meeting.owner_id == user_id)
+    if meeting_id:
+        clauses.append(models.Task.meeting_id == meeting_id)
+    if completed is not None:
+        clauses.append(models.Task.completed == completed)
+    if due_after is not None:
+        clauses.append(models.Task.due_date >= due_after)
+    if due_before is not None:
+        clauses.append(models.Task.due_date < due_before)
+    return clauses
+
+
 def list_tasks(
     db: Session,
     meeting_id: Optional[int] = None,
     user_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
 ):
-    q = db.query(models.Task).join(models.Meeting)
+    q = (
+        db.query(models.Task)
+        .join(models.Meeting)
+        .filter(*task_filters(meeting_id, user_id, completed, due_after, due_before))
+        .order_by(models.Task.id)
+    )
 
-    if user_id:
-        q = q.filter(models.Meeting.owner_id == user_id)
-    if meeting_id:
-        q = q.filter(models.Task.meeting_id == meeting_id)
+    if skip:
+        q = q.offset(skip)
+    if limit is not None:
+        q = q.limit(limit)
 
     return q.all()
 
 
+# Versions for conditional GETs: cheap aggregates that never touch the transcript.
+# Any insert, update or delete of the covered rows changes the tuple.
+def meeting_version_query(meeting_id: int):
+    return (
+        select(models.Meeting.updated_at, func.count(models.Task.id), func.max(models.Task.updated_at), func.max(models.Task.id))
+        .outerjoin(models.Task, models.Task.meeting_id == models.Meeting.id)
+        .where(models.Meeting.id == meeting_id)
+        .group_by(models.Meeting.id)
+    )
+
+
+def tasks_version_query(*filters):
+    # covers every page of the listing, so it is valid for any skip/limit
+    return (
+        select(func.count(models.Task.id), func.max(models.Task.updated_at), func.max(models.Task.id))
+        .join(models.Meeting)
+        .where(*task_filters(*filters))
+    )
+
+
+def meeting_version(db: Session, meeting_id: int):
+    return db.execute(meeting_version_query(meeting_id)).first()
+
+
+def tasks_version(db: Session, *filters):
+    return db.execute(tasks_version_query(*filters)).first()
+
+
 def get_meeting(db: Session, meeting_id: int):
     return db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
 
@@ -105,6 +265,7 @@ def create_meeting(
         owner_id=owner_id,
     )
     db.add(m)
+    quota.increment(db, quota.MEETINGS_TOTAL)
     db.commit()
     db.refresh(m)
     return m
@@ -0,0 +1,107 @@
+# backend/app/crud_async.py
+# AsyncSession counterparts of the hot paths in crud.py (used when DB_ASYNC=true).
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from . import crud, models, quota, semantic
+
+
+async def get_meeting(db: AsyncSession, meeting_id: int):
+    # MeetingOut serializes tasks, and lazy loads are not allowed under asyncio
+    result = await db.execute(
+        select(models.Meeting)
+        .options(selectinload(models.Meeting.tasks))
+        .where(models.Meeting.id == meeting_id)
+    )
+    return result.scalars().first()
+
+
+async def meeting_version(db: AsyncSession, meeting_id: int):
+    return (await db.execute(crud.meeting_version_query(meeting_id))).first()
+
+
+async def tasks_version(db: AsyncSession, *filters):
+    return (await db.execute(crud.tasks_version_query(*filters))).first()
+
+
+async def list_meetings(
+    db: AsyncSession,
+    owner_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 50,
+):
+    q = select(models.Meeting).options(selectinload(models.Meeting.tasks))
+    if owner_id is None:
+        q = q.where(models.Meeting.owner_id == None)  # noqa: E711
+    else:
+        q = q.where(models.Meeting.owner_id == owner_id)
+
+    result = await db.execute(q.offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+async def list_tasks(
+    db: AsyncSession,
+    meeting_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    skip: int = 0,
+    limit: Optional[int] = None,
+):
+    q = (
+        select(models.Task)
+        .join(models.Meeting)
+        .where(*crud.task_filters(meeting_id, user_id, completed, due_after, due_before))
+        .order_by(models.Task.id)
+    )
+
+    if skip:
+        q = q.offset(skip)
+    if limit is not None:
+        q = q.limit(limit)
+
+    result = await db.execute(q)
+    return result.scalars().all()
+
+
+async def update_task(db: AsyncSession, task_id: int, fields: Dict[str, Any]):
+    task = await db.get(models.Task, task_id)
+    if task is None:
+        return None
+
+    for field, value in fields.items():
+        setattr(task, field, value)
+
+    await db.commit()
+    await db.refresh(task)
+    return task
+
+
+async def add_transcript_and_summary(
+    db: AsyncSession,
+    meeting_id: int,
+    transcript: str = None,
+    summary: str = None,
+):
+    meeting = await db.get(models.Meeting, meeting_id)
+    if meeting is None:
+        meeting = models.Meeting(id=meeting_id, title=f"Meeting {meeting_id}")
+        db.add(meeting)
+        await db.run_sync(quota.increment, quota.MEETINGS_TOTAL)
+        await db.run_sync(quota.increment, quota.ANON_MEETINGS)
+
+    if transcript is not None:
+        meeting.transcript = transcript
+    if summary is not None:
+        meeting.summary = summary
+
+    await db.commit()
+    await db.refresh(meeting)
+    if transcript is not None or summary is not None:
+        semantic.schedule_index(meeting.id)
+    return meeting
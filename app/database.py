@@ -1,10 +1,15 @@
 # backend/app/database.py
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
+from . import metrics, profiling
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ai_meetings.db")
@@ -17,14 +22,127 @@ if DATABASE_URL.startswith("postgresql://"):
         1,
     )
 
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/").endswith("sqlite:"))
+
+# ===============================
+# POOL CONFIG (env overridable)
+# ===============================
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# recycle connections before the server / proxy drops them (Railway idles out ~5 min);
+# with a recycle interval set, the per-checkout pre-ping round-trip is off by default
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "280"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false" if DB_POOL_RECYCLE > 0 else "true").lower() == "true"
+
+# SQLite PRAGMAs applied to every new connection
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(64 * 1024 * 1024)))
+
+
+def _engine_kwargs():
+    kwargs = {
+        "connect_args": {"check_same_thread": False} if IS_SQLITE else {},
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    # in-memory SQLite keeps SQLAlchemy's default single-connection pool
+    if not IS_SQLITE_MEMORY:
+        kwargs.update(
+            poolclass=QueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE if DB_POOL_RECYCLE > 0 else -1,
+        )
+    return kwargs
+
+
 # ⚙️ Engine configuration
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}
-    if DATABASE_URL.startswith("sqlite")
-    else {},
-    pool_pre_ping=True,   # prevents stale connections (important on Railway)
-)
+engine = create_engine(DATABASE_URL, **_engine_kwargs())
+
+
+def _apply_sqlite_pragmas(dbapi_conn, _record):
+    cur = dbapi_conn.cursor()
+    try:
+        if not IS_SQLITE_MEMORY:
+            cur.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+            cur.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cur.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cur.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    finally:
+        cur.close()
+
+
+# ===============================
+# POOL METRICS
+# ===============================
+
+_pool_lock = threading.Lock()
+_pool_metrics = {
+    "connects": 0,
+    "checkouts": 0,
+    "checkins": 0,
+    "checked_out": 0,
+    "max_checked_out": 0,
+    "hold_seconds_total": 0.0,
+}
+
+
+def _on_connect(_dbapi_conn, _record):
+    with _pool_lock:
+        _pool_metrics["connects"] += 1
+
+
+def _on_checkout(_dbapi_conn, record, _proxy):
+    record.info["checkout_at"] = time.perf_counter()
+    with _pool_lock:
+        _pool_metrics["checkouts"] += 1
+        _pool_metrics["checked_out"] += 1
+        _pool_metrics["max_checked_out"] = max(_pool_metrics["max_checked_out"], _pool_metrics["checked_out"])
+
+
+def _on_checkin(_dbapi_conn, record):
+    started = record.info.pop("checkout_at", None)
+    with _pool_lock:
+        _pool_metrics["checkins"] += 1
+        _pool_metrics["checked_out"] = max(0, _pool_metrics["checked_out"] - 1)
+        if started is not None:
+            _pool_metrics["hold_seconds_total"] += time.perf_counter() - started
+
+
+def _instrument(sync_engine):
+    if IS_SQLITE:
+        event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
+    event.listen(sync_engine, "connect", _on_connect)
+    event.listen(sync_engine, "checkout", _on_checkout)
+    event.listen(sync_engine, "checkin", _on_checkin)
+    metrics.instrument_engine(sync_engine)
+    if profiling.PROFILING_ENABLED:
+        profiling.instrument_engine(sync_engine)
+
+
+_instrument(engine)
+
+
+def pool_stats() -> dict:
+    """Snapshot of connection pool usage (counters since process start)."""
+    with _pool_lock:
+        stats = dict(_pool_metrics)
+    pool = engine.pool
+    stats["pool_class"] = type(pool).__name__
+    if isinstance(pool, QueuePool):
+        stats.update(
+            pool_size=pool.size(),
+            idle=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=DB_MAX_OVERFLOW,
+        )
+    return stats
+
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -41,3 +159,54 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ===============================
+# OPTIONAL ASYNC ENGINE
+# ===============================
+# DB_ASYNC=true serves the hot API paths through an asyncio engine
+# (aiosqlite / asyncpg) so those endpoints never park a threadpool worker on I/O.
+
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
+
+
+def _async_url(url: str) -> str:
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[url.index(":"):]
+    if url.startswith("postgresql"):
+        return "postgresql+asyncpg" + url[url.index(":"):]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+    _async_kwargs = {"pool_pre_ping": DB_POOL_PRE_PING}
+    # aiosqlite keeps its dialect default pool; sizing only applies to server databases
+    if not IS_SQLITE:
+        _async_kwargs.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE if DB_POOL_RECYCLE > 0 else -1,
+        )
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_kwargs)
+    _instrument(async_engine.sync_engine)
+
+    AsyncSessionLocal = sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,112 @@
+# backend/app/http_cache.py
+# Small helpers for conditional GET (ETag / If-None-Match, Last-Modified /
+# If-Modified-Since), the JSON response class for hot reads, and gzip.
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware as _GZipMiddleware, GZipResponder as _GZipResponder
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:
+    class FastJSONResponse(JSONResponse):
+        """Stdlib fallback; schemas.*_out_dict leave datetimes for the encoder."""
+
+        def render(self, content) -> bytes:
+            return super().render(jsonable_encoder(content))
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value covers etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def _opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    wanted = _opaque(etag)
+    return any(_opaque(candidate) == wanted for candidate in if_none_match.split(","))
+
+
+# ===============================
+# VALIDATORS
+# ===============================
+
+def version_etag(*parts) -> str:
+    """Weak ETag over a row version tuple; weak because gzip changes the bytes."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def http_date(dt: datetime) -> str:
+    # naive datetimes in the DB are UTC (datetime.utcnow defaults)
+    return format_datetime(dt.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return parsedate_to_datetime(value).astimezone(timezone.utc).replace(tzinfo=None)
+    except (TypeError, ValueError):
+        return None
+
+
+def not_modified(
+    etag: str,
+    last_modified: Optional[datetime],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """RFC 9110 precedence: If-Modified-Since only counts without If-None-Match."""
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    since = _parse_http_date(if_modified_since)
+    return bool(last_modified and since and last_modified.replace(microsecond=0) <= since)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+# ===============================
+# GZIP
+# ===============================
+
+# streams must reach the client chunk by chunk; archives and PDFs are already compressed
+GZIP_SKIP_TYPES = ("text/event-stream", "application/x-ndjson", "application/zip", "application/pdf")
+
+
+class _Responder(_GZipResponder):
+    async def send_with_gzip(self, message):
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            await super().send_with_gzip(message)
+            if content_type.startswith(GZIP_SKIP_TYPES):
+                # reuse the pass-through path for responses that set their own encoding
+                self.content_encoding_set = True
+            return
+        await super().send_with_gzip(message)
+
+
+class GZipMiddleware(_GZipMiddleware):
+    """Starlette's GZipMiddleware, minus the content types in GZIP_SKIP_TYPES."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _Responder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,162 @@
+# backend/app/inference_client.py
+# API-worker side of the shared inference sidecar (app/inference_server.py).
+# The proxies below stand in for the real models in app.ml_registry when
+# INFERENCE_SOCKET is set, so callers keep using the same interfaces.
+#
+# Requests are pickled, so the socket is only as safe as its auth key. Both sides
+# take it from INFERENCE_AUTHKEY, or read it from INFERENCE_AUTHKEY_FILE (a file
+# only its owner can read; `python -m app.inference_server --generate-key` writes
+# one). There is no default key.
+import os
+import secrets
+import stat
+import threading
+from multiprocessing.connection import Client
+from types import SimpleNamespace
+from typing import List, Optional
+
+INFERENCE_AUTHKEY_FILE = os.getenv("INFERENCE_AUTHKEY_FILE")
+
+
+class InferenceError(RuntimeError):
+    pass
+
+
+def generate_authkey(path: str):
+    """Write a random key to path (mode 0600) unless the file already exists."""
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return
+    with os.fdopen(fd, "w") as f:
+        f.write(secrets.token_hex(32))
+
+
+def load_authkey(path: str = None) -> bytes:
+    """The shared auth key; raises InferenceError if none is configured."""
+    key = os.getenv("INFERENCE_AUTHKEY")
+    if key:
+        return key.encode()
+    path = path or INFERENCE_AUTHKEY_FILE
+    if not path:
+        raise InferenceError("set INFERENCE_AUTHKEY or INFERENCE_AUTHKEY_FILE for the inference sidecar")
+    try:
+        mode = os.stat(path).st_mode
+        if mode & (stat.S_IRWXG | stat.S_IRWXO):
+            raise InferenceError(f"{path} must not be readable by group or others (chmod 600)")
+        with open(path) as f:
+            key = f.read().strip()
+    except OSError as e:
+        raise InferenceError(f"cannot read inference auth key: {e}")
+    if not key:
+        raise InferenceError(f"{path} is empty")
+    return key.encode()
+
+
+class InferenceClient:
+    """One persistent connection per calling thread (requests are synchronous)."""
+
+    def __init__(self, address: str, authkey: bytes = None):
+        self.address = address
+        self.authkey = authkey or load_authkey()
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def call(self, op: str, *args):
+        # one retry covers a sidecar restart between calls
+        for attempt in (1, 2):
+            try:
+                conn = self._conn()
+                conn.send((op, args))
+                status, payload = conn.recv()
+                break
+            except (EOFError, OSError):
+                self._reset()
+                if attempt == 2:
+                    raise
+        if status != "ok":
+            raise InferenceError(payload)
+        return payload
+
+
+_client: Optional[InferenceClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> InferenceClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            from .ml_registry import INFERENCE_SOCKET
+            _client = InferenceClient(INFERENCE_SOCKET)
+        return _client
+
+
+def remote_model(name: str, proxy_cls):
+    """Proxy for a sidecar model, or None if the sidecar could not load it."""
+    if not get_client().call("load", name):
+        return None
+    return proxy_cls()
+
+
+# ===============================
+# MODEL PROXIES
+# ===============================
+
+class RemoteSummarizer:
+    """Callable like a transformers summarization pipeline."""
+
+    def __call__(self, text, **kwargs):
+        return get_client().call("summarize", text, kwargs)
+
+
+class RemoteNer:
+    """Callable like the aggregated transformers NER pipeline."""
+
+    def __call__(self, inputs):
+        return get_client().call("ner", inputs)
+
+
+class RemoteWhisper:
+    """Just enough of faster_whisper.WhisperModel for asr._sync_transcribe."""
+
+    def transcribe(self, audio, **kwargs):
+        # the sidecar runs on the same host, so file paths are shared
+        segments, info = get_client().call("transcribe", audio, kwargs)
+        return iter([SimpleNamespace(**s) for s in segments]), SimpleNamespace(**info)
+
+
+class RemoteSpacy:
+    """spaCy Docs don't travel well; the sidecar runs the whole extractor."""
+
+    remote = True
+
+    def extract_action_items(self, text: str, participants: Optional[List[str]] = None):
+        return get_client().call("extract_tasks", text, participants)
+
+
+class RemoteEmbedder:
+    """Sentence embeddings from the sidecar's encoder (numpy arrays pickle as-is)."""
+
+    def __init__(self):
+        self.dim = None
+
+    def encode(self, texts: List[str]):
+        vectors = get_client().call("embed", list(texts))
+        self.dim = vectors.shape[1]
+        return vectors
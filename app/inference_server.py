@@ -0,0 +1,143 @@
+# backend/app/inference_server.py
+# Shared inference sidecar: loads Whisper, the summarizer, spaCy and BERT NER once
+# and serves every API worker on the host over a Unix socket, instead of each
+# uvicorn worker holding its own copy of the weights.
+#
+#     export INFERENCE_AUTHKEY_FILE=/run/ai-notes/inference.key
+#     python -m app.inference_server --socket /tmp/ai-notes-inference.sock --generate-key
+#     INFERENCE_SOCKET=/tmp/ai-notes-inference.sock uvicorn app.main:app --workers 4
+import argparse
+import os
+import sys
+import threading
+from multiprocessing.connection import Listener
+
+from . import ml_registry, thread_budget
+from .inference_client import INFERENCE_AUTHKEY_FILE, InferenceError, generate_authkey, load_authkey
+from .ml_registry import registry
+
+# concurrent model calls; extra requests wait for a slot
+INFERENCE_CONCURRENCY = int(os.getenv("INFERENCE_CONCURRENCY", "2"))
+
+_slots = threading.BoundedSemaphore(INFERENCE_CONCURRENCY)
+
+
+def _load(name):
+    return registry.get(name) is not None
+
+
+# model calls hold their engine's thread share, as they would in an API worker
+def _summarize(text, kwargs):
+    with thread_budget.stage("torch"):
+        return registry.get("summarizer")(text, **kwargs)
+
+
+def _ner(inputs):
+    with thread_budget.stage("torch"):
+        return registry.get("ner")(inputs)
+
+
+def _transcribe(audio, kwargs):
+    with thread_budget.stage("asr"):
+        seg_iter, info = registry.get("whisper").transcribe(audio, **kwargs)
+        segments = [
+            {"start": float(s.start), "end": float(s.end), "text": s.text}
+            for s in seg_iter
+        ]
+    info = {
+        "language": getattr(info, "language", None),
+        "duration": getattr(info, "duration", None),
+    }
+    return segments, info
+
+
+def _embed(texts):
+    with thread_budget.stage("torch"):
+        return registry.get("embedder").encode(texts)
+
+
+def _extract_tasks(text, participants):
+    from .nlp import tasks
+    return tasks.extract_action_items(text, participants)
+
+
+HANDLERS = {
+    "load": _load,
+    "status": lambda: registry.status(),
+    "summarize": _summarize,
+    "ner": _ner,
+    "transcribe": _transcribe,
+    "extract_tasks": _extract_tasks,
+    "embed": _embed,
+}
+
+
+def _serve_connection(conn):
+    with conn:
+        while True:
+            try:
+                op, args = conn.recv()
+            except (EOFError, OSError):
+                return
+            handler = HANDLERS.get(op)
+            if handler is None:
+                conn.send(("error", f"unknown op: {op}"))
+                continue
+            try:
+                if op in ("load", "status"):
+                    result = handler(*args)
+                else:
+                    with _slots:
+                        result = handler(*args)
+                conn.send(("ok", result))
+            except Exception as e:
+                print(f"[inference] {op} failed:", e)
+                conn.send(("error", str(e)))
+
+
+def serve(socket_path: str, authkey: bytes, warmup: bool = True):
+    ml_registry.serve_locally()
+    if warmup:
+        registry.warmup()
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    listener = Listener(socket_path, family="AF_UNIX", authkey=authkey)
+    os.chmod(socket_path, 0o600)
+    print(f"[inference] serving {list(registry.status())} on {socket_path}")
+
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                # bad authkey or a client that hung up during the handshake
+                print("[inference] rejected connection:", e)
+                continue
+            threading.Thread(target=_serve_connection, args=(conn,), daemon=True).start()
+    finally:
+        listener.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Shared model server for API workers")
+    ap.add_argument("--socket", default=ml_registry.INFERENCE_SOCKET or "/tmp/ai-notes-inference.sock")
+    ap.add_argument("--no-warmup", action="store_true")
+    ap.add_argument("--key-file", default=INFERENCE_AUTHKEY_FILE, help="auth key file (default INFERENCE_AUTHKEY_FILE)")
+    ap.add_argument("--generate-key", action="store_true", help="create --key-file with a random key if it is missing")
+    args = ap.parse_args()
+
+    if args.generate_key and not os.getenv("INFERENCE_AUTHKEY"):
+        if not args.key_file:
+            sys.exit("[inference] --generate-key needs --key-file or INFERENCE_AUTHKEY_FILE")
+        generate_authkey(args.key_file)
+    try:
+        authkey = load_authkey(args.key_file)
+    except InferenceError as e:
+        # requests are pickled; never listen without a secret key
+        sys.exit(f"[inference] refusing to start: {e}")
+    serve(args.socket, authkey, warmup=not args.no_warmup)
+
+
+if __name__ == "__main__":
+    main()
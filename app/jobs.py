@@ -0,0 +1,107 @@
+# backend/app/jobs.py
+# In-process registry for long-running background jobs (status polling + result files).
+#
+# Jobs live in the worker process that accepted them; behind several workers,
+# status/download requests need sticky routing or a single export worker.
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    kind: str
+    owner_id: Optional[int]
+    total: int = 0
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = QUEUED
+    done: int = 0
+    error: Optional[str] = None
+    result_path: Optional[str] = None
+    result_name: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "total": self.total,
+            "done": self.done,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "download_ready": self.status == DONE and self.result_path is not None,
+        }
+
+
+class JobRegistry:
+    def __init__(self, ttl: int = JOB_TTL_SECONDS):
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def create(self, kind: str, owner_id: Optional[int], total: int = 0) -> Job:
+        self.sweep()
+        job = Job(kind=kind, owner_id=owner_id, total=total)
+        with self._lock:
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self.sweep()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def progress(self, job: Job, n: int = 1):
+        with self._lock:
+            job.done += n
+
+    def start(self, job: Job):
+        with self._lock:
+            job.status = RUNNING
+
+    def finish(self, job: Job, result_path: Optional[str] = None, result_name: Optional[str] = None):
+        with self._lock:
+            job.status = DONE
+            job.result_path = result_path
+            job.result_name = result_name
+            job.finished_at = time.time()
+
+    def fail(self, job: Job, error: str):
+        with self._lock:
+            job.status = FAILED
+            job.error = error
+            job.finished_at = time.time()
+
+    def active(self) -> int:
+        with self._lock:
+            return sum(1 for j in self._jobs.values() if j.status in (QUEUED, RUNNING))
+
+    def sweep(self):
+        """Forget finished jobs older than the TTL and delete their result files."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [j for j in self._jobs.values() if j.finished_at and j.finished_at < cutoff]
+            for j in expired:
+                del self._jobs[j.id]
+        for j in expired:
+            if j.result_path:
+                try:
+                    os.remove(j.result_path)
+                except OSError:
+                    pass
+
+
+jobs = JobRegistry()
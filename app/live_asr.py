@@ -0,0 +1,245 @@
+# backend/app/live_asr.py
+# Incremental transcription for live meetings (see the /ws/transcribe websocket).
+# Audio accumulates as 16-bit mono PCM. Every LIVE_STEP_SECONDS of new audio the
+# uncommitted tail (kept to about LIVE_WINDOW_SECONDS) is re-transcribed with the
+# shared Whisper model. Segments that end well before the tail are final and leave the
+# buffer; the last one is reported as a partial until more audio confirms it.
+import os
+import queue
+import tempfile
+import threading
+import time
+import wave
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import metrics, thread_budget
+from .asr import get_model
+
+LIVE_STEP_SECONDS = float(os.getenv("LIVE_STEP_SECONDS", "2.0"))
+LIVE_WINDOW_SECONDS = float(os.getenv("LIVE_WINDOW_SECONDS", "20.0"))
+# a segment is final once it ends this far before the newest audio
+LIVE_FINAL_LAG_SECONDS = float(os.getenv("LIVE_FINAL_LAG_SECONDS", "1.5"))
+LIVE_SAMPLE_RATE = 16000
+# accepted client rates for raw PCM (Whisper resamples to 16 kHz itself)
+MIN_SAMPLE_RATE, MAX_SAMPLE_RATE = 8000, 48000
+
+PCM_FORMATS = ("s16le", "f32le")
+CONTAINER_FORMATS = ("webm", "ogg")
+
+
+def _f32_to_s16(data: bytes) -> bytes:
+    # runs on the event loop for every frame, so keep it vectorized
+    samples = np.frombuffer(data[: len(data) - len(data) % 4], dtype="<f4")
+    return (np.clip(samples.astype(np.float64), -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+class _ContainerDecoder:
+    """Decodes a growing WebM/Ogg (Opus) stream to s16 mono PCM on a background thread.
+
+    MediaRecorder chunks are not decodable on their own, so the chunks are fed to one
+    long-lived PyAV demuxer through a blocking file-like object.
+    """
+
+    def __init__(self, sample_rate: int):
+        self._chunks: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._pending = b""
+        self._pcm = bytearray()
+        self._lock = threading.Lock()
+        self.sample_rate = sample_rate
+        self.error: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, name="live-decoder", daemon=True)
+        self._thread.start()
+
+    # file-like interface for av.open
+    def read(self, size: int = -1) -> bytes:
+        while not self._pending:
+            chunk = self._chunks.get()
+            if chunk is None:
+                return b""
+            self._pending = chunk
+        if size < 0 or size >= len(self._pending):
+            data, self._pending = self._pending, b""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def _run(self):
+        try:
+            import av  # installed with faster-whisper
+            container = av.open(self, mode="r")
+            resampler = av.AudioResampler(format="s16", layout="mono", rate=self.sample_rate)
+            for frame in container.decode(audio=0):
+                for out in resampler.resample(frame):
+                    with self._lock:
+                        self._pcm += out.to_ndarray().tobytes()
+        except Exception as e:
+            self.error = str(e)
+            print("[live_asr] decoder stopped:", e)
+            self._discard()
+
+    def _discard(self):
+        # nothing reads the queue once the decoder is gone
+        try:
+            while True:
+                self._chunks.get_nowait()
+        except queue.Empty:
+            pass
+
+    def check(self):
+        if self.error is not None:
+            self._discard()
+            raise ValueError(f"cannot decode audio stream: {self.error}")
+
+    def feed(self, data: bytes):
+        self.check()
+        self._chunks.put(data)
+
+    def close(self, timeout: float = 10.0):
+        self._chunks.put(None)
+        self._thread.join(timeout)
+
+    def take(self) -> bytes:
+        with self._lock:
+            data = bytes(self._pcm)
+            self._pcm.clear()
+        return data
+
+
+class LiveTranscriber:
+    """Rolling-window transcriber; feed() runs on the event loop, step() in an executor."""
+
+    def __init__(self, audio_format: str = "s16le", sample_rate: int = LIVE_SAMPLE_RATE, language: Optional[str] = None):
+        if audio_format not in PCM_FORMATS + CONTAINER_FORMATS:
+            raise ValueError(f"unsupported audio format: {audio_format}")
+        if audio_format in PCM_FORMATS and not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+            raise ValueError(f"sample_rate must be between {MIN_SAMPLE_RATE} and {MAX_SAMPLE_RATE} Hz")
+        self.audio_format = audio_format
+        self.sample_rate = LIVE_SAMPLE_RATE if audio_format in CONTAINER_FORMATS else sample_rate
+        self.language = language
+        self._decoder = _ContainerDecoder(self.sample_rate) if audio_format in CONTAINER_FORMATS else None
+        self._lock = threading.Lock()
+        self._pcm = bytearray()      # uncommitted audio, s16le mono
+        self._offset = 0.0           # stream time of self._pcm[0]
+        self._new_bytes = 0          # audio added since the last step
+        self.finals: List[Dict] = []
+
+    # ---------- input ----------
+    def feed(self, data: bytes):
+        if self._decoder is not None:
+            self._decoder.feed(data)
+            return
+        if self.audio_format == "f32le":
+            data = _f32_to_s16(data)
+        self._append(data)
+
+    def _append(self, pcm: bytes):
+        with self._lock:
+            self._pcm += pcm
+            self._new_bytes += len(pcm)
+
+    def _drain_decoder(self):
+        if self._decoder is not None:
+            self._append(self._decoder.take())
+
+    def check(self):
+        """Raise ValueError once the container decoder has given up on the input."""
+        if self._decoder is not None:
+            self._decoder.check()
+
+    def _seconds(self, nbytes: int) -> float:
+        return nbytes / 2.0 / self.sample_rate
+
+    def ready(self) -> bool:
+        self.check()
+        self._drain_decoder()
+        return self._seconds(self._new_bytes) >= LIVE_STEP_SECONDS
+
+    @property
+    def duration(self) -> float:
+        return self._offset + self._seconds(len(self._pcm))
+
+    # ---------- transcription (blocking; run in an executor) ----------
+    def _transcribe(self, pcm: bytes, offset: float) -> List[Dict]:
+        model = get_model()
+        if model is None:
+            raise RuntimeError("ASR model unavailable")
+
+        # a wav file works with every backend (local Whisper, the sidecar, synthetic)
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tf:
+            path = tf.name
+        try:
+            with wave.open(path, "wb") as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(self.sample_rate)
+                w.writeframes(pcm)
+            prompt = " ".join(s["text"] for s in self.finals[-3:])[-200:] or None
+            with thread_budget.stage("asr"):
+                started = time.perf_counter()
+                seg_iter, _info = model.transcribe(
+                    path,
+                    beam_size=1,
+                    language=self.language,
+                    vad_filter=False,
+                    initial_prompt=prompt,
+                )
+                segments = [
+                    {"start": offset + float(s.start), "end": offset + float(s.end), "text": str(s.text).strip()}
+                    for s in seg_iter
+                ]
+            metrics.ASR_SECONDS.observe(time.perf_counter() - started)
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return [s for s in segments if s["text"]]
+
+    def step(self, final: bool = False) -> Tuple[List[Dict], Optional[Dict]]:
+        """Transcribe the uncommitted audio; returns (newly final segments, current partial)."""
+        self._drain_decoder()
+        with self._lock:
+            pcm, offset = bytes(self._pcm), self._offset
+            self._new_bytes = 0
+        if not pcm:
+            return [], None
+        end = offset + self._seconds(len(pcm))
+
+        segments = self._transcribe(pcm, offset)
+        if final:
+            done, partial = segments, None
+            commit_to = end
+        elif not segments:
+            # silence: keep only the tail that a new word could still be starting in
+            done, partial = [], None
+            commit_to = end - LIVE_FINAL_LAG_SECONDS
+        else:
+            cutoff = end - LIVE_FINAL_LAG_SECONDS
+            done = [s for s in segments[:-1] if s["end"] <= cutoff]
+            if end - offset >= LIVE_WINDOW_SECONDS:
+                # no pause long enough: force progress so the window stays bounded
+                done = segments[:-1] or segments
+            partial = segments[len(done)] if len(segments) > len(done) else None
+            commit_to = done[-1]["end"] if done else offset
+
+        self._commit(commit_to)
+        self.finals.extend(done)
+        return done, partial
+
+    def _commit(self, until: float):
+        with self._lock:
+            drop = int((until - self._offset) * self.sample_rate) * 2
+            drop = max(0, min(len(self._pcm), drop))
+            del self._pcm[:drop]
+            self._offset += self._seconds(drop)
+
+    def finish(self) -> Tuple[List[Dict], Optional[Dict]]:
+        if self._decoder is not None:
+            self._decoder.close()
+        return self.step(final=True)
+
+    @property
+    def transcript(self) -> str:
+        return " ".join(s["text"] for s in self.finals).strip()
@@ -1,5 +1,7 @@
 # backend/app/main.py
 from fastapi import FastAPI
+import asyncio
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 import os
@@ -7,19 +9,34 @@ from app.ml_guard import DISABLE_ML
 
 from app.routers.core import router as core_router
 from app.auth.google import router as google_router
-from app import database
+from app.auth.router import router as auth_router
+from app.routers.admin import router as admin_router
+from app import database, quota, search
+from app.metrics import MetricsMiddleware, REGISTRY as metrics_registry, monitor_event_loop
+from app import profiling, scheduler, thread_budget
+from app.http_cache import GZipMiddleware
 
-DISABLE_ML = os.getenv("DISABLE_ML", "false").lower() == "true"
-
-# Import ML modules ONLY if enabled
+# No ML library is imported from here: models load lazily through
+# app.ml_registry on first use, or in the background warmup below.
+from app.ml_registry import registry as ml_registry, ML_WARMUP, ML_BACKEND
 
+# gate /ready on warm models too (avoids cold first requests behind a load balancer)
+READY_REQUIRES_MODELS = os.getenv("READY_REQUIRES_MODELS", "false").lower() == "true"
+# seconds between event loop lag probes (0 disables the probe)
+EVENT_LOOP_MONITOR_INTERVAL = float(os.getenv("EVENT_LOOP_MONITOR_INTERVAL", "0.1"))
 
 app = FastAPI(title="AI Meeting Notes")
 
 # ---------------------------
 # Routers
 # ---------------------------
+if database.DB_ASYNC:
+    # async twins of the hot paths must be registered first to take precedence
+    from app.routers.core_async import router as core_async_router
+    app.include_router(core_async_router, prefix="/api")
 app.include_router(core_router, prefix="/api")
+app.include_router(auth_router, prefix="/api")
+app.include_router(admin_router, prefix="/api")
 app.include_router(google_router, prefix="/api/auth", tags=["auth"])
 
 # ---------------------------
@@ -44,6 +61,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# transcripts compress well; small bodies and streams are passed through
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MIN_SIZE", "1024")),
+    compresslevel=int(os.getenv("GZIP_LEVEL", "5")),
+)
+
+# opt-in; not installed at all unless PROFILE_SAMPLE_RATE or PROFILE_SLOW_MS is set
+if profiling.PROFILING_ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
+
+# outermost, so latency includes the other middleware
+app.add_middleware(MetricsMiddleware)
+
 # ---------------------------
 # Startup
 # ---------------------------
@@ -52,19 +83,29 @@ def startup():
     # DB
     database.Base.metadata.create_all(bind=database.engine)
     print("[startup] database tables ensured")
+    search.ensure_index(database.engine)
+
+    db = database.SessionLocal()
+    try:
+        quota.seed_counters(db)
+    finally:
+        db.close()
 
     if DISABLE_ML:
         print("[startup] ML DISABLED — backend running in API-only mode")
         return
 
-    # 🔥 IMPORT ML ONLY HERE
-    from app import asr, summarizer, actions
-    from app.nlp import tasks as tasks_module
+    print(f"[startup] CPU thread budget: {thread_budget.describe()}")
+    print(f"[startup] ML scheduler: {scheduler.describe()}")
+    # load models after the port is open; requests before that load on demand
+    if ML_WARMUP:
+        ml_registry.warmup_in_background()
+
 
-    asr.init_model()
-    summarizer.get_summarizer()
-    tasks_module.init_spacy()
-    actions.get_ner_pipeline()
+@app.on_event("startup")
+async def start_event_loop_monitor():
+    if EVENT_LOOP_MONITOR_INTERVAL > 0:
+        app.state.loop_monitor = asyncio.create_task(monitor_event_loop(EVENT_LOOP_MONITOR_INTERVAL))
 
 # ---------------------------
 # Root
@@ -73,5 +114,45 @@ def startup():
 def root():
     return {
         "message": "API running",
-        "ml_enabled": not DISABLE_ML
+        "ml_enabled": not DISABLE_ML,
+        "ml_backend": ML_BACKEND,
     }
+
+
+# ---------------------------
+# Probes
+# ---------------------------
+@app.get("/live", include_in_schema=False)
+def live():
+    return {"status": "alive"}
+
+
+@app.get("/ready", include_in_schema=False)
+def ready():
+    models = ml_registry.status()
+    try:
+        with database.engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1")
+        db_ok = True
+    except Exception:
+        db_ok = False
+
+    models_warm = all(m["state"] == "warm" for m in models.values())
+    is_ready = db_ok and (models_warm or DISABLE_ML or not READY_REQUIRES_MODELS)
+    body = {
+        "ready": is_ready,
+        "database": db_ok,
+        "ml_enabled": not DISABLE_ML,
+        "models_warm": models_warm,
+        "models": models,
+    }
+    return JSONResponse(body, status_code=200 if is_ready else 503)
+
+
+# ---------------------------
+# Metrics (Prometheus text format)
+# ---------------------------
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # async so the executor collector sees this event loop
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
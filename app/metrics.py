@@ -0,0 +1,351 @@
+# backend/app/metrics.py
+# Minimal Prometheus-style instrumentation (text exposition format 0.0.4) with no
+# extra dependency. Pipeline stages record into the module-level metrics below;
+# GET /metrics renders them, plus gauges pulled from collectors at scrape time.
+import contextvars
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+RATIO_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+RATE_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def _fmt(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = ['%s="%s"' % (n, _escape(v)) for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_one(key, value))
+        return lines
+
+    def _render_one(self, key, value) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_fmt(value)}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def _render_one(self, key, state) -> List[str]:
+        counts, total, n = state
+        lines = []
+        cumulative = 0
+        for bound, c in zip(self.buckets, counts):
+            cumulative += c
+            le = 'le="%s"' % _fmt(bound)
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def add_collector(self, fn: Callable[[], None]):
+        """fn runs on every scrape, typically to refresh gauges."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        for fn in self._collectors:
+            try:
+                fn()
+            except Exception as e:
+                print("[metrics] collector failed:", e)
+        lines = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ===============================
+# METRICS
+# ===============================
+
+HTTP_LATENCY = REGISTRY.histogram("http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"))
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram("db_queries_per_request", "SQL statements executed per HTTP request", ("route",), buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100))
+DB_TIME_PER_REQUEST = REGISTRY.histogram("db_time_per_request_seconds", "Time spent in SQL per HTTP request", ("route",))
+DB_QUERY_LATENCY = REGISTRY.histogram("db_query_duration_seconds", "Latency of individual SQL statements", buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5))
+
+ASR_SECONDS = REGISTRY.histogram("asr_transcribe_seconds", "Wall time of one Whisper transcription")
+ASR_RTF = REGISTRY.histogram("asr_realtime_factor", "Audio seconds transcribed per wall-clock second", buckets=RATIO_BUCKETS)
+ASR_AUDIO_SECONDS = REGISTRY.counter("asr_audio_seconds_total", "Audio seconds transcribed")
+
+SUMMARIZER_SECONDS = REGISTRY.histogram("summarizer_seconds", "Wall time of one summarize_meeting call")
+SUMMARIZER_TOKENS_PER_SECOND = REGISTRY.histogram("summarizer_input_tokens_per_second", "Approximate input tokens (chars/4) summarized per second", buckets=RATE_BUCKETS)
+SUMMARIZER_CHUNKS = REGISTRY.histogram("summarizer_chunks", "Chunks per summarize_meeting call", buckets=COUNT_BUCKETS)
+
+NER_BATCH_SIZE = REGISTRY.histogram("ner_batch_size", "Inputs per NER pipeline call", buckets=COUNT_BUCKETS)
+NER_SECONDS = REGISTRY.histogram("ner_seconds", "Wall time of one NER pipeline call")
+
+EXECUTOR_QUEUE_DEPTH = REGISTRY.gauge("executor_queue_depth", "Work items waiting for a thread/process", ("executor",))
+EXECUTOR_BUSY = REGISTRY.gauge("executor_busy", "Work items currently running", ("executor",))
+DB_POOL = REGISTRY.gauge("db_pool", "Connection pool state", ("stat",))
+CACHE = REGISTRY.gauge("cache", "In-process cache counters", ("cache", "stat"))
+AUTH = REGISTRY.gauge("auth_hashing", "Password hashing/login stats", ("stat",))
+JOBS_ACTIVE = REGISTRY.gauge("jobs_active", "Background jobs queued or running")
+CPU_THREADS = REGISTRY.gauge("cpu_thread_budget", "Inference thread budget: size, slots held, stages queued", ("stat",))
+CPU_STAGE_WAIT = REGISTRY.histogram("cpu_stage_wait_seconds", "Time a model call waited for its thread share", ("engine",))
+ML_QUEUE_WAIT = REGISTRY.histogram("ml_queue_wait_seconds", "Time an ASR/summarization job waited for the scheduler", ("stage", "priority"), buckets=LATENCY_BUCKETS + (600, 1800, 3600))
+ML_SCHEDULER = REGISTRY.gauge("ml_scheduler", "ML scheduler per stage: queued, running, slots, learned seconds per unit", ("stage", "stat"))
+EVENT_LOOP_LAG = REGISTRY.histogram("event_loop_lag_seconds", "How late the event loop woke a periodic timer", buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+EVENT_LOOP_LAG_MAX = REGISTRY.gauge("event_loop_lag_max_seconds", "Worst event loop lag since the last scrape")
+
+
+# ===============================
+# PER-REQUEST DB ACCOUNTING
+# ===============================
+
+_request_db: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("request_db", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("_query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    DB_QUERY_LATENCY.observe(elapsed)
+    acc = _request_db.get()
+    if acc is not None:
+        acc[0] += 1
+        acc[1] += elapsed
+
+
+def instrument_engine(sync_engine):
+    from sqlalchemy import event
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ===============================
+# EVENT LOOP LAG
+# ===============================
+
+_lag_max = [0.0]
+
+
+async def monitor_event_loop(interval: float = 0.1):
+    """Sleep in a loop and record the overshoot; long stalls mean blocking code on the loop."""
+    import asyncio
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - started - interval)
+        EVENT_LOOP_LAG.observe(lag)
+        _lag_max[0] = max(_lag_max[0], lag)
+
+
+@REGISTRY.add_collector
+def _collect_event_loop():
+    EVENT_LOOP_LAG_MAX.set(_lag_max[0])
+    _lag_max[0] = 0.0
+
+
+# ===============================
+# HTTP MIDDLEWARE
+# ===============================
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        return getattr(endpoint, "__name__", "endpoint")
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: latency per route template plus SQL count/time per request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        acc = [0, 0.0]
+        token = _request_db.set(acc)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_db.reset(token)
+            route = _route_label(scope)
+            HTTP_LATENCY.observe(elapsed, method=scope["method"], route=route, status=status["code"])
+            DB_QUERIES_PER_REQUEST.observe(acc[0], route=route)
+            DB_TIME_PER_REQUEST.observe(acc[1], route=route)
+
+
+# ===============================
+# SCRAPE-TIME COLLECTORS
+# ===============================
+
+def _thread_pool_depth(name: str, executor):
+    # ThreadPoolExecutor has no public queue size; _work_queue is stable across 3.8-3.12
+    queue = getattr(executor, "_work_queue", None)
+    if queue is not None:
+        EXECUTOR_QUEUE_DEPTH.set(queue.qsize(), executor=name)
+
+
+@REGISTRY.add_collector
+def _collect_executors():
+    import asyncio
+    try:
+        loop = asyncio.get_running_loop()
+        _thread_pool_depth("asyncio_default", getattr(loop, "_default_executor", None))
+    except RuntimeError:
+        pass
+    try:
+        import anyio.to_thread
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        EXECUTOR_BUSY.set(limiter.borrowed_tokens, executor="anyio_threadpool")
+        EXECUTOR_QUEUE_DEPTH.set(limiter.statistics().tasks_waiting, executor="anyio_threadpool")
+    except Exception:
+        pass
+
+    from .auth import security
+    EXECUTOR_QUEUE_DEPTH.set(security.hashing_stats()["pending"], executor="password_hash")
+
+    from . import batch_export
+    pool = batch_export._pool
+    if pool is not None:
+        pending = getattr(pool, "_pending_work_items", {})
+        EXECUTOR_QUEUE_DEPTH.set(len(pending), executor="pdf_export")
+
+
+@REGISTRY.add_collector
+def _collect_app_state():
+    from . import database, pdf_export, summary_cache
+    from .auth import security
+    from .auth.principal_cache import principal_cache
+    from .jobs import jobs
+
+    for k, v in database.pool_stats().items():
+        if isinstance(v, (int, float)):
+            DB_POOL.set(v, stat=k)
+    for name, stats in (("principal", principal_cache.stats()), ("pdf", pdf_export.pdf_cache.stats()), ("summary", summary_cache.stats())):
+        for k, v in stats.items():
+            CACHE.set(v, cache=name, stat=k)
+    from .nlp.cache import sentence_cache
+    for kind, stats in sentence_cache.stats().items():
+        if kind == "entries":
+            CACHE.set(stats, cache="nlp", stat="entries")
+            continue
+        for k, v in stats.items():
+            CACHE.set(v, cache=f"nlp_{kind}", stat=k)
+    hs = security.hashing_stats()
+    for k in ("logins", "login_failures", "rehashes", "rejected", "logins_per_second_1m"):
+        AUTH.set(hs[k], stat=k)
+    for k, v in hs["login"].items():
+        if v is not None:
+            AUTH.set(v, stat=f"login_{k}")
+    JOBS_ACTIVE.set(jobs.active())
+
+    from . import thread_budget
+    for k, v in thread_budget.stats().items():
+        CPU_THREADS.set(v, stat=k)
+
+    from .scheduler import scheduler
+    for stage, stats in scheduler.stats().items():
+        for k, v in stats.items():
+            ML_SCHEDULER.set(v, stage=stage, stat=k)
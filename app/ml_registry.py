@@ -0,0 +1,188 @@
+# backend/app/ml_registry.py
+# Lazy model registry: every model is loaded on first use (or by a background
+# warmup after the port is open), once per process, and reports its state for
+# the readiness probe. This module must stay free of ML imports; loaders import
+# their libraries only when called.
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from .ml_guard import DISABLE_ML
+from .model_loading import rss_mb
+
+COLD = "cold"
+LOADING = "loading"
+WARM = "warm"
+UNAVAILABLE = "unavailable"
+DISABLED = "disabled"
+
+# models loaded by the background warmup, in order
+ML_WARMUP = os.getenv("ML_WARMUP", "true").lower() == "true"
+ML_WARMUP_MODELS = [m.strip() for m in os.getenv("ML_WARMUP_MODELS", "whisper,summarizer,spacy,ner,embedder").split(",") if m.strip()]
+
+# When set, API workers hand inference to the shared sidecar process listening on
+# this Unix socket (see app/inference_server.py) instead of loading models themselves.
+INFERENCE_SOCKET = os.getenv("INFERENCE_SOCKET")
+# "synthetic" swaps every model for the load-test stand-ins in app/synthetic_ml.py
+ML_BACKEND = os.getenv("ML_BACKEND", "real").lower()
+# registers the sentence embedder used by app/semantic.py
+SEMANTIC_SEARCH = os.getenv("SEMANTIC_SEARCH", "true").lower() == "true"
+_serving_locally = False
+
+
+def serve_locally():
+    """Called by the inference sidecar: load real models even if INFERENCE_SOCKET is set."""
+    global _serving_locally
+    _serving_locally = True
+
+
+def use_remote() -> bool:
+    return bool(INFERENCE_SOCKET) and not _serving_locally
+
+
+class _Entry:
+    def __init__(self, name: str, loader: Callable[[], object]):
+        self.name = name
+        self.loader = loader
+        self.lock = threading.Lock()
+        self.state = DISABLED if DISABLE_ML else COLD
+        self.value = None
+        self.load_seconds: Optional[float] = None
+        # process RSS growth across the load; approximate if two models load at once
+        self.rss_delta_mb: Optional[float] = None
+        self.error: Optional[str] = None
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+
+    def register(self, name: str, loader: Callable[[], object]):
+        self._entries[name] = _Entry(name, loader)
+
+    def get(self, name: str):
+        """Return the loaded model, loading it on first call; None if unavailable."""
+        entry = self._entries[name]
+        if entry.state in (WARM, UNAVAILABLE, DISABLED):
+            return entry.value
+        with entry.lock:
+            if entry.state == COLD:
+                entry.state = LOADING
+                started = time.perf_counter()
+                rss_before = rss_mb()
+                try:
+                    entry.value = entry.loader()
+                    entry.state = WARM if entry.value is not None else UNAVAILABLE
+                except Exception as e:
+                    print(f"[ml_registry] loading {name} failed:", e)
+                    entry.value = None
+                    entry.error = str(e)
+                    # a sidecar that is not up yet should be retried on the next call
+                    entry.state = COLD if use_remote() else UNAVAILABLE
+                entry.load_seconds = round(time.perf_counter() - started, 3)
+                rss_after = rss_mb()
+                if rss_before is not None and rss_after is not None:
+                    entry.rss_delta_mb = round(rss_after - rss_before, 1)
+                rss = f", RSS {entry.rss_delta_mb:+} MB" if entry.rss_delta_mb is not None else ""
+                print(f"[ml_registry] {name}: {entry.state} in {entry.load_seconds}s{rss}")
+        return entry.value
+
+    def is_warm(self, name: str) -> bool:
+        return self._entries[name].state == WARM
+
+    def reset(self, name: str):
+        """Forget a model (e.g. to retry after an unavailable load)."""
+        entry = self._entries[name]
+        with entry.lock:
+            entry.value = None
+            entry.error = None
+            entry.load_seconds = None
+            entry.rss_delta_mb = None
+            entry.state = DISABLED if DISABLE_ML else COLD
+
+    def status(self) -> Dict[str, dict]:
+        return {
+            e.name: {"state": e.state, "load_seconds": e.load_seconds, "rss_delta_mb": e.rss_delta_mb, "error": e.error}
+            for e in self._entries.values()
+        }
+
+    def warmup(self, names: Optional[Iterable[str]] = None):
+        for name in names or ML_WARMUP_MODELS:
+            if name in self._entries:
+                self.get(name)
+
+    def warmup_in_background(self, names: Optional[Iterable[str]] = None) -> threading.Thread:
+        t = threading.Thread(target=self.warmup, args=(names,), name="ml-warmup", daemon=True)
+        t.start()
+        return t
+
+
+registry = ModelRegistry()
+
+
+# ===============================
+# LOADERS (imports stay inside)
+# ===============================
+
+def _load_whisper():
+    if use_remote():
+        from .inference_client import remote_model, RemoteWhisper
+        return remote_model("whisper", RemoteWhisper)
+    if ML_BACKEND == "synthetic":
+        from . import synthetic_ml
+        return synthetic_ml.load("whisper")
+    from . import asr
+    return asr._load_model()
+
+
+def _load_summarizer():
+    if use_remote():
+        from .inference_client import remote_model, RemoteSummarizer
+        return remote_model("summarizer", RemoteSummarizer)
+    if ML_BACKEND == "synthetic":
+        from . import synthetic_ml
+        return synthetic_ml.load("summarizer")
+    from . import summarizer
+    return summarizer._load_summarizer()
+
+
+def _load_spacy():
+    if use_remote():
+        from .inference_client import remote_model, RemoteSpacy
+        return remote_model("spacy", RemoteSpacy)
+    if ML_BACKEND == "synthetic":
+        from . import synthetic_ml
+        return synthetic_ml.load("spacy")
+    from .nlp import tasks
+    return tasks._load_spacy()
+
+
+def _load_ner():
+    if use_remote():
+        from .inference_client import remote_model, RemoteNer
+        return remote_model("ner", RemoteNer)
+    if ML_BACKEND == "synthetic":
+        from . import synthetic_ml
+        return synthetic_ml.load("ner")
+    from . import actions
+    return actions._load_ner_pipeline()
+
+
+def _load_embedder():
+    if use_remote():
+        from .inference_client import remote_model, RemoteEmbedder
+        return remote_model("embedder", RemoteEmbedder)
+    if ML_BACKEND == "synthetic":
+        from . import synthetic_ml
+        return synthetic_ml.load("embedder")
+    from . import semantic
+    return semantic._load_embedder()
+
+
+registry.register("whisper", _load_whisper)
+registry.register("summarizer", _load_summarizer)
+registry.register("spacy", _load_spacy)
+registry.register("ner", _load_ner)
+if SEMANTIC_SEARCH:
+    registry.register("embedder", _load_embedder)
@@ -0,0 +1,179 @@
+# backend/app/model_loading.py
+# Shared from_pretrained path for the transformers models (summarizer, NER, embedder).
+#
+#   - safetensors first: the weights are read through mmap instead of unpickling a
+#     PyTorch checkpoint into freshly allocated memory; falls back to .bin if the
+#     repo has no safetensors
+#   - low_cpu_mem_usage: no randomly initialised copy of the model before the
+#     weights load (needs accelerate; skipped with a notice otherwise)
+#   - MODEL_DTYPE=bfloat16|float16 halves resident weights; MODEL_QUANTIZE=int8
+#     applies dynamic int8 quantization to the Linear layers (CPU, float32 only)
+#   - MODEL_OFFLINE (or HF_HUB_OFFLINE / TRANSFORMERS_OFFLINE) never touches the
+#     network and fails fast when HF_CACHE_DIR is missing files
+#
+# Load time and the RSS growth per model are recorded by app.ml_registry.
+#
+#     python -m app.model_loading --check     # exit 1 if a configured model is not cached
+import importlib.util
+import os
+import sys
+import time
+from typing import Optional
+
+HF_CACHE = os.getenv("HF_CACHE_DIR", r"D:\projects\ai-meeting-notes\models\hf_cache")
+MODEL_DTYPE = os.getenv("MODEL_DTYPE", "float32").lower()
+MODEL_QUANTIZE = os.getenv("MODEL_QUANTIZE", "").lower()
+MODEL_OFFLINE = any(
+    os.getenv(var, "").lower() in ("1", "true")
+    for var in ("MODEL_OFFLINE", "HF_HUB_OFFLINE", "TRANSFORMERS_OFFLINE")
+)
+
+DTYPES = ("float32", "bfloat16", "float16")
+if MODEL_DTYPE not in DTYPES:
+    raise ValueError(f"MODEL_DTYPE must be one of {DTYPES}, got {MODEL_DTYPE}")
+if MODEL_QUANTIZE not in ("", "int8"):
+    raise ValueError(f"MODEL_QUANTIZE must be empty or int8, got {MODEL_QUANTIZE}")
+
+WEIGHT_FILES = ("model.safetensors", "model.safetensors.index.json", "pytorch_model.bin", "pytorch_model.bin.index.json")
+# what precache() downloads: configs, tokenizer files and one weight format
+PRECACHE_PATTERNS = ("*.json", "*.txt", "*.model", "tokenizer*", "spiece*", "vocab*", "merges*")
+
+
+class ModelCacheIncomplete(RuntimeError):
+    pass
+
+
+def rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (None if it cannot be read)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except Exception:
+        return None
+
+
+# ===============================
+# CACHE CHECKS
+# ===============================
+
+def _cached(name: str, filename: str, cache_dir: str) -> bool:
+    from huggingface_hub import try_to_load_from_cache
+
+    return isinstance(try_to_load_from_cache(name, filename, cache_dir=cache_dir), str)
+
+
+def missing_files(name: str, cache_dir: str = HF_CACHE) -> list:
+    """Files from_pretrained would need that are not in the local cache."""
+    if os.path.isdir(name):
+        return []
+    missing = [] if _cached(name, "config.json", cache_dir) else ["config.json"]
+    if not any(_cached(name, w, cache_dir) for w in WEIGHT_FILES):
+        missing.append(" or ".join(WEIGHT_FILES[::2]))
+    return missing
+
+
+def ensure_cached(name: str, cache_dir: str = HF_CACHE):
+    missing = missing_files(name, cache_dir)
+    if missing:
+        raise ModelCacheIncomplete(
+            f"{name}: {', '.join(missing)} not in {cache_dir} (offline); run python -m app.precache_models"
+        )
+
+
+def precache(name: str, cache_dir: str = HF_CACHE) -> str:
+    """Download configs, tokenizer files and a single weight format (safetensors if published)."""
+    from huggingface_hub import HfApi, snapshot_download
+
+    files = HfApi().list_repo_files(name)
+    patterns = list(PRECACHE_PATTERNS)
+    patterns.append("*.safetensors" if any(f.endswith(".safetensors") for f in files) else "pytorch_model*.bin")
+    return snapshot_download(name, cache_dir=cache_dir, allow_patterns=patterns)
+
+
+# ===============================
+# LOADING
+# ===============================
+
+_notices = set()
+
+
+def _notice(msg: str):
+    if msg not in _notices:
+        _notices.add(msg)
+        print(f"[model_loading] {msg}")
+
+
+def load_tokenizer(name: str, cache_dir: str = HF_CACHE):
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(name, cache_dir=cache_dir, local_files_only=MODEL_OFFLINE)
+
+
+def load_model(model_cls, name: str, cache_dir: str = HF_CACHE):
+    """model_cls.from_pretrained with the memory settings above; returns the model in eval mode."""
+    import torch
+    from . import thread_budget
+
+    thread_budget.configure_torch()
+    if MODEL_OFFLINE:
+        ensure_cached(name, cache_dir)
+
+    kwargs = {
+        "cache_dir": cache_dir,
+        "local_files_only": MODEL_OFFLINE,
+        "torch_dtype": getattr(torch, MODEL_DTYPE),
+    }
+    if importlib.util.find_spec("accelerate") is not None:
+        kwargs["low_cpu_mem_usage"] = True
+    else:
+        _notice("accelerate not installed; loading without low_cpu_mem_usage")
+
+    started = time.perf_counter()
+    try:
+        model = model_cls.from_pretrained(name, use_safetensors=True, **kwargs)
+        fmt = "safetensors"
+    except (OSError, EnvironmentError):
+        _notice(f"{name}: no safetensors weights; loading the PyTorch checkpoint")
+        model = model_cls.from_pretrained(name, **kwargs)
+        fmt = "pytorch"
+    model.eval()
+
+    if MODEL_QUANTIZE == "int8":
+        if MODEL_DTYPE != "float32" or torch.cuda.is_available():
+            _notice("MODEL_QUANTIZE=int8 needs MODEL_DTYPE=float32 on CPU; not quantizing")
+        else:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            fmt += "+int8"
+
+    print(f"[model_loading] {name}: {fmt} {MODEL_DTYPE} in {time.perf_counter() - started:.2f}s")
+    return model
+
+
+def main():
+    import argparse
+
+    from . import actions, semantic, summarizer
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--check", action="store_true", help="report models missing from the cache")
+    args = ap.parse_args()
+    if not args.check:
+        ap.print_help()
+        return
+
+    names = (summarizer.SUMMARIZER_MODEL, actions.NER_MODEL, semantic.EMBEDDING_MODEL)
+    incomplete = {name: missing_files(name) for name in names}
+    for name, missing in incomplete.items():
+        print(f"{name}: {'missing ' + ', '.join(missing) if missing else 'cached'}")
+    sys.exit(1 if any(incomplete.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 # backend/app/models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -22,12 +22,18 @@ class Meeting(Base):
     end_time = Column(DateTime, nullable=True)
     transcript = Column(Text, nullable=True)
     summary = Column(Text, nullable=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    # row version for conditional GETs (ETag / Last-Modified)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
     owner = relationship("User", back_populates="meetings")
     tasks = relationship("Task", back_populates="meeting")
 
 class Task(Base):
     __tablename__ = "tasks"
+    # leading meeting_id also serves plain meeting_id lookups and the join from meetings
+    __table_args__ = (
+        Index("ix_tasks_meeting_completed_due", "meeting_id", "completed", "due_date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"))
     title = Column(String(512))
@@ -36,4 +42,20 @@ class Task(Base):
     completed = Column(Boolean, default=False)
     # 'metadata' is a reserved attribute name in SQLAlchemy declarative; use a different column name:
     metadata_json = Column("metadata", Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
     meeting = relationship("Meeting", back_populates="tasks")
+
+class SummaryCache(Base):
+    # summaries by transcript + summarizer config hash (see app/summary_cache.py)
+    __tablename__ = "summary_cache"
+    key = Column(String(64), primary_key=True)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+    hits = Column(Integer, nullable=False, default=0)
+
+class QuotaCounter(Base):
+    # running counters behind the anonymous-usage quotas (see app/quota.py)
+    __tablename__ = "quota_counters"
+    key = Column(String(64), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
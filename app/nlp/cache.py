@@ -0,0 +1,151 @@
+# backend/app/nlp/cache.py
+# Per-sentence memo for the extraction pipelines. Transcripts repeat a lot of
+# boilerplate ("Let's follow up next week.", "Action: send the notes."), and
+# both extractors used to re-run NER / spaCy / dateutil on every occurrence.
+#
+# Entries are keyed by (kind, namespace, normalized sentence):
+#   kind       what was computed: "ner" (actions), "deadline" (actions),
+#              "spacy" (nlp.tasks)
+#   namespace  whatever else the result depends on: the model name, or the
+#              current date for relative deadlines
+#
+# The memory tier is a bounded LRU (NLP_CACHE_MAX_ENTRIES, 0 disables the cache).
+# With NLP_CACHE_PATH set, entries are also written to a SQLite file so they
+# survive restarts and are shared by workers on the same host; that file is
+# trimmed to NLP_CACHE_DISK_MAX_ENTRIES. Values must be JSON-serializable.
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+NLP_CACHE_MAX_ENTRIES = int(os.getenv("NLP_CACHE_MAX_ENTRIES", "50000"))
+NLP_CACHE_PATH = os.getenv("NLP_CACHE_PATH", "")
+NLP_CACHE_DISK_MAX_ENTRIES = int(os.getenv("NLP_CACHE_DISK_MAX_ENTRIES", "500000"))
+# trim the disk tier every this many writes
+_DISK_TRIM_EVERY = 1000
+
+# returned by get() on a miss; None is a valid cached result
+MISS = object()
+
+
+def normalize(sentence: str) -> str:
+    # case is kept: NER and the name regexes depend on it
+    return " ".join(unicodedata.normalize("NFC", sentence).split())
+
+
+class SentenceCache:
+    """Bounded LRU of per-sentence results with an optional SQLite disk tier."""
+
+    def __init__(self, maxsize: int = NLP_CACHE_MAX_ENTRIES, path: str = NLP_CACHE_PATH,
+                 disk_maxsize: int = NLP_CACHE_DISK_MAX_ENTRIES):
+        self.maxsize = maxsize
+        self.disk_maxsize = disk_maxsize
+        self._entries = OrderedDict()   # digest -> value
+        self._lock = threading.Lock()
+        self._stats = {}                # kind -> {"hits", "disk_hits", "misses"}
+        self._disk = None
+        self._disk_writes = 0
+        if path and maxsize > 0:
+            try:
+                self._disk = self._open(path)
+            except sqlite3.Error as e:
+                print(f"[nlp.cache] disk tier disabled ({path}):", e)
+
+    @staticmethod
+    def _open(path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS nlp_cache (digest TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        return conn
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    @staticmethod
+    def _digest(kind: str, namespace: str, sentence: str) -> str:
+        payload = f"{kind}\n{namespace}\n{normalize(sentence)}"
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, kind: str, stat: str):
+        counts = self._stats.get(kind)
+        if counts is None:
+            counts = self._stats[kind] = {"hits": 0, "disk_hits": 0, "misses": 0}
+        counts[stat] += 1
+
+    def _remember(self, digest: str, value: Any):
+        self._entries[digest] = value
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, kind: str, namespace: str, sentence: str) -> Any:
+        """Cached value, or MISS."""
+        if not self.enabled:
+            return MISS
+        digest = self._digest(kind, namespace, sentence)
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                self._count(kind, "hits")
+                return self._entries[digest]
+            if self._disk is not None:
+                try:
+                    row = self._disk.execute("SELECT value FROM nlp_cache WHERE digest = ?", (digest,)).fetchone()
+                except sqlite3.Error as e:
+                    print("[nlp.cache] disk lookup failed:", e)
+                    row = None
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(digest, value)
+                    self._count(kind, "disk_hits")
+                    return value
+            self._count(kind, "misses")
+            return MISS
+
+    def put(self, kind: str, namespace: str, sentence: str, value: Any):
+        if not self.enabled:
+            return
+        digest = self._digest(kind, namespace, sentence)
+        with self._lock:
+            self._remember(digest, value)
+            if self._disk is None:
+                return
+            try:
+                self._disk.execute("INSERT OR REPLACE INTO nlp_cache (digest, value) VALUES (?, ?)",
+                                   (digest, json.dumps(value)))
+                self._disk_writes += 1
+                if self._disk_writes % _DISK_TRIM_EVERY == 0:
+                    # rowids grow with inserts, so this drops the oldest writes
+                    self._disk.execute(
+                        "DELETE FROM nlp_cache WHERE rowid <= (SELECT MAX(rowid) FROM nlp_cache) - ?",
+                        (self.disk_maxsize,),
+                    )
+            except sqlite3.Error as e:
+                print("[nlp.cache] disk write failed:", e)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM nlp_cache")
+
+    def stats(self) -> dict:
+        """{kind: {hits, disk_hits, misses, hit_ratio}} plus the memory tier size under "entries"."""
+        with self._lock:
+            out = {"entries": len(self._entries)}
+            for kind, counts in self._stats.items():
+                total = counts["hits"] + counts["disk_hits"] + counts["misses"]
+                hit = counts["hits"] + counts["disk_hits"]
+                out[kind] = dict(counts, hit_ratio=round(hit / total, 4) if total else 0.0)
+            return out
+
+
+sentence_cache = SentenceCache()
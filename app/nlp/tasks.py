@@ -2,14 +2,15 @@ import re
 from typing import List, Dict, Optional
 import os
 
-try:
-    import spacy
-    from spacy.lang.en import English
-except Exception:
-    spacy = None
+from .. import thread_budget
+from ..ml_registry import ML_BACKEND, registry
+from .cache import MISS, sentence_cache
+
+# spaCy is imported inside _load_spacy so importing this module stays cheap
 
 DEFAULT_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
 
+# explicitly requested non-default model (see init_spacy)
 _nlp = None
 
 DEADLINE_PATTERNS = [
@@ -20,32 +21,44 @@ DEADLINE_PATTERNS = [
     r"\b(?P<deadline>monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
 ]
 
-def init_spacy(model_name: Optional[str] = None):
-    """Ensure spaCy and the model are available. Downloads model if missing."""
-    global _nlp, spacy
-    if spacy is None:
-        try:
-            import spacy as sp
-            spacy = sp
-        except Exception:
-            print("[nlp.tasks] spaCy not installed; task extraction disabled")
-            return
+def _load_spacy(model_name: Optional[str] = None):
+    """Load the spaCy model, downloading it if missing. Returns None if unavailable."""
+    try:
+        import spacy
+    except Exception:
+        print("[nlp.tasks] spaCy not installed; task extraction disabled")
+        return None
 
     model = model_name or DEFAULT_MODEL
     try:
-        _nlp = spacy.load(model)
+        nlp = spacy.load(model)
         print(f"[nlp.tasks] loaded spaCy model: {model}")
+        return nlp
     except Exception as e:
         try:
             # attempt to download model
             import spacy.cli
             print(f"[nlp.tasks] spaCy model {model} missing, attempting to download...")
             spacy.cli.download(model)
-            _nlp = spacy.load(model)
+            nlp = spacy.load(model)
             print(f"[nlp.tasks] downloaded and loaded spaCy model: {model}")
+            return nlp
         except Exception as e2:
             print("[nlp.tasks] failed to load or download spaCy model:", e2)
-            _nlp = None
+            return None
+
+
+def init_spacy(model_name: Optional[str] = None):
+    """Ensure spaCy and the model are available. Downloads model if missing."""
+    global _nlp
+    if model_name and model_name != DEFAULT_MODEL:
+        _nlp = _load_spacy(model_name)
+        return _nlp
+    return registry.get("spacy")
+
+
+def _get_nlp():
+    return _nlp if _nlp is not None else registry.get("spacy")
 
 
 def _parse_deadline(text: str) -> Optional[str]:
@@ -56,6 +69,65 @@ def _parse_deadline(text: str) -> Optional[str]:
     return None
 
 
+def _cache_namespace(nlp) -> str:
+    # cached analyses are only valid for the pipeline that produced them
+    meta = getattr(nlp, "meta", None) or {}
+    return f"{ML_BACKEND}:{meta.get('lang', '')}_{meta.get('name', DEFAULT_MODEL)}-{meta.get('version', '')}"
+
+
+def _analyze_sentence(sent) -> Optional[Dict]:
+    """spaCy part of the extraction for one sentence Doc.
+
+    Returns None if the sentence is not a task, else {task, assignee} where task
+    is the verb subtree or None for the whole sentence. JSON-serializable so it
+    can go through app.nlp.cache.
+    """
+    s_text = sent.text.strip()
+    if not s_text:
+        return None
+
+    # Detect verbs that look like assignments (root verbs, imperative mood)
+    verbs = [tok for tok in sent if tok.pos_ == "VERB" or tok.dep_ == "ROOT"]
+    candidate = None
+    for v in verbs:
+        # common assignment verbs
+        if v.lemma_.lower() in ("assign","do","create","prepare","finalize","send","follow","complete","setup","schedule","organize","book","present"):
+            candidate = v
+            break
+    # also treat sentences with 'please' or 'we need' as tasks
+    if candidate is None and ("please" in s_text.lower() or "we need" in s_text.lower() or "we should" in s_text.lower()):
+        candidate = verbs[0] if verbs else None
+
+    # if no candidate verb, skip unless sentence contains 'by' or task keywords
+    if candidate is None and not any(k in s_text.lower() for k in ("by","deadline","due","todo","action","task","follow up")):
+        return None
+
+    # assemble task description (verb subtree or full sentence)
+    task_desc = None
+    try:
+        if candidate is not None:
+            subtree = " ".join([t.text for t in candidate.subtree])
+            if len(subtree) > 10:
+                task_desc = subtree
+    except Exception:
+        pass
+
+    # find persons via NER in the sentence
+    assignee = None
+    for ent in sent.ents:
+        if ent.label_ in ("PERSON", "ORG"):
+            assignee = ent.text
+            break
+
+    # fallback: look for patterns like 'Alice to prepare' where name precedes 'to <verb>'
+    if assignee is None:
+        m = re.search(r"\b([A-Z][a-z]+)\s+to\s+\w+", s_text)
+        if m:
+            assignee = m.group(1)
+
+    return {"task": task_desc, "assignee": assignee}
+
+
 def extract_action_items(text: str, participants: Optional[List[str]] = None) -> List[Dict]:
     """Extract action items using spaCy dependency parsing + NER.
 
@@ -65,18 +137,17 @@ def extract_action_items(text: str, participants: Optional[List[str]] = None) ->
     if not text:
         return items
 
-    # Ensure spaCy is initialized (lazy initialization when server didn't run startup)
-    if _nlp is None:
-        try:
-            init_spacy()
-        except Exception:
-            pass
+    # spaCy loads lazily on first use
+    nlp = _get_nlp()
+    if getattr(nlp, "remote", False):
+        # shared inference sidecar runs the whole extractor
+        return nlp.extract_action_items(text, participants)
 
     # fallback to simple sentence splitting
     sentences = re.split(r'(?<=[\.\?\!])\s+', text)
 
     # if spaCy not available, fall back to simple heuristics
-    if _nlp is None:
+    if nlp is None:
         for s in sentences:
             s_strip = s.strip()
             if not s_strip:
@@ -85,58 +156,31 @@ def extract_action_items(text: str, participants: Optional[List[str]] = None) ->
                 items.append({"task": s_strip, "assignee": None, "deadline": _parse_deadline(s_strip), "context": s_strip})
         return items
 
-    for sent in _nlp.pipe(sentences):
-        s_text = sent.text.strip()
-        if not s_text:
-            continue
-
-        
-
-        # Detect verbs that look like assignments (root verbs, imperative mood)
-        verbs = [tok for tok in sent if tok.pos_ == "VERB" or tok.dep_ == "ROOT"]
-        candidate = None
-        for v in verbs:
-            # common assignment verbs
-            if v.lemma_.lower() in ("assign","do","create","prepare","finalize","send","follow","complete","setup","schedule","organize","book","present"):
-                candidate = v
-                break
-        # also treat sentences with 'please' or 'we need' as tasks
-        if candidate is None and ("please" in s_text.lower() or "we need" in s_text.lower() or "we should" in s_text.lower()):
-            candidate = verbs[0] if verbs else None
-
-        # if no candidate verb, skip unless sentence contains 'by' or task keywords
-        if candidate is None and not any(k in s_text.lower() for k in ("by","deadline","due","todo","action","task","follow up")):
+    # only sentences not seen before go through spaCy; repeats cost a lookup
+    sentences = [s.strip() for s in sentences if s.strip()]
+    namespace = _cache_namespace(nlp)
+    analyzed = {}
+    for s in sentences:
+        if s not in analyzed:
+            analyzed[s] = sentence_cache.get("spacy", namespace, s)
+    todo = [s for s, result in analyzed.items() if result is MISS]
+    if todo:
+        with thread_budget.stage("spacy"):
+            docs = list(nlp.pipe(todo))
+        for s_text, sent in zip(todo, docs):
+            analyzed[s_text] = _analyze_sentence(sent)
+            sentence_cache.put("spacy", namespace, s_text, analyzed[s_text])
+
+    for s_text in sentences:
+        result = analyzed[s_text]
+        if result is None:
             continue
-
-        # assemble task description (verb subtree or full sentence)
-        task_desc = s_text
-        try:
-            if candidate is not None:
-                subtree = " ".join([t.text for t in candidate.subtree])
-                if len(subtree) > 10:
-                    task_desc = subtree
-        except Exception:
-            pass
-
-        # find persons via NER in the sentence
-        assignee = None
-        for ent in sent.ents:
-            if ent.label_ in ("PERSON", "ORG"):
-                assignee = ent.text
-                break
-
-        
-
-        # fallback: look for patterns like 'Alice to prepare' where name precedes 'to <verb>'
-        if assignee is None:
-            m = re.search(r"\b([A-Z][a-z]+)\s+to\s+\w+", s_text)
-            if m:
-                assignee = m.group(1)
-                
-
-        deadline = _parse_deadline(s_text)
-
-        items.append({"task": task_desc, "assignee": assignee, "deadline": deadline, "context": s_text})
+        items.append({
+            "task": result["task"] or s_text,
+            "assignee": result["assignee"],
+            "deadline": _parse_deadline(s_text),
+            "context": s_text,
+        })
 
     # dedupe
     seen = set()
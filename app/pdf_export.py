@@ -0,0 +1,167 @@
+# backend/app/pdf_export.py
+# Meeting PDF rendering: styles are built once, PDFs render into memory and
+# finished documents are cached per meeting under a content hash (the ETag).
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from reportlab.lib.enums import TA_LEFT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Paragraph
+
+PDF_CACHE_MAX_ENTRIES = int(os.getenv("PDF_CACHE_MAX_ENTRIES", "256"))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# bump when the layout changes so cached PDFs / client ETags are invalidated
+RENDER_VERSION = 1
+
+# ===============================
+# STYLES (built once at import)
+# ===============================
+
+STYLES = getSampleStyleSheet()
+STYLES.add(
+    ParagraphStyle(
+        name="TitleStyle",
+        fontSize=18,
+        leading=22,
+        spaceAfter=16,
+        alignment=TA_LEFT,
+    )
+)
+
+
+# ===============================
+# RENDERING
+# ===============================
+
+def meeting_snapshot(meeting, tasks=None, transcript_chars: int = 0) -> Dict[str, Any]:
+    """Plain, picklable view of what goes into a meeting PDF."""
+    snap = {
+        "id": meeting.id,
+        "title": meeting.title or "Untitled meeting",
+        "summary": meeting.summary,
+    }
+    if tasks is not None:
+        snap["tasks"] = [
+            {
+                "title": t.title,
+                "assigned_to": t.assigned_to,
+                "due_date": t.due_date.isoformat() if t.due_date else None,
+                "completed": bool(t.completed),
+            }
+            for t in tasks
+        ]
+    if transcript_chars:
+        snap["transcript"] = (meeting.transcript or "")[:transcript_chars]
+    return snap
+
+
+def content_hash(snapshot: Dict[str, Any]) -> str:
+    payload = json.dumps([RENDER_VERSION, snapshot], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _para(text: str) -> str:
+    return escape(text).replace("\n", "<br/>")
+
+
+def render_pdf(snapshot: Dict[str, Any]) -> bytes:
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buf,
+        pagesize=A4,
+        rightMargin=2 * cm,
+        leftMargin=2 * cm,
+        topMargin=2 * cm,
+        bottomMargin=2 * cm,
+        title=snapshot["title"],
+    )
+
+    elements = []
+    elements.append(Paragraph(_para(snapshot["title"]), STYLES["TitleStyle"]))
+    elements.append(Paragraph("Summary", STYLES["Heading2"]))
+    elements.append(Paragraph(_para(snapshot.get("summary") or "—"), STYLES["BodyText"]))
+
+    if "tasks" in snapshot:
+        elements.append(Paragraph("Tasks", STYLES["Heading2"]))
+        if not snapshot["tasks"]:
+            elements.append(Paragraph("—", STYLES["BodyText"]))
+        for t in snapshot["tasks"]:
+            # base-14 fonts have no checkbox glyphs
+            line = ("[x] " if t["completed"] else "[ ] ") + (t["title"] or "")
+            extras = [x for x in (t.get("assigned_to"), t.get("due_date")) if x]
+            if extras:
+                line += " (" + ", ".join(extras) + ")"
+            elements.append(Paragraph(_para(line), STYLES["BodyText"]))
+
+    if snapshot.get("transcript"):
+        elements.append(Paragraph("Transcript (excerpt)", STYLES["Heading2"]))
+        elements.append(Paragraph(_para(snapshot["transcript"]), STYLES["BodyText"]))
+
+    doc.build(elements)
+    return buf.getvalue()
+
+
+# ===============================
+# CACHE
+# ===============================
+
+class PdfCache:
+    """LRU of meeting id -> (content hash, pdf bytes), bounded by count and size."""
+
+    def __init__(self, max_entries: int = PDF_CACHE_MAX_ENTRIES, max_bytes: int = PDF_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, meeting_id: int, digest: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(meeting_id)
+            if entry is None or entry[0] != digest:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(meeting_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, meeting_id: int, digest: str, pdf: bytes):
+        if len(pdf) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(meeting_id, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[meeting_id] = (digest, pdf)
+            self._bytes += len(pdf)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+pdf_cache = PdfCache()
+
+
+def get_or_render(snapshot: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Return (etag, pdf bytes), rendering only when the content changed."""
+    digest = content_hash(snapshot)
+    pdf = pdf_cache.get(snapshot["id"], digest)
+    if pdf is None:
+        pdf = render_pdf(snapshot)
+        pdf_cache.put(snapshot["id"], digest, pdf)
+    return f'"{digest[:32]}"', pdf
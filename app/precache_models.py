@@ -1,30 +1,42 @@
 # backend/app/precache_models.py
+# Downloads the transformers models into HF_CACHE_DIR (configs, tokenizer files and
+# one weight format, safetensors when published), then loads each once through
+# app.model_loading to prove the cache is complete.
 import os
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, AutoModelForTokenClassification, pipeline
 
-HF_CACHE = os.getenv("HF_CACHE_DIR", r"D:\projects\ai-meeting-notes\models\hf_cache")
+from transformers import AutoModel, AutoModelForSeq2SeqLM, AutoModelForTokenClassification, pipeline
+
+from app.model_loading import HF_CACHE, load_model, load_tokenizer, precache, rss_mb
+
 os.makedirs(HF_CACHE, exist_ok=True)
 
 SUM_MODEL = os.getenv("SUMMARIZER_MODEL", "t5-small")
 NER_MODEL = os.getenv("NER_MODEL", "dslim/bert-base-NER")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
 
 print("Cache dir:", HF_CACHE)
 
-# Summarizer
-print("Pre-downloading summarizer:", SUM_MODEL)
-AutoTokenizer.from_pretrained(SUM_MODEL, cache_dir=HF_CACHE)
-AutoModelForSeq2SeqLM.from_pretrained(SUM_MODEL, cache_dir=HF_CACHE)
-print("Summarizer cached.")
-
-# NER model + tokenizer (use cache_dir here)
-print("Pre-downloading NER:", NER_MODEL)
-tokenizer = AutoTokenizer.from_pretrained(NER_MODEL, cache_dir=HF_CACHE)
-model = AutoModelForTokenClassification.from_pretrained(NER_MODEL, cache_dir=HF_CACHE)
-print("NER model + tokenizer cached.")
-
-# Build a pipeline using the already-loaded model/tokenizer (do NOT pass cache_dir to pipeline)
-print("Creating a token-classification pipeline (to ensure full initialization)...")
-ner_pipe = pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple", device=-1)
-print("NER pipeline initialized and cached.")
+for name, model_cls in (
+    (SUM_MODEL, AutoModelForSeq2SeqLM),
+    (NER_MODEL, AutoModelForTokenClassification),
+    (EMBEDDING_MODEL, AutoModel),
+):
+    print("Pre-downloading:", name)
+    precache(name)
+    before = rss_mb()
+    tokenizer = load_tokenizer(name)
+    model = load_model(model_cls, name)
+    after = rss_mb()
+    if before is not None and after is not None:
+        print(f"{name} cached (RSS +{after - before:.0f} MB when loaded).")
+    else:
+        print(f"{name} cached.")
+
+    if name == NER_MODEL:
+        # Build a pipeline using the already-loaded model/tokenizer (do NOT pass cache_dir to pipeline)
+        print("Creating a token-classification pipeline (to ensure full initialization)...")
+        pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple", device=-1)
+        print("NER pipeline initialized and cached.")
+    del model, tokenizer
 
 print("Done precaching models.")
@@ -0,0 +1,252 @@
+# backend/app/profiling.py
+# Opt-in request profiling. A sampled fraction of requests (PROFILE_SAMPLE_RATE),
+# plus any request slower than PROFILE_SLOW_MS, gets a stack-sampling trace and
+# the SQL it issued. Both are kept in memory and downloaded from /api/admin/profiles.
+#
+# When both settings are 0 (the default), the middleware and the SQL listener are
+# never installed, so a disabled profiler costs nothing per request.
+import collections
+import contextvars
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+# only requests under these path prefixes are considered
+PROFILE_PATHS = [p.strip() for p in os.getenv("PROFILE_PATHS", "/api/transcribe,/api/meetings").split(",") if p.strip()]
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+PROFILE_MAX_STORED = int(os.getenv("PROFILE_MAX_STORED", "50"))
+PROFILE_MAX_SQL = int(os.getenv("PROFILE_MAX_SQL", "500"))
+# ring buffer of (timestamp, thread, stack) samples shared by overlapping requests
+PROFILE_BUFFER_SAMPLES = int(os.getenv("PROFILE_BUFFER_SAMPLES", "200000"))
+
+PROFILING_ENABLED = PROFILE_SAMPLE_RATE > 0 or PROFILE_SLOW_MS > 0
+
+# innermost frames that mean "this thread is idle", e.g. an executor worker
+# waiting for work or the event loop in select()
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+_MAX_DEPTH = 128
+
+
+# ===============================
+# STACK SAMPLER
+# ===============================
+
+class StackSampler:
+    """Samples every thread's stack while at least one profiled request is in flight.
+
+    Work hops between the event loop and thread pools, so samples are not tied to a
+    thread; a request's trace is every non-idle sample taken during its time window.
+    """
+
+    def __init__(self, interval: float, max_samples: int):
+        self.interval = interval
+        self._samples = collections.deque(maxlen=max_samples)
+        self._active = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def acquire(self):
+        with self._cond:
+            self._active += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            with self._cond:
+                while self._active == 0:
+                    self._cond.wait()
+            now = time.perf_counter()
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                codes = []
+                while frame is not None and len(codes) < _MAX_DEPTH:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                if codes and not codes[0].co_filename.endswith(_IDLE_FILES):
+                    self._samples.append((now, tid, tuple(codes)))
+            time.sleep(self.interval)
+
+    def window(self, start: float, end: float) -> list:
+        return [(tid, codes) for ts, tid, codes in list(self._samples) if start <= ts <= end]
+
+
+sampler = StackSampler(PROFILE_INTERVAL_MS / 1000.0, PROFILE_BUFFER_SAMPLES)
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse(samples: list) -> Dict[str, int]:
+    """Folded stacks (root;...;leaf -> count) for flamegraph.pl or speedscope."""
+    names = {t.ident: t.name for t in threading.enumerate()}
+    folded: Dict[str, int] = collections.Counter()
+    for tid, codes in samples:
+        root = names.get(tid, f"thread-{tid}")
+        folded[";".join([root] + [_frame_name(c) for c in reversed(codes)])] += 1
+    return dict(folded)
+
+
+def top_functions(samples: list, limit: int = 25) -> List[dict]:
+    own = collections.Counter()
+    total = collections.Counter()
+    for _tid, codes in samples:
+        own[codes[0]] += 1
+        for code in set(codes):
+            total[code] += 1
+    return [
+        {"function": _frame_name(code), "self_samples": n, "total_samples": total[code]}
+        for code, n in own.most_common(limit)
+    ]
+
+
+# ===============================
+# SQL LOG
+# ===============================
+
+_sql_log: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("profile_sql_log", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _sql_log.get() is not None:
+        conn.info.setdefault("_profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    log = _sql_log.get()
+    started = conn.info.get("_profile_started")
+    if log is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if len(log) < PROFILE_MAX_SQL:
+        log.append({"statement": statement, "ms": round(elapsed * 1000, 3), "executemany": executemany})
+
+
+def instrument_engine(sync_engine):
+    from sqlalchemy import event
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ===============================
+# PROFILE STORE
+# ===============================
+
+class ProfileStore:
+    """The last PROFILE_MAX_STORED profiles; stacks are folded only when downloaded."""
+
+    def __init__(self, max_entries: int):
+        self._profiles: "collections.OrderedDict[str, dict]" = collections.OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def add(self, profile: dict):
+        with self._lock:
+            self._profiles[profile["id"]] = profile
+            while len(self._profiles) > self._max_entries:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[dict]:
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [_summary(p) for p in reversed(profiles)]
+
+
+profile_store = ProfileStore(PROFILE_MAX_STORED)
+
+
+def _summary(profile: dict) -> dict:
+    sql = profile["sql"]
+    return {
+        "id": profile["id"],
+        "method": profile["method"],
+        "path": profile["path"],
+        "status": profile["status"],
+        "reason": profile["reason"],
+        "started_at": profile["started_at"],
+        "duration_ms": profile["duration_ms"],
+        "samples": len(profile["samples"]),
+        "sql_statements": len(sql),
+        "sql_ms": round(sum(q["ms"] for q in sql), 3),
+    }
+
+
+def report(profile: dict) -> dict:
+    body = _summary(profile)
+    body["sample_interval_ms"] = PROFILE_INTERVAL_MS
+    body["top_functions"] = top_functions(profile["samples"])
+    body["sql"] = profile["sql"]
+    return body
+
+
+# ===============================
+# MIDDLEWARE
+# ===============================
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware; add it only when PROFILING_ENABLED."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(tuple(PROFILE_PATHS)):
+            await self.app(scope, receive, send)
+            return
+
+        sampled = random.random() < PROFILE_SAMPLE_RATE
+        if not sampled and PROFILE_SLOW_MS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        sql: list = []
+        token = _sql_log.set(sql)
+        sampler.acquire()
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            ended = time.perf_counter()
+            sampler.release()
+            _sql_log.reset(token)
+            duration_ms = (ended - started) * 1000
+            slow = PROFILE_SLOW_MS > 0 and duration_ms >= PROFILE_SLOW_MS
+            if sampled or slow:
+                profile_store.add({
+                    "id": uuid.uuid4().hex[:12],
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status["code"],
+                    "reason": "slow" if slow else "sampled",
+                    "started_at": started_at,
+                    "duration_ms": round(duration_ms, 1),
+                    "samples": sampler.window(started, ended),
+                    "sql": sql,
+                })
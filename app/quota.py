@@ -0,0 +1,116 @@
+# backend/app/quota.py
+# Anonymous-usage quotas answered from maintained counters instead of COUNT(*).
+#
+# Counters live in quota_counters and are bumped in the same transaction as the
+# row they count, so every worker sees the same value. Consuming quota is a single
+# conditional UPDATE (value < limit), which the database serializes for us.
+import os
+import threading
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models
+
+ANON_MEETINGS = "anon_meetings"
+MEETINGS_TOTAL = "meetings_total"
+
+ANON_MEETING_LIMIT = int(os.getenv("ANON_MEETING_LIMIT", "1"))
+
+_SEED_COUNTS = {
+    ANON_MEETINGS: lambda db: db.query(func.count(models.Meeting.id)).filter(models.Meeting.owner_id == None).scalar(),  # noqa: E711
+    MEETINGS_TOTAL: lambda db: db.query(func.count(models.Meeting.id)).scalar(),
+}
+
+# thresholds already crossed by monotonic counters (meetings are never deleted)
+_crossed = set()
+_crossed_lock = threading.Lock()
+
+
+def _seed(db: Session, key: str):
+    """Create a missing counter row from a one-off COUNT(*), inside the caller's transaction.
+
+    The count runs before the caller's pending rows are flushed, so the row being
+    counted is left to the caller's increment. Never commits or rolls back.
+    """
+    with db.no_autoflush:
+        count = _SEED_COUNTS[key](db)
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        # another worker may have seeded it first
+        db.execute(insert(models.QuotaCounter).values(key=key, value=count).on_conflict_do_nothing(index_elements=["key"]))
+        return
+    try:
+        with db.begin_nested():
+            db.add(models.QuotaCounter(key=key, value=count))
+    except IntegrityError:
+        pass  # seeded concurrently; only the savepoint was rolled back
+
+
+def seed_counters(db: Session):
+    for key in _SEED_COUNTS:
+        if db.get(models.QuotaCounter, key) is None:
+            _seed(db, key)
+    db.commit()
+
+
+def value(db: Session, key: str) -> int:
+    row = db.get(models.QuotaCounter, key)
+    if row is None:
+        _seed(db, key)
+        row = db.get(models.QuotaCounter, key)
+    return row.value
+
+
+def increment(db: Session, key: str, by: int = 1):
+    """Bump a counter inside the caller's transaction (caller commits)."""
+    stmt = (
+        update(models.QuotaCounter)
+        .where(models.QuotaCounter.key == key)
+        .values(value=models.QuotaCounter.value + by)
+    )
+    # the counted row is usually still pending; keep it out of the seed COUNT(*)
+    with db.no_autoflush:
+        if db.execute(stmt).rowcount == 0:
+            _seed(db, key)
+            db.execute(stmt)
+
+
+def try_consume(db: Session, key: str, limit: int) -> bool:
+    """Atomically take one unit of quota; False once the counter reached limit.
+
+    Runs in the caller's transaction: commit it together with the row being
+    counted, or roll back to give the unit back.
+    """
+    stmt = (
+        update(models.QuotaCounter)
+        .where(models.QuotaCounter.key == key, models.QuotaCounter.value < limit)
+        .values(value=models.QuotaCounter.value + 1)
+    )
+    with db.no_autoflush:
+        if db.execute(stmt).rowcount == 1:
+            return True
+        if db.get(models.QuotaCounter, key) is None:
+            _seed(db, key)
+            return db.execute(stmt).rowcount == 1
+    return False
+
+
+def exceeds(db: Session, key: str, threshold: int) -> bool:
+    """value(key) > threshold, remembered in-process once true.
+
+    Only valid for counters that never go down, which holds for the meeting
+    counters as long as meetings are not deleted.
+    """
+    if (key, threshold) in _crossed:
+        return True
+    if value(db, key) > threshold:
+        with _crossed_lock:
+            _crossed.add((key, threshold))
+        return True
+    return False
@@ -0,0 +1,47 @@
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from .. import profiling
+
+# admin endpoints are off unless a token is configured
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin(x_admin_token: str = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(404, "Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(403, "Admin token required")
+
+
+# =========================
+# PROFILES
+# =========================
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+def list_profiles():
+    return {
+        "enabled": profiling.PROFILING_ENABLED,
+        "sample_rate": profiling.PROFILE_SAMPLE_RATE,
+        "slow_ms": profiling.PROFILE_SLOW_MS,
+        "profiles": profiling.profile_store.list(),
+    }
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+def get_profile(profile_id: str, format: str = Query("json", regex="^(json|collapsed)$")):
+    profile = profiling.profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(404, "Profile not found")
+    if format == "collapsed":
+        folded = profiling.collapse(profile["samples"])
+        text = "".join(f"{stack} {count}\n" for stack, count in folded.items())
+        return PlainTextResponse(
+            text,
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'},
+        )
+    return profiling.report(profile)
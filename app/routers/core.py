@@ -1,20 +1,19 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query, Header, Request, Response, WebSocket
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import List, Optional
-from fastapi.responses import FileResponse
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-import tempfile
-
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Paragraph,
-)
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT
+import asyncio
+import json
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 
 from ..database import get_db
-from .. import crud, schemas, models
+from .. import database
+from .. import crud, crud_async, schemas, models, quota, pdf_export, batch_export, search, semantic, summary_cache
+from ..scheduler import scheduler
+from ..jobs import jobs, DONE
+from .. import http_cache
+from ..http_cache import etag_matches, FastJSONResponse
 from ..auth.dependencies import (
     get_current_user_optional,
 )
@@ -29,6 +28,11 @@ def health():
     return {"status": "ok", "service": "AI Meeting Notes backend"}
 
 
+@router.get("/health/db", tags=["health"])
+def health_db():
+    return database.pool_stats()
+
+
 # =========================
 # MEETINGS
 # =========================
@@ -39,12 +43,8 @@ def create_meeting_endpoint(
     user=Depends(get_current_user_optional),
 ):
     if not user:
-        anon_count = (
-            db.query(models.Meeting)
-            .filter(models.Meeting.owner_id == None)
-            .count()
-        )
-        if anon_count >= 1:
+        if not quota.try_consume(db, quota.ANON_MEETINGS, quota.ANON_MEETING_LIMIT):
+            db.rollback()
             raise HTTPException(
                 status_code=401,
                 detail="Please login or signup to create more meetings",
@@ -57,12 +57,24 @@ def create_meeting_endpoint(
 @router.get("/meetings/{meeting_id}", response_model=schemas.MeetingOut, tags=["meetings"])
 def get_meeting_endpoint(
     meeting_id: int,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
+    # clients poll this; answer from the version row before loading the transcript
+    version = crud.meeting_version(db, meeting_id)
+    if not version:
+        raise HTTPException(404, "Meeting not found")
+    etag = http_cache.version_etag("meeting", meeting_id, *version)
+    last_modified = max(filter(None, (version[0], version[2])), default=None)
+    headers = http_cache.validator_headers(etag, last_modified)
+    if http_cache.not_modified(etag, last_modified, if_none_match, if_modified_since):
+        return Response(status_code=304, headers=headers)
+
     meeting = crud.get_meeting(db, meeting_id)
     if not meeting:
         raise HTTPException(404, "Meeting not found")
-    return meeting
+    return FastJSONResponse(schemas.meeting_out_dict(meeting), headers=headers)
 
 
 @router.get("/meetings/", response_model=List[schemas.MeetingOut], tags=["meetings"])
@@ -90,6 +102,42 @@ def list_meetings_endpoint(
     )
 
 
+# =========================
+# SEARCH
+# =========================
+@router.get("/search", response_model=schemas.SearchResponse, tags=["search"])
+def search_endpoint(
+    q: str = Query(..., min_length=1, max_length=256),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user_optional),
+):
+    # same visibility as the meeting list: own meetings, or anonymous ones
+    try:
+        results, has_more = search.search(db, q, owner_id=user.id if user else None, skip=skip, limit=limit)
+    except search.SearchUnavailable as e:
+        raise HTTPException(503, str(e))
+    return {"query": q, "results": results, "skip": skip, "limit": limit, "has_more": has_more}
+
+
+@router.get("/search/semantic", response_model=schemas.SearchResponse, tags=["search"])
+def semantic_search_endpoint(
+    q: str = Query(..., min_length=1, max_length=512),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user_optional),
+):
+    if not semantic.enabled():
+        raise HTTPException(503, "semantic search is disabled")
+    try:
+        results, has_more = semantic.search(db, q, owner_id=user.id if user else None, skip=skip, limit=limit)
+    except search.SearchUnavailable as e:
+        raise HTTPException(503, str(e))
+    return {"query": q, "results": results, "skip": skip, "limit": limit, "has_more": has_more}
+
+
 # =========================
 # TASKS
 # =========================
@@ -105,23 +153,83 @@ def create_task_endpoint(
     return crud.create_task(db, meeting_id, task)
 
 
+def _ensure_meeting_owner(owner_id: Optional[int], user):
+    # anonymous meetings stay open to everyone, owned ones only to their owner
+    if owner_id is not None and (not user or user.id != owner_id):
+        raise HTTPException(403, "Not allowed to modify tasks of this meeting")
+
+
+@router.post("/meetings/{meeting_id}/tasks/bulk", response_model=List[schemas.TaskOut], tags=["tasks"])
+def bulk_create_tasks_endpoint(
+    meeting_id: int,
+    tasks: List[schemas.TaskCreate],
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user_optional),
+):
+    meeting = crud.get_meeting(db, meeting_id)
+    if not meeting:
+        raise HTTPException(404, "Meeting not found")
+    _ensure_meeting_owner(meeting.owner_id, user)
+    return crud.bulk_create_tasks(db, meeting_id, tasks)
+
+
 @router.get("/tasks/", response_model=List[schemas.TaskOut], tags=["tasks"])
 def list_tasks_endpoint(
     meeting_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     user=Depends(get_current_user_optional),
 ):
-    if user:
-        return crud.list_tasks(db, meeting_id, user_id=user.id)
-
-    meetings_count = db.query(models.Meeting).count()
-    if meetings_count > 1:
+    filters = dict(
+        completed=completed,
+        due_after=due_after,
+        due_before=due_before,
+        skip=skip,
+        limit=limit,
+    )
+    if not user and quota.exceeds(db, quota.MEETINGS_TOTAL, 1):
         raise HTTPException(
             status_code=401,
             detail="Login required to view tasks",
         )
+    user_id = user.id if user else None
+
+    # ETag only: a task leaving the filtered set changes the count but not max(updated_at)
+    version = crud.tasks_version(db, meeting_id, user_id, completed, due_after, due_before)
+    etag = http_cache.version_etag("tasks", user_id, meeting_id, completed, due_after, due_before, skip, limit, *version)
+    headers = http_cache.validator_headers(etag, None)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    tasks = crud.list_tasks(db, meeting_id, user_id=user_id, **filters)
+    return FastJSONResponse([schemas.task_out_dict(t) for t in tasks], headers=headers)
+
+
+@router.patch("/tasks/bulk", response_model=List[schemas.TaskOut], tags=["tasks"])
+def bulk_update_tasks_endpoint(
+    updates: List[schemas.TaskBulkUpdateItem],
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user_optional),
+):
+    ids = {u.id for u in updates}
+    owners = dict(
+        db.query(models.Task.id, models.Meeting.owner_id)
+        .outerjoin(models.Meeting, models.Task.meeting_id == models.Meeting.id)
+        .filter(models.Task.id.in_(ids))
+        .all()
+    )
+    missing = ids - owners.keys()
+    if missing:
+        raise HTTPException(404, f"Tasks not found: {sorted(missing)}")
+    for owner_id in set(owners.values()):
+        _ensure_meeting_owner(owner_id, user)
 
-    return crud.list_tasks(db, meeting_id)
+    return crud.bulk_update_tasks(db, updates)
 
 
 @router.put("/tasks/{task_id}", response_model=schemas.TaskOut, tags=["tasks"])
@@ -145,32 +253,67 @@ def update_task_endpoint(
 # =========================
 # TRANSCRIPTION — TEXT
 # =========================
+async def _save_transcript(db: Session, meeting_id: int, transcript, summary):
+    # keep blocking DB work off the event loop
+    if database.DB_ASYNC:
+        async with database.AsyncSessionLocal() as adb:
+            await crud_async.add_transcript_and_summary(
+                adb,
+                meeting_id,
+                transcript=transcript,
+                summary=summary,
+            )
+        return
+
+    await run_in_threadpool(
+        crud.add_transcript_and_summary,
+        db,
+        meeting_id,
+        transcript=transcript,
+        summary=summary,
+    )
+
+
+def _job_owner(user, client) -> str:
+    # fair-share key for the ML scheduler: the account, else the client address
+    if user is not None:
+        return f"user:{user.id}"
+    return f"anon:{client.host if client else 'unknown'}"
+
+
+async def _summarize(transcript: str, owner: str):
+    """(summary, cached); cache hits do not queue in the scheduler."""
+    summary = await run_in_threadpool(summary_cache.lookup, transcript)
+    if summary is not None:
+        return summary, True
+    # chars/4 approximates the token count, as in app.summarizer
+    async with scheduler.job("summarize", owner, len(transcript) / 4):
+        return await run_in_threadpool(summary_cache.compute, transcript), False
+
+
 @router.post("/transcribe/text", tags=["transcription"])
 async def transcribe_text(
     meeting_id: int,
     text: str,
+    request: Request,
     db: Session = Depends(get_db),
+    user=Depends(get_current_user_optional),
 ):
     transcript = text
 
-    summary = None
+    summary, cached = None, False
     try:
-        from ..summarizer import summarize_meeting
-        summary = summarize_meeting(transcript)
+        summary, cached = await _summarize(transcript, _job_owner(user, request.client))
     except Exception:
         pass
 
-    crud.add_transcript_and_summary(
-        db,
-        meeting_id,
-        transcript=transcript,
-        summary=summary,
-    )
+    await _save_transcript(db, meeting_id, transcript, summary)
 
     return {
         "meeting_id": meeting_id,
         "transcript": transcript,
         "summary": summary,
+        "cached": cached,
     }
 
 
@@ -180,14 +323,18 @@ async def transcribe_text(
 @router.post("/transcribe/audio", tags=["transcription"])
 async def transcribe_audio_file(
     meeting_id: int,
+    request: Request,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
+    user=Depends(get_current_user_optional),
 ):
     contents = await file.read()
+    owner = _job_owner(user, request.client)
 
     try:
-        from ..asr import transcribe_bytes
-        result = await transcribe_bytes(contents, filename=file.filename)
+        from ..asr import estimate_seconds, transcribe_bytes
+        async with scheduler.job("asr", owner, estimate_seconds(contents, file.filename)):
+            result = await transcribe_bytes(contents, filename=file.filename)
         transcript = result.get("text", "")
     except Exception:
         transcript = (
@@ -195,72 +342,306 @@ async def transcribe_audio_file(
             "⚠️ Automatic transcription is currently unavailable."
         )
 
-    summary = None
+    summary, cached = None, False
     try:
-        from ..summarizer import summarize_meeting
-        summary = summarize_meeting(transcript)
+        summary, cached = await _summarize(transcript, owner)
     except Exception:
         pass
 
-    crud.add_transcript_and_summary(
-        db,
-        meeting_id,
-        transcript=transcript,
-        summary=summary,
-    )
+    await _save_transcript(db, meeting_id, transcript, summary)
 
     return {
         "meeting_id": meeting_id,
         "transcript": transcript,
         "summary": summary,
+        "cached": cached,
     }
 
 
+@router.post("/transcribe/audio/stream", tags=["transcription"])
+async def transcribe_audio_stream(
+    meeting_id: int,
+    request: Request,
+    file: UploadFile = File(...),
+    format: str = Query("ndjson", regex="^(ndjson|sse)$"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user_optional),
+):
+    """Same as /transcribe/audio, but segments are sent as Whisper decodes them
+    (NDJSON lines or server-sent events), followed by a "done" event with the
+    full transcript and summary once they are saved."""
+    from ..asr import estimate_seconds, stream_transcribe_bytes
+
+    contents = await file.read()
+    filename = file.filename
+    owner = _job_owner(user, request.client)
+
+    def encode(event: dict) -> str:
+        data = json.dumps(event)
+        if format == "sse":
+            return f"event: {event['type']}\ndata: {data}\n\n"
+        return data + "\n"
+
+    async def events():
+        texts = []
+        # the slot is held until the last segment is decoded
+        async with scheduler.job("asr", owner, estimate_seconds(contents, filename)):
+            async for event in stream_transcribe_bytes(contents, filename=filename):
+                if event["type"] == "segment":
+                    texts.append(event["text"])
+                yield encode(event)
+
+        transcript = " ".join(texts).strip()
+        summary, cached = None, False
+        if transcript:
+            try:
+                summary, cached = await _summarize(transcript, owner)
+            except Exception:
+                pass
+            await _save_transcript(db, meeting_id, transcript, summary)
+
+        yield encode({"type": "done", "meeting_id": meeting_id, "transcript": transcript, "summary": summary, "cached": cached})
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    # no-transform/X-Accel-Buffering keep proxies from buffering the stream
+    return StreamingResponse(
+        events(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"},
+    )
+
+
+# =========================
+# TRANSCRIPTION — LIVE (WEBSOCKET)
+# =========================
+def _append_live_transcript(meeting_id: int, text: str):
+    db = database.SessionLocal()
+    try:
+        crud.append_transcript(db, meeting_id, text)
+    finally:
+        db.close()
+
+
+def _websocket_user(websocket: WebSocket):
+    # browsers cannot set headers on a websocket, so ?token= is accepted too
+    token = websocket.query_params.get("token")
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    if not token and scheme.lower() == "bearer":
+        token = credentials.strip()
+    db = database.SessionLocal()
+    try:
+        return get_current_user_optional(db=db, token=token)
+    finally:
+        db.close()
+
+
+def _save_live_summary(meeting_id: int, summary: str):
+    db = database.SessionLocal()
+    try:
+        crud.add_transcript_and_summary(db, meeting_id, summary=summary)
+    finally:
+        db.close()
+
+
+@router.websocket("/ws/transcribe/{meeting_id}")
+async def live_transcribe(
+    websocket: WebSocket,
+    meeting_id: int,
+    format: str = "s16le",
+    sample_rate: int = 16000,
+    language: Optional[str] = None,
+    summarize: bool = True,
+):
+    """Binary frames carry audio (s16le/f32le mono PCM, or webm/ogg Opus chunks);
+    send {"type": "stop"} to finish. Replies are JSON: ready, partial, final,
+    done and error. Final segments are appended to the meeting transcript as
+    they are produced. Pass the access token as ?token= or a Bearer header so
+    steps are scheduled under the account rather than the client address."""
+    from ..asr import get_model
+    from ..live_asr import LiveTranscriber, LIVE_STEP_SECONDS
+
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    try:
+        live = LiveTranscriber(format, sample_rate=sample_rate, language=language)
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1003)
+        return
+    if await loop.run_in_executor(None, get_model) is None:
+        await websocket.send_json({"type": "error", "detail": "Automatic transcription is currently unavailable"})
+        await websocket.close(code=1011)
+        return
+
+    owner = _job_owner(await run_in_threadpool(_websocket_user, websocket), websocket.client)
+    connected = True
+
+    async def send(message: dict):
+        nonlocal connected
+        if not connected:
+            return
+        try:
+            await websocket.send_json(message)
+        except Exception:
+            connected = False
+
+    async def publish(finals, partial):
+        if finals:
+            text = " ".join(s["text"] for s in finals)
+            await run_in_threadpool(_append_live_transcript, meeting_id, text)
+            await send({"type": "final", "segments": finals})
+        if partial:
+            await send({"type": "partial", "segment": partial})
+
+    async def run_step():
+        try:
+            async with scheduler.job("asr", owner, LIVE_STEP_SECONDS):
+                result = await loop.run_in_executor(None, live.step)
+            await publish(*result)
+        except Exception as e:
+            print("[live] step failed:", e)
+            await send({"type": "error", "detail": "transcription step failed"})
+
+    await send({"type": "ready", "sample_rate": live.sample_rate, "step_seconds": LIVE_STEP_SECONDS})
+    step_task: Optional[asyncio.Task] = None
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            connected = False
+            break
+        try:
+            if message.get("bytes"):
+                live.feed(message["bytes"])
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    control = {}
+                if control.get("type") == "stop":
+                    break
+            # one step at a time; audio keeps buffering while Whisper runs
+            if (step_task is None or step_task.done()) and live.ready():
+                step_task = asyncio.create_task(run_step())
+        except ValueError as e:
+            # undecodable input: stop the session, keep what was transcribed so far
+            await send({"type": "error", "detail": str(e)})
+            if connected:
+                connected = False
+                await websocket.close(code=1003)
+            break
+
+    # finish even if the client went away, so the transcript is complete
+    if step_task is not None:
+        await step_task
+    try:
+        async with scheduler.job("asr", owner, LIVE_STEP_SECONDS):
+            result = await loop.run_in_executor(None, live.finish)
+        await publish(*result)
+    except Exception as e:
+        print("[live] final step failed:", e)
+
+    summary, cached = None, False
+    if summarize and live.transcript:
+        try:
+            summary, cached = await _summarize(live.transcript, owner)
+            await run_in_threadpool(_save_live_summary, meeting_id, summary)
+        except Exception:
+            pass
+
+    await send({
+        "type": "done",
+        "meeting_id": meeting_id,
+        "duration_seconds": round(live.duration, 2),
+        "transcript": live.transcript,
+        "summary": summary,
+        "cached": cached,
+    })
+    if connected:
+        await websocket.close()
+
+
 # =========================
 # PDF EXPORT
 # =========================
 @router.get("/meetings/{meeting_id}/export/pdf", tags=["export"])
 def export_meeting_pdf(
     meeting_id: int,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
-    meeting = db.query(models.Meeting).filter(models.Meeting.id == meeting_id).first()
+    # only the columns that go into the PDF, not the transcript blob
+    meeting = (
+        db.query(models.Meeting.id, models.Meeting.title, models.Meeting.summary)
+        .filter(models.Meeting.id == meeting_id)
+        .first()
+    )
     if not meeting:
         raise HTTPException(404, "Meeting not found")
 
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+    snapshot = pdf_export.meeting_snapshot(meeting)
+    etag = f'"{pdf_export.content_hash(snapshot)[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
 
-    doc = SimpleDocTemplate(
-        tmp.name,
-        pagesize=A4,
-        rightMargin=2 * cm,
-        leftMargin=2 * cm,
-        topMargin=2 * cm,
-        bottomMargin=2 * cm,
-    )
+    etag, pdf = pdf_export.get_or_render(snapshot)
+    headers["Content-Disposition"] = f'attachment; filename="meeting-{meeting_id}.pdf"'
+    return Response(content=pdf, media_type="application/pdf", headers=headers)
 
-    styles = getSampleStyleSheet()
-    styles.add(
-        ParagraphStyle(
-            name="TitleStyle",
-            fontSize=18,
-            leading=22,
-            spaceAfter=16,
-            alignment=TA_LEFT,
-        )
-    )
 
-    elements = []
-    elements.append(Paragraph(meeting.title, styles["TitleStyle"]))
-    elements.append(Paragraph("Summary", styles["Heading2"]))
-    elements.append(
-        Paragraph((meeting.summary or "—").replace("\n", "<br/>"), styles["BodyText"])
-    )
+# =========================
+# BATCH EXPORT (background job)
+# =========================
+@router.post("/meetings/export/batch", status_code=202, tags=["export"])
+def start_batch_export(
+    payload: schemas.BatchExportRequest,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user_optional),
+):
+    owner_id = user.id if user else None
+    q = db.query(models.Meeting.id)
+    q = q.filter(models.Meeting.owner_id == owner_id) if owner_id else q.filter(models.Meeting.owner_id == None)
+    if payload.meeting_ids is not None:
+        q = q.filter(models.Meeting.id.in_(payload.meeting_ids))
+    if payload.start is not None:
+        q = q.filter(models.Meeting.start_time >= payload.start)
+    if payload.end is not None:
+        q = q.filter(models.Meeting.start_time < payload.end)
+
+    ids = [row.id for row in q.order_by(models.Meeting.id).limit(batch_export.EXPORT_MAX_MEETINGS + 1)]
+    if not ids:
+        raise HTTPException(404, "No meetings match the export request")
+    if len(ids) > batch_export.EXPORT_MAX_MEETINGS:
+        raise HTTPException(413, f"At most {batch_export.EXPORT_MAX_MEETINGS} meetings per export")
+
+    transcript_chars = payload.transcript_chars
+    if transcript_chars is None:
+        transcript_chars = batch_export.EXPORT_TRANSCRIPT_CHARS
+    job = batch_export.start(ids, owner_id, transcript_chars=transcript_chars)
+    return job.to_dict()
+
+
+def _owned_job(job_id: str, user):
+    job = jobs.get(job_id)
+    if not job or job.owner_id != (user.id if user else None):
+        raise HTTPException(404, "Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}", tags=["jobs"])
+def get_job(
+    job_id: str,
+    user=Depends(get_current_user_optional),
+):
+    return _owned_job(job_id, user).to_dict()
 
-    doc.build(elements)
 
-    return FileResponse(
-        tmp.name,
-        filename=f"meeting-{meeting_id}.pdf",
-        media_type="application/pdf",
-    )
+@router.get("/jobs/{job_id}/download", tags=["jobs"])
+def download_job_result(
+    job_id: str,
+    user=Depends(get_current_user_optional),
+):
+    job = _owned_job(job_id, user)
+    if job.status != DONE or not job.result_path:
+        raise HTTPException(409, f"Job is {job.status}")
+    return FileResponse(job.result_path, filename=job.result_name, media_type="application/zip")
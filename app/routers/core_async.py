@@ -0,0 +1,107 @@
+# backend/app/routers/core_async.py
+# Async versions of the high-traffic routes in core.py. main.py mounts this router
+# ahead of core when DB_ASYNC=true, so these paths shadow their sync twins.
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+
+from ..database import get_async_db
+from .. import crud_async, schemas, quota, http_cache
+from ..http_cache import etag_matches, FastJSONResponse
+from ..auth.dependencies import (
+    get_current_user_optional_async,
+)
+
+router = APIRouter()
+
+
+# =========================
+# MEETINGS
+# =========================
+@router.get("/meetings/{meeting_id}", response_model=schemas.MeetingOut, tags=["meetings"])
+async def get_meeting_endpoint(
+    meeting_id: int,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    version = await crud_async.meeting_version(db, meeting_id)
+    if not version:
+        raise HTTPException(404, "Meeting not found")
+    etag = http_cache.version_etag("meeting", meeting_id, *version)
+    last_modified = max(filter(None, (version[0], version[2])), default=None)
+    headers = http_cache.validator_headers(etag, last_modified)
+    if http_cache.not_modified(etag, last_modified, if_none_match, if_modified_since):
+        return Response(status_code=304, headers=headers)
+
+    meeting = await crud_async.get_meeting(db, meeting_id)
+    if not meeting:
+        raise HTTPException(404, "Meeting not found")
+    return FastJSONResponse(schemas.meeting_out_dict(meeting), headers=headers)
+
+
+@router.get("/meetings/", response_model=List[schemas.MeetingOut], tags=["meetings"])
+async def list_meetings_endpoint(
+    skip: int = 0,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_optional_async),
+):
+    return await crud_async.list_meetings(
+        db,
+        owner_id=user.id if user else None,
+        skip=skip,
+        limit=limit,
+    )
+
+
+# =========================
+# TASKS
+# =========================
+@router.get("/tasks/", response_model=List[schemas.TaskOut], tags=["tasks"])
+async def list_tasks_endpoint(
+    meeting_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    user=Depends(get_current_user_optional_async),
+):
+    filters = dict(
+        completed=completed,
+        due_after=due_after,
+        due_before=due_before,
+        skip=skip,
+        limit=limit,
+    )
+    if not user and await db.run_sync(quota.exceeds, quota.MEETINGS_TOTAL, 1):
+        raise HTTPException(
+            status_code=401,
+            detail="Login required to view tasks",
+        )
+    user_id = user.id if user else None
+
+    version = await crud_async.tasks_version(db, meeting_id, user_id, completed, due_after, due_before)
+    etag = http_cache.version_etag("tasks", user_id, meeting_id, completed, due_after, due_before, skip, limit, *version)
+    headers = http_cache.validator_headers(etag, None)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    tasks = await crud_async.list_tasks(db, meeting_id, user_id=user_id, **filters)
+    return FastJSONResponse([schemas.task_out_dict(t) for t in tasks], headers=headers)
+
+
+@router.put("/tasks/{task_id}", response_model=schemas.TaskOut, tags=["tasks"])
+async def update_task_endpoint(
+    task_id: int,
+    payload: schemas.TaskUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    task = await crud_async.update_task(db, task_id, payload.dict(exclude_unset=True))
+    if not task:
+        raise HTTPException(404, "Task not found")
+    return task
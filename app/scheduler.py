@@ -0,0 +1,211 @@
+# backend/app/scheduler.py
+# Admission scheduler in front of the ASR and summarization stages.
+#
+# Without it the executor runs work in arrival order, so one user's 3-hour
+# upload delays every short recording queued behind it. Here each job waits in
+# its stage's queue until a slot frees up; the next job to start is the one with
+# the lowest score:
+#
+#     estimated seconds + SCHED_FAIR_WEIGHT * owner's recent usage - SCHED_AGING * seconds waited
+#
+#   - shortest job first: the estimate is the job's units (audio seconds for
+#     ASR, ~tokens for summaries) times a seconds-per-unit rate that starts at
+#     SCHED_ASR_RTF / SCHED_SUMMARIZE_SECONDS_PER_TOKEN and follows observed runs
+#   - fair share: usage is the ML seconds the owner was charged, decaying with
+#     SCHED_FAIR_HALFLIFE, so a heavy user yields to light ones
+#   - SCHED_MAX_INFLIGHT_PER_USER caps one owner's running jobs across stages
+#   - aging: every second waited lowers the score, so long jobs still start;
+#     running jobs are never preempted
+#
+# Slots per stage default to what the CPU thread budget can run side by side
+# (see app/thread_budget.py). Wait times are recorded per stage and priority
+# class (short / medium / long estimate). ML_SCHEDULER=false admits everything.
+import asyncio
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from . import metrics, thread_budget
+
+ML_SCHEDULER = os.getenv("ML_SCHEDULER", "true").lower() == "true"
+SCHED_MAX_INFLIGHT_PER_USER = int(os.getenv("SCHED_MAX_INFLIGHT_PER_USER", "2"))
+SCHED_AGING = float(os.getenv("SCHED_AGING", "1.0"))
+SCHED_FAIR_WEIGHT = float(os.getenv("SCHED_FAIR_WEIGHT", "1.0"))
+SCHED_FAIR_HALFLIFE = float(os.getenv("SCHED_FAIR_HALFLIFE", "300"))
+# priority classes by estimated seconds: short <= SHORT < medium <= LONG < long
+SCHED_SHORT_SECONDS = float(os.getenv("SCHED_SHORT_SECONDS", "30"))
+SCHED_LONG_SECONDS = float(os.getenv("SCHED_LONG_SECONDS", "300"))
+# weight of the newest run in the learned seconds-per-unit rate
+_RATE_ALPHA = 0.2
+
+
+def _default_slots(engine: str) -> int:
+    if not thread_budget.ENABLED:
+        return 1
+    return max(1, thread_budget.CPU_THREAD_BUDGET // thread_budget.ENGINE_THREADS[engine])
+
+
+STAGES = {
+    "asr": {
+        "slots": int(os.getenv("SCHED_ASR_SLOTS", "0")) or _default_slots("asr"),
+        "seconds_per_unit": float(os.getenv("SCHED_ASR_RTF", "0.15")),
+    },
+    "summarize": {
+        "slots": int(os.getenv("SCHED_SUMMARIZE_SLOTS", "0")) or _default_slots("torch"),
+        "seconds_per_unit": float(os.getenv("SCHED_SUMMARIZE_SECONDS_PER_TOKEN", "0.004")),
+    },
+}
+
+
+def priority_class(estimate: float) -> str:
+    if estimate <= SCHED_SHORT_SECONDS:
+        return "short"
+    return "medium" if estimate <= SCHED_LONG_SECONDS else "long"
+
+
+class _Job:
+    __slots__ = ("stage", "owner", "units", "estimate", "priority", "seq", "enqueued", "started", "loop", "future")
+
+    def __init__(self, stage: str, owner: str, units: float, estimate: float, seq: int):
+        self.stage = stage
+        self.owner = owner
+        self.units = units
+        self.estimate = estimate
+        self.priority = priority_class(estimate)
+        self.seq = seq
+        self.enqueued = time.monotonic()
+        self.started: Optional[float] = None
+        self.loop = asyncio.get_running_loop()
+        self.future = self.loop.create_future()
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Scheduler:
+    """Per-stage slots handed out by score; callers await admission on their own loop."""
+
+    def __init__(self, stages: Dict[str, dict] = STAGES):
+        self._lock = threading.Lock()
+        self._slots = {name: cfg["slots"] for name, cfg in stages.items()}
+        self._rate = {name: cfg["seconds_per_unit"] for name, cfg in stages.items()}
+        self._queues = {name: [] for name in stages}
+        self._running = {name: 0 for name in stages}
+        self._inflight = {}     # owner -> running jobs, all stages
+        self._usage = {}        # owner -> (charged seconds, monotonic stamp)
+        self._seq = itertools.count()
+
+    def estimate(self, stage: str, units: float) -> float:
+        return max(0.0, units) * self._rate[stage]
+
+    # ----- fair share -----
+
+    def _usage_at(self, owner: str, now: float) -> float:
+        value, stamp = self._usage.get(owner, (0.0, now))
+        return value * 0.5 ** ((now - stamp) / SCHED_FAIR_HALFLIFE)
+
+    def _charge(self, owner: str, seconds: float, now: float):
+        usage = max(0.0, self._usage_at(owner, now) + seconds)
+        if usage < 0.01 and not self._inflight.get(owner):
+            self._usage.pop(owner, None)
+        else:
+            self._usage[owner] = (usage, now)
+
+    # ----- dispatch (lock held) -----
+
+    def _score(self, job: _Job, now: float) -> float:
+        return job.estimate + SCHED_FAIR_WEIGHT * self._usage_at(job.owner, now) - SCHED_AGING * (now - job.enqueued)
+
+    def _dispatch(self):
+        now = time.monotonic()
+        for stage, queue in self._queues.items():
+            while queue and self._running[stage] < self._slots[stage]:
+                eligible = [j for j in queue if self._inflight.get(j.owner, 0) < SCHED_MAX_INFLIGHT_PER_USER]
+                if not eligible:
+                    break
+                job = min(eligible, key=lambda j: (self._score(j, now), j.seq))
+                queue.remove(job)
+                job.started = now
+                self._running[stage] += 1
+                self._inflight[job.owner] = self._inflight.get(job.owner, 0) + 1
+                # charged up front so the owner's other queued jobs see it right away
+                self._charge(job.owner, job.estimate, now)
+                job.loop.call_soon_threadsafe(_wake, job.future)
+
+    # ----- API -----
+
+    async def acquire(self, stage: str, owner: str, units: float) -> _Job:
+        job = _Job(stage, owner, units, self.estimate(stage, units), next(self._seq))
+        with self._lock:
+            self._queues[stage].append(job)
+            self._dispatch()
+        try:
+            await job.future
+        except asyncio.CancelledError:
+            with self._lock:
+                admitted = job.started is not None
+                if not admitted:
+                    self._queues[stage].remove(job)
+            if admitted:
+                self.release(job, completed=False)
+            raise
+        metrics.ML_QUEUE_WAIT.observe(job.started - job.enqueued, stage=stage, priority=job.priority)
+        return job
+
+    def release(self, job: _Job, completed: bool = True):
+        now = time.monotonic()
+        elapsed = now - job.started
+        with self._lock:
+            self._running[job.stage] -= 1
+            left = self._inflight[job.owner] - 1
+            if left:
+                self._inflight[job.owner] = left
+            else:
+                del self._inflight[job.owner]
+            # replace the up-front estimate with what the job actually took
+            self._charge(job.owner, elapsed - job.estimate, now)
+            if completed and job.units > 0:
+                rate = self._rate[job.stage]
+                self._rate[job.stage] = (1 - _RATE_ALPHA) * rate + _RATE_ALPHA * elapsed / job.units
+            self._dispatch()
+
+    @asynccontextmanager
+    async def job(self, stage: str, owner: str, units: float):
+        """Hold a slot of `stage` for the body; waits for admission first."""
+        if not ML_SCHEDULER:
+            yield
+            return
+        job = await self.acquire(stage, owner, units)
+        completed = False
+        try:
+            yield
+            completed = True
+        finally:
+            self.release(job, completed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                stage: {
+                    "queued": len(self._queues[stage]),
+                    "running": self._running[stage],
+                    "slots": self._slots[stage],
+                    "seconds_per_unit": round(self._rate[stage], 6),
+                }
+                for stage in self._queues
+            }
+
+
+scheduler = Scheduler()
+
+
+def describe() -> str:
+    if not ML_SCHEDULER:
+        return "off"
+    slots = ", ".join(f"{stage}={cfg['slots']}" for stage, cfg in STAGES.items())
+    return f"slots {slots}, {SCHED_MAX_INFLIGHT_PER_USER} in flight per user"
@@ -1,5 +1,5 @@
 # backend/app/schemas.py
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, conint
 from typing import Optional, List
 from datetime import datetime
 
@@ -27,6 +27,9 @@ class TaskUpdate(BaseModel):
     due_date: Optional[datetime] = None
     completed: Optional[bool] = None
 
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
 class TaskOut(TaskCreate):
     id: int
     completed: bool
@@ -45,3 +48,37 @@ class MeetingOut(MeetingCreate):
     tasks: List[TaskOut] = []
     class Config:
         orm_mode = True
+
+# Hot read paths build response dicts straight from ORM rows with these and hand them
+# to FastJSONResponse, skipping from_orm validation + jsonable_encoder. They emit the
+# same fields as TaskOut / MeetingOut.
+def task_out_dict(task) -> dict:
+    return {f: getattr(task, f) for f in TaskOut.__fields__}
+
+def meeting_out_dict(meeting) -> dict:
+    out = {f: getattr(meeting, f) for f in MeetingOut.__fields__ if f != "tasks"}
+    out["tasks"] = [task_out_dict(t) for t in meeting.tasks]
+    return out
+
+class BatchExportRequest(BaseModel):
+    meeting_ids: Optional[List[int]] = None
+    # or select by meeting start time (e.g. a whole quarter)
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    transcript_chars: Optional[conint(ge=0)] = None
+
+
+class SearchResult(BaseModel):
+    meeting_id: int
+    title: Optional[str] = None
+    start_time: Optional[datetime] = None
+    score: float
+    # HTML-escaped excerpt with matches wrapped in <mark>
+    snippet: str
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+    skip: int
+    limit: int
+    has_more: bool
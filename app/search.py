@@ -0,0 +1,233 @@
+# backend/app/search.py
+# Full-text search over meeting titles, transcripts, summaries and task titles.
+#
+# SQLite: an FTS5 table (meeting_search, rowid = meeting id) ranked with bm25.
+# Postgres: meeting_search(meeting_id, document tsvector) with a GIN index,
+# ranked with ts_rank_cd. The table is not on Base.metadata; migration 0003 or
+# ensure_index() at startup creates it.
+#
+# The index follows the ORM: a flush that touches a meeting's searchable columns
+# or its tasks re-indexes that meeting in the same transaction. Bulk paths that
+# bypass the unit of work (bulk_*_mappings, Core inserts) call index_meetings().
+import html
+import os
+import re
+from typing import Iterable, List, Optional
+
+from sqlalchemy import bindparam, event, inspect, text
+from sqlalchemy.orm import Session
+
+from . import models
+
+SEARCH_LANGUAGE = os.getenv("SEARCH_LANGUAGE", "english")
+if not re.fullmatch(r"[a-z_]+", SEARCH_LANGUAGE):
+    raise ValueError(f"invalid SEARCH_LANGUAGE: {SEARCH_LANGUAGE}")
+
+TABLE = "meeting_search"
+# snippet markers, swapped for <mark> after the text is HTML-escaped
+_OPEN, _CLOSE = "\ue000", "\ue001"
+
+_MEETING_FIELDS = ("title", "transcript", "summary")
+_TASK_FIELDS = ("title", "meeting_id")
+
+# dialect name -> whether the index table exists (checked once per process)
+_available = {}
+
+
+class SearchUnavailable(RuntimeError):
+    """Search cannot run here (no index, unsupported dialect, no model); the API answers 503."""
+
+
+# ===============================
+# DDL
+# ===============================
+
+def create_index_sql(dialect: str) -> List[str]:
+    if dialect == "sqlite":
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+            "title, transcript, summary, tasks, tokenize='porter unicode61')"
+        ]
+    if dialect == "postgresql":
+        return [
+            f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+            "meeting_id INTEGER PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)",
+            f"CREATE INDEX IF NOT EXISTS ix_{TABLE}_document ON {TABLE} USING GIN (document)",
+        ]
+    raise SearchUnavailable(f"full-text search is not supported on {dialect}")
+
+
+def _has_index(conn) -> bool:
+    name = conn.dialect.name
+    if name not in _available:
+        _available[name] = inspect(conn).has_table(TABLE)
+    return _available[name]
+
+
+def ensure_index(engine):
+    """Create the index if missing and fill it from existing meetings."""
+    with engine.begin() as conn:
+        if conn.dialect.name not in ("sqlite", "postgresql"):
+            print(f"[search] full-text search unavailable on {conn.dialect.name}")
+            return
+        if inspect(conn).has_table(TABLE):
+            _available[conn.dialect.name] = True
+            return
+        for stmt in create_index_sql(conn.dialect.name):
+            conn.exec_driver_sql(stmt)
+        _available[conn.dialect.name] = True
+        rebuild(conn)
+        print("[search] built full-text index")
+
+
+# ===============================
+# INDEXING
+# ===============================
+
+_TASKS_SQLITE = "(SELECT group_concat(t.title, ' ') FROM tasks t WHERE t.meeting_id = m.id)"
+_TASKS_PG = "(SELECT string_agg(t.title, ' ') FROM tasks t WHERE t.meeting_id = m.id)"
+
+_UPSERT = {
+    "sqlite": (
+        f"INSERT INTO {TABLE} (rowid, title, transcript, summary, tasks) "
+        "SELECT m.id, coalesce(m.title, ''), coalesce(m.transcript, ''), coalesce(m.summary, ''), "
+        f"coalesce({_TASKS_SQLITE}, '') "
+        "FROM meetings m WHERE m.id IN :ids"
+    ),
+    "postgresql": (
+        f"INSERT INTO {TABLE} (meeting_id, document) "
+        f"SELECT m.id, "
+        f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(m.title, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(m.summary, '')), 'B') || "
+        f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce({_TASKS_PG}, '')), 'B') || "
+        f"setweight(to_tsvector('{SEARCH_LANGUAGE}', coalesce(m.transcript, '')), 'C') "
+        "FROM meetings m WHERE m.id IN :ids "
+        "ON CONFLICT (meeting_id) DO UPDATE SET document = EXCLUDED.document"
+    ),
+}
+
+
+def _index(conn, ids: List[int]):
+    dialect = conn.dialect.name
+    if dialect not in _UPSERT or not ids or not _has_index(conn):
+        return
+    if dialect == "sqlite":
+        # FTS5 has no upsert; replace the rows
+        conn.execute(text(f"DELETE FROM {TABLE} WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)), {"ids": ids})
+    conn.execute(text(_UPSERT[dialect]).bindparams(bindparam("ids", expanding=True)), {"ids": ids})
+
+
+def index_meetings(db: Session, meeting_ids: Iterable[int]):
+    """Re-index meetings inside the caller's transaction (caller commits)."""
+    _index(db.connection(), sorted({int(i) for i in meeting_ids if i is not None}))
+
+
+def rebuild(conn, batch: int = 500):
+    ids = [row[0] for row in conn.exec_driver_sql("SELECT id FROM meetings ORDER BY id")]
+    for i in range(0, len(ids), batch):
+        _index(conn, ids[i:i + batch])
+
+
+def _changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[f].history.has_changes() for f in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    ids = session.info.setdefault("search_reindex", set())
+    for obj in session.new:
+        if isinstance(obj, models.Meeting):
+            ids.add(obj.id)
+        elif isinstance(obj, models.Task):
+            ids.add(obj.meeting_id)
+    for obj in session.dirty:
+        if isinstance(obj, models.Meeting) and _changed(obj, _MEETING_FIELDS):
+            ids.add(obj.id)
+        elif isinstance(obj, models.Task) and _changed(obj, _TASK_FIELDS):
+            ids.add(obj.meeting_id)
+            # a task moved between meetings leaves the old one stale too
+            ids.update(v for v in inspect(obj).attrs.meeting_id.history.deleted if v is not None)
+    for obj in session.deleted:
+        if isinstance(obj, models.Task):
+            ids.add(obj.meeting_id)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _reindex_changes(session, flush_context):
+    ids = session.info.pop("search_reindex", None)
+    if ids:
+        index_meetings(session, ids)
+
+
+# ===============================
+# QUERY
+# ===============================
+
+_SEARCH = {
+    "sqlite": (
+        f"SELECT m.id, m.title, m.start_time, -bm25({TABLE}, 10.0, 1.0, 4.0, 4.0) AS score, "
+        f"snippet({TABLE}, -1, '{_OPEN}', '{_CLOSE}', '…', 16) AS snippet "
+        f"FROM {TABLE} JOIN meetings m ON m.id = {TABLE}.rowid "
+        f"WHERE {TABLE} MATCH :q AND {{owner}} "
+        "ORDER BY score DESC, m.id DESC LIMIT :limit OFFSET :skip"
+    ),
+    "postgresql": (
+        "SELECT m.id, m.title, m.start_time, ts_rank_cd(s.document, q) AS score, "
+        f"ts_headline('{SEARCH_LANGUAGE}', coalesce(m.summary, '') || ' ' || coalesce(m.transcript, ''), q, "
+        f"'StartSel={_OPEN}, StopSel={_CLOSE}, MaxWords=30, MinWords=10, MaxFragments=2, FragmentDelimiter=…') AS snippet "
+        f"FROM {TABLE} s JOIN meetings m ON m.id = s.meeting_id, websearch_to_tsquery('{SEARCH_LANGUAGE}', :q) q "
+        "WHERE s.document @@ q AND {owner} "
+        "ORDER BY score DESC, m.id DESC LIMIT :limit OFFSET :skip"
+    ),
+}
+
+
+def _fts5_query(q: str) -> Optional[str]:
+    """User text -> FTS5 query: every word required, the last one as a prefix."""
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _highlight(snippet: Optional[str]) -> str:
+    return html.escape(snippet or "").replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+def search(db: Session, q: str, owner_id: Optional[int], skip: int = 0, limit: int = 20):
+    """Ranked matches visible to owner_id (None = anonymous meetings).
+
+    Returns (results, has_more); snippets are HTML-escaped with <mark> highlights.
+    """
+    conn = db.connection()
+    dialect = conn.dialect.name
+    if dialect not in _SEARCH or not _has_index(conn):
+        raise SearchUnavailable("full-text search index is not available")
+
+    query = _fts5_query(q) if dialect == "sqlite" else q.strip()
+    if not query:
+        return [], False
+
+    params = {"q": query, "limit": limit + 1, "skip": skip}
+    if owner_id is None:
+        owner = "m.owner_id IS NULL"
+    else:
+        owner = "m.owner_id = :owner_id"
+        params["owner_id"] = owner_id
+
+    rows = conn.execute(text(_SEARCH[dialect].format(owner=owner)), params).all()
+    results = [
+        {
+            "meeting_id": r.id,
+            "title": r.title,
+            "start_time": r.start_time,
+            "score": float(r.score),
+            "snippet": _highlight(r.snippet),
+        }
+        for r in rows[:limit]
+    ]
+    return results, len(rows) > limit
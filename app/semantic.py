@@ -0,0 +1,459 @@
+# backend/app/semantic.py
+# Semantic search: transcripts are cut into overlapping word windows, embedded
+# with a small local sentence-embedding model and stored per owner as a float16
+# memory-mapped matrix. A query is one embedding plus a blocked matrix-vector
+# product over the owner's rows, followed by a top-k partial sort.
+#
+# On-disk layout, one directory per owner under SEMANTIC_INDEX_DIR:
+#   header.json   dim, count (rows in use), capacity, generation, model
+#   vectors.f16   capacity x dim float16, L2-normalized rows
+#   rows.i32      capacity x 2 int32: meeting_id (-1 = deleted), chunk number
+# Rows are append-only; re-indexing a meeting tombstones its old rows, and the
+# file is compacted once tombstones pass SEMANTIC_COMPACT_RATIO (which bumps the
+# generation, so other processes rebuild their float32 copies).
+#
+# numpy / torch / transformers are imported lazily, like the other models.
+import html
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from . import thread_budget
+from .ml_guard import DISABLE_ML
+from .ml_registry import registry, SEMANTIC_SEARCH
+from .search import SearchUnavailable
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+HF_CACHE = os.getenv("HF_CACHE_DIR", r"D:\projects\ai-meeting-notes\models\hf_cache")
+SEMANTIC_INDEX_DIR = os.getenv("SEMANTIC_INDEX_DIR", "./semantic_index")
+SEMANTIC_CHUNK_WORDS = int(os.getenv("SEMANTIC_CHUNK_WORDS", "120"))
+SEMANTIC_CHUNK_OVERLAP = int(os.getenv("SEMANTIC_CHUNK_OVERLAP", "30"))
+SEMANTIC_MAX_CHUNKS = int(os.getenv("SEMANTIC_MAX_CHUNKS", "64"))
+SEMANTIC_COMPACT_RATIO = float(os.getenv("SEMANTIC_COMPACT_RATIO", "0.3"))
+# float32 working copies of hot owners' matrices, kept in RAM (LRU across owners);
+# float16 -> float32 conversion costs more than the matmul itself
+SEMANTIC_CACHE_MB = int(os.getenv("SEMANTIC_CACHE_MB", "512"))
+# owners that do not fit are scanned in blocks of this many rows instead
+SEMANTIC_BLOCK_ROWS = int(os.getenv("SEMANTIC_BLOCK_ROWS", "16384"))
+
+
+# ===============================
+# MODEL
+# ===============================
+
+class Embedder:
+    """Mean-pooled, L2-normalized sentence embeddings from a transformers encoder."""
+
+    def __init__(self, tokenizer, model):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.dim = model.config.hidden_size
+
+    def encode(self, texts: List[str], batch_size: int = 32):
+        import numpy as np
+        import torch
+
+        out = []
+        with torch.inference_mode():
+            for i in range(0, len(texts), batch_size):
+                batch = self.tokenizer(texts[i:i + batch_size], padding=True, truncation=True,
+                                       max_length=256, return_tensors="pt")
+                hidden = self.model(**batch).last_hidden_state
+                mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)
+                out.append(torch.nn.functional.normalize(pooled.float(), dim=1).cpu().numpy())
+        return np.concatenate(out).astype(np.float32) if out else np.zeros((0, self.dim), np.float32)
+
+
+def _load_embedder():
+    """Registry loader; use get_embedder() instead of calling this directly."""
+    from transformers import AutoModel
+    from .model_loading import load_model, load_tokenizer
+
+    tokenizer = load_tokenizer(EMBEDDING_MODEL, cache_dir=HF_CACHE)
+    model = load_model(AutoModel, EMBEDDING_MODEL, cache_dir=HF_CACHE)
+    return Embedder(tokenizer, model)
+
+
+def get_embedder():
+    return registry.get("embedder")
+
+
+# ===============================
+# CHUNKING
+# ===============================
+
+def chunk_meeting(title: Optional[str], summary: Optional[str], transcript: Optional[str]) -> List[str]:
+    """Chunk 0 is title + summary; the rest are overlapping transcript windows.
+
+    Deterministic, so a stored chunk number maps back to its text at query time.
+    """
+    chunks = []
+    head = " ".join(p for p in (title, summary) if p).strip()
+    if head:
+        chunks.append(head)
+    words = (transcript or "").split()
+    step = max(1, SEMANTIC_CHUNK_WORDS - SEMANTIC_CHUNK_OVERLAP)
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + SEMANTIC_CHUNK_WORDS]))
+        if start + SEMANTIC_CHUNK_WORDS >= len(words):
+            break
+    return chunks[:SEMANTIC_MAX_CHUNKS]
+
+
+# ===============================
+# PER-OWNER VECTOR STORE
+# ===============================
+
+class _DirLock:
+    """Cross-process writer lock (O_EXCL lock file); works on Windows and POSIX."""
+
+    def __init__(self, path: str, stale_after: float = 120.0):
+        self.path = path
+        self.stale_after = stale_after
+
+    def __enter__(self):
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    pass
+                time.sleep(0.01)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class OwnerIndex:
+    def __init__(self, directory: str):
+        self.dir = directory
+        self._lock = threading.Lock()
+        self._header_mtime = None
+        self.dim = 0
+        self.count = 0
+        self.capacity = 0
+        self.generation = 0
+        self.vectors = None
+        self.rows = None
+        self._f32 = None             # float32 copy of vectors[:_f32_rows]
+        self._f32_rows = 0
+        self._f32_generation = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def _refresh(self):
+        """(Re)open the memmaps if another process or thread changed the header."""
+        import numpy as np
+
+        try:
+            mtime = os.stat(self._path("header.json")).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._header_mtime:
+            return
+        with open(self._path("header.json")) as f:
+            header = json.load(f)
+        self.dim, self.count, self.capacity = header["dim"], header["count"], header["capacity"]
+        self.generation = header.get("generation", 0)
+        self.vectors = np.memmap(self._path("vectors.f16"), dtype=np.float16, mode="r+", shape=(self.capacity, self.dim))
+        self.rows = np.memmap(self._path("rows.i32"), dtype=np.int32, mode="r+", shape=(self.capacity, 2))
+        self._header_mtime = mtime
+
+    def _write_header(self):
+        tmp = self._path("header.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"dim": self.dim, "count": self.count, "capacity": self.capacity,
+                       "generation": self.generation, "model": EMBEDDING_MODEL}, f)
+        os.replace(tmp, self._path("header.json"))
+        self._header_mtime = os.stat(self._path("header.json")).st_mtime_ns
+
+    def _grow(self, needed: int, dim: int):
+        import numpy as np
+
+        capacity = max(1024, self.capacity)
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self.capacity and self.dim == dim:
+            return
+        self.vectors = self.rows = None
+        # row-major files: extending them keeps existing rows in place
+        for name, row_bytes in (("vectors.f16", dim * 2), ("rows.i32", 8)):
+            with open(self._path(name), "ab") as f:
+                f.truncate(capacity * row_bytes)
+        self.dim, self.capacity = dim, capacity
+        self.vectors = np.memmap(self._path("vectors.f16"), dtype=np.float16, mode="r+", shape=(capacity, dim))
+        self.rows = np.memmap(self._path("rows.i32"), dtype=np.int32, mode="r+", shape=(capacity, 2))
+
+    def replace_meeting(self, meeting_id: int, vectors):
+        """Tombstone a meeting's old rows and append its new ones."""
+        with self._lock, _DirLock(self._path("lock")):
+            self._refresh()
+            if self.count and vectors.shape[1] != self.dim:
+                raise ValueError(f"embedding dim {vectors.shape[1]} != index dim {self.dim}; rebuild the index")
+            if self.count:
+                self.rows[: self.count, 0][self.rows[: self.count, 0] == meeting_id] = -1
+            n = len(vectors)
+            self._grow(self.count + n, vectors.shape[1])
+            self.vectors[self.count:self.count + n] = vectors
+            self.rows[self.count:self.count + n, 0] = meeting_id
+            self.rows[self.count:self.count + n, 1] = range(n)
+            self.vectors.flush()
+            self.rows.flush()
+            # readers only look at rows below count, so publish it last
+            self.count += n
+            self._write_header()
+            if self.count and (self.rows[: self.count, 0] < 0).mean() > SEMANTIC_COMPACT_RATIO:
+                self._compact()
+
+    def _compact(self):
+        keep = self.rows[: self.count, 0] >= 0
+        n = int(keep.sum())
+        self.vectors[:n] = self.vectors[: self.count][keep]
+        self.rows[:n] = self.rows[: self.count][keep]
+        self.vectors.flush()
+        self.rows.flush()
+        self.count = n
+        self.generation += 1
+        self._write_header()
+
+    def cache_bytes(self) -> int:
+        return 0 if self._f32 is None else self._f32.nbytes
+
+    def drop_cache(self):
+        self._f32, self._f32_rows, self._f32_generation = None, 0, None
+
+    def _sync_cache(self):
+        """Bring the float32 copy up to self.count; appended rows convert incrementally.
+
+        Called with self._lock held. Returns None if the owner exceeds the cache budget.
+        """
+        import numpy as np
+
+        if self.count * self.dim * 4 > SEMANTIC_CACHE_MB * 2**20:
+            self.drop_cache()
+            return None
+        if self._f32_generation != self.generation or self._f32 is None or self._f32.shape[1] != self.dim:
+            self._f32, self._f32_rows = None, 0
+            self._f32_generation = self.generation
+        if self._f32 is None or len(self._f32) < self.count:
+            grown = np.empty((self.capacity, self.dim), dtype=np.float32)
+            if self._f32_rows:
+                grown[: self._f32_rows] = self._f32[: self._f32_rows]
+            self._f32 = grown
+        if self._f32_rows < self.count:
+            self._f32[self._f32_rows:self.count] = self.vectors[self._f32_rows:self.count]
+            self._f32_rows = self.count
+        return self._f32
+
+    def search(self, query, k: int, per_meeting: bool = False) -> List[Tuple[int, int, float]]:
+        """Top-k (meeting_id, chunk, score) by dot product with a normalized query.
+
+        per_meeting=True returns k distinct meetings, each with its best chunk:
+        the candidate set widens (over the same scores) until k meetings are
+        found or the index is exhausted.
+        """
+        import numpy as np
+
+        q = np.asarray(query, dtype=np.float32).reshape(-1)
+        with self._lock:
+            self._refresh()
+            count, vectors = self.count, self.vectors
+            if not count or vectors is None:
+                return []
+            # snapshot: a compaction after the lock is released moves rows around
+            rows = np.array(self.rows[:count])
+            cached = self._sync_cache()
+            if cached is not None:
+                # one sgemv over the whole owner; rows past count are ignored
+                scores = cached[:count] @ q
+        if cached is None:
+            scores = self._blocked_scores(vectors, count, q)
+        else:
+            _touch(self)
+        scores[rows[:, 0] < 0] = -np.inf
+
+        def top(n: int):
+            idx = np.argpartition(scores, -n)[-n:] if count > n else np.arange(count)
+            idx = idx[np.argsort(-scores[idx])]
+            return [
+                (int(rows[i, 0]), int(rows[i, 1]), float(scores[i]))
+                for i in idx
+                if np.isfinite(scores[i])
+            ]
+
+        if not per_meeting:
+            return top(k)
+        # several chunks can belong to one meeting; start at 4 per wanted meeting
+        n = k * 4
+        while True:
+            best: Dict[int, Tuple[int, int, float]] = {}
+            for hit in top(n):
+                best.setdefault(hit[0], hit)
+            if len(best) >= k or n >= count:
+                return list(best.values())[:k]
+            n *= 2
+
+    @staticmethod
+    def _blocked_scores(vectors, count: int, q):
+        import numpy as np
+
+        scores = np.empty(count, dtype=np.float32)
+        block = min(SEMANTIC_BLOCK_ROWS, count)
+        scratch = np.empty((block, q.shape[0]), dtype=np.float32)
+        for start in range(0, count, block):
+            end = min(count, start + block)
+            buf = scratch[: end - start]
+            # float16 has no BLAS path; convert a block, then one sgemv
+            np.copyto(buf, vectors[start:end], casting="unsafe")
+            np.matmul(buf, q, out=scores[start:end])
+        return scores
+
+
+_indexes: Dict[str, OwnerIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+_cache_lru: "OrderedDict[int, OwnerIndex]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _touch(index: OwnerIndex):
+    """Mark an owner's float32 copy as recently used and evict others over budget.
+
+    Called without any index lock held; victims are dropped under their own lock.
+    """
+    victims = []
+    with _cache_lock:
+        _cache_lru.pop(id(index), None)
+        _cache_lru[id(index)] = index
+        total = sum(i.cache_bytes() for i in _cache_lru.values())
+        for key in list(_cache_lru):
+            if total <= SEMANTIC_CACHE_MB * 2**20 or key == id(index):
+                continue
+            victim = _cache_lru.pop(key)
+            total -= victim.cache_bytes()
+            victims.append(victim)
+    for victim in victims:
+        with victim._lock:
+            victim.drop_cache()
+
+
+def owner_index(owner_id: Optional[int]) -> OwnerIndex:
+    key = f"user_{owner_id}" if owner_id is not None else "anonymous"
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = OwnerIndex(os.path.join(SEMANTIC_INDEX_DIR, key))
+        return _indexes[key]
+
+
+# ===============================
+# INDEXING (background)
+# ===============================
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="semantic-index")
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return SEMANTIC_SEARCH and not DISABLE_ML
+
+
+def schedule_index(meeting_id: int):
+    """Queue a meeting for (re-)embedding; repeated saves collapse into one job."""
+    if not enabled():
+        return
+    with _pending_lock:
+        if meeting_id in _pending:
+            return
+        _pending.add(meeting_id)
+    _executor.submit(_index_job, meeting_id)
+
+
+def _index_job(meeting_id: int):
+    with _pending_lock:
+        _pending.discard(meeting_id)
+    try:
+        index_meeting(meeting_id)
+    except Exception as e:
+        print(f"[semantic] indexing meeting {meeting_id} failed:", e)
+
+
+def index_meeting(meeting_id: int):
+    from . import database, models
+
+    db = database.SessionLocal()
+    try:
+        meeting = db.get(models.Meeting, meeting_id)
+        if meeting is None:
+            return
+        owner_id = meeting.owner_id
+        chunks = chunk_meeting(meeting.title, meeting.summary, meeting.transcript)
+    finally:
+        db.close()
+
+    embedder = get_embedder()
+    if embedder is None or not chunks:
+        return
+    with thread_budget.stage("torch"):
+        vectors = embedder.encode(chunks)
+    owner_index(owner_id).replace_meeting(meeting_id, vectors)
+
+
+# ===============================
+# QUERY
+# ===============================
+
+def search(db, q: str, owner_id: Optional[int], skip: int = 0, limit: int = 20):
+    """Meetings ranked by their best-matching chunk; same shape as search.search()."""
+    from . import models
+
+    embedder = get_embedder()
+    if embedder is None:
+        raise SearchUnavailable("embedding model unavailable")
+    with thread_budget.stage("torch"):
+        query = embedder.encode([q.strip()])[0]
+
+    hits = owner_index(owner_id).search(query, k=skip + limit + 1, per_meeting=True)
+    ranked = [(meeting_id, (chunk, score)) for meeting_id, chunk, score in hits][skip:]
+    has_more = len(ranked) > limit
+    ranked = ranked[:limit]
+
+    ids = [mid for mid, _ in ranked]
+    meetings = {
+        m.id: m
+        for m in db.query(models.Meeting).filter(models.Meeting.id.in_(ids), models.Meeting.owner_id == owner_id)
+    } if ids else {}
+
+    results = []
+    for meeting_id, (chunk, score) in ranked:
+        m = meetings.get(meeting_id)
+        if m is None:
+            continue
+        chunks = chunk_meeting(m.title, m.summary, m.transcript)
+        text = chunks[chunk] if chunk < len(chunks) else (m.summary or "")
+        results.append({
+            "meeting_id": m.id,
+            "title": m.title,
+            "start_time": m.start_time,
+            "score": score,
+            "snippet": html.escape(re.sub(r"\s+", " ", text)[:300]),
+        })
+    return results, has_more
@@ -1,27 +1,34 @@
 # backend/app/summarizer.py
 import os
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-import torch
+import time
+
+from . import metrics, thread_budget
+from .ml_registry import registry
+
+# transformers / torch are imported inside the loader so importing this module is cheap
 
 SUMMARIZER_MODEL = os.getenv("SUMMARIZER_MODEL", "t5-small")
 HF_CACHE = os.getenv("HF_CACHE_DIR", "D:\\projects\\ai-meeting-notes\\models\\hf_cache")
 
-_summarizer = None
-
 def _device_index():
     try:
+        import torch
         return 0 if torch.cuda.is_available() else -1
     except Exception:
         return -1
 
+def _load_summarizer():
+    """Registry loader; use get_summarizer() instead of calling this directly."""
+    from transformers import pipeline, AutoModelForSeq2SeqLM
+    from .model_loading import load_model, load_tokenizer
+
+    tokenizer = load_tokenizer(SUMMARIZER_MODEL, cache_dir=HF_CACHE)
+    model = load_model(AutoModelForSeq2SeqLM, SUMMARIZER_MODEL, cache_dir=HF_CACHE)
+    device = _device_index()
+    return pipeline("summarization", model=model, tokenizer=tokenizer, device=device)
+
 def get_summarizer():
-    global _summarizer
-    if _summarizer is None:
-        tokenizer = AutoTokenizer.from_pretrained(SUMMARIZER_MODEL, cache_dir=HF_CACHE)
-        model = AutoModelForSeq2SeqLM.from_pretrained(SUMMARIZER_MODEL, cache_dir=HF_CACHE)
-        device = _device_index()
-        _summarizer = pipeline("summarization", model=model, tokenizer=tokenizer, device=device)
-    return _summarizer
+    return registry.get("summarizer")
 
 def _chunk_text(text: str, chunk_chars: int = 1200):
     import re
@@ -48,7 +55,23 @@ def summarize_meeting(text: str, max_length: int = None, min_length: int = 20) -
     if not text or not text.strip():
         return ""
     summarizer = get_summarizer()
+    if summarizer is None:
+        raise RuntimeError("summarizer model unavailable")
+    with thread_budget.stage("torch"):
+        started = time.perf_counter()
+        try:
+            return _summarize(summarizer, text, max_length, min_length)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.SUMMARIZER_SECONDS.observe(elapsed)
+            if elapsed > 0:
+                # chars/4 approximates the token count without loading the tokenizer here
+                metrics.SUMMARIZER_TOKENS_PER_SECOND.observe(len(text) / 4 / elapsed)
+
+
+def _summarize(summarizer, text: str, max_length, min_length: int) -> str:
     chunks = _chunk_text(text, chunk_chars=1200)
+    metrics.SUMMARIZER_CHUNKS.observe(len(chunks))
     summaries = []
     for c in chunks:
         use_max = _choose_max_length(c) if max_length is None else max_length
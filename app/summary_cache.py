@@ -0,0 +1,140 @@
+# backend/app/summary_cache.py
+# Summaries keyed by a hash of the normalized transcript plus everything that
+# shapes the summarizer's output (backend, model, dtype/quantization, length
+# limits). Clients that retry or re-save the same text get the stored summary
+# without a model call.
+#
+# Entries live in summary_cache so every worker shares them. Each hit bumps
+# last_used_at; every SUMMARY_CACHE_EVICT_EVERY stores, rows beyond the newest
+# SUMMARY_CACHE_MAX_ENTRIES are deleted. SUMMARY_CACHE_MAX_ENTRIES=0 disables it.
+# Cache errors never fail a summarization; they count as misses.
+#
+# Callers check lookup() first and only queue compute() in the ML scheduler on a
+# miss (see _summarize in app/routers/core.py).
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from . import database, models
+
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "20000"))
+SUMMARY_CACHE_EVICT_EVERY = int(os.getenv("SUMMARY_CACHE_EVICT_EVERY", "64"))
+# bump when summarize_meeting produces different output for the same inputs
+SUMMARY_CACHE_VERSION = 1
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0, "errors": 0}
+
+
+def _count(stat: str, n: int = 1):
+    with _lock:
+        _stats[stat] += n
+
+
+def stats() -> dict:
+    with _lock:
+        return dict(_stats)
+
+
+def normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(text: str, max_length: Optional[int] = None, min_length: int = 20) -> str:
+    from .ml_registry import ML_BACKEND
+    from .model_loading import MODEL_DTYPE, MODEL_QUANTIZE
+    from .summarizer import SUMMARIZER_MODEL
+
+    config = [SUMMARY_CACHE_VERSION, ML_BACKEND, SUMMARIZER_MODEL, MODEL_DTYPE, MODEL_QUANTIZE, max_length, min_length]
+    payload = json.dumps(config) + "\n" + normalize(text)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _get(key: str) -> Optional[str]:
+    db = database.SessionLocal()
+    try:
+        summary = db.query(models.SummaryCache.summary).filter(models.SummaryCache.key == key).scalar()
+        if summary is not None:
+            db.execute(
+                update(models.SummaryCache)
+                .where(models.SummaryCache.key == key)
+                .values(hits=models.SummaryCache.hits + 1, last_used_at=datetime.utcnow())
+            )
+            db.commit()
+        return summary
+    finally:
+        db.close()
+
+
+def _put(key: str, summary: str):
+    db = database.SessionLocal()
+    try:
+        db.add(models.SummaryCache(key=key, summary=summary))
+        try:
+            db.commit()
+        except IntegrityError:
+            # a concurrent request stored the same key
+            db.rollback()
+            return
+        _count("stores")
+        with _lock:
+            evict = _stats["stores"] % SUMMARY_CACHE_EVICT_EVERY == 0
+        if evict:
+            _evict(db)
+    finally:
+        db.close()
+
+
+def _evict(db):
+    cutoff = (
+        db.query(models.SummaryCache.last_used_at)
+        .order_by(models.SummaryCache.last_used_at.desc())
+        .offset(SUMMARY_CACHE_MAX_ENTRIES)
+        .limit(1)
+        .scalar()
+    )
+    if cutoff is None:
+        return
+    n = db.query(models.SummaryCache).filter(models.SummaryCache.last_used_at <= cutoff).delete(synchronize_session=False)
+    db.commit()
+    _count("evicted", n)
+
+
+def _enabled(text: str) -> bool:
+    return SUMMARY_CACHE_MAX_ENTRIES > 0 and bool(text) and bool(text.strip())
+
+
+def lookup(text: str, max_length: Optional[int] = None, min_length: int = 20) -> Optional[str]:
+    """Stored summary for this text and config, or None (counted as a miss). Blocking."""
+    if not _enabled(text):
+        return None
+    try:
+        summary = _get(cache_key(text, max_length, min_length))
+    except Exception as e:
+        print("[summary_cache] lookup failed:", e)
+        _count("errors")
+        summary = None
+    _count("hits" if summary is not None else "misses")
+    return summary
+
+
+def compute(text: str, max_length: Optional[int] = None, min_length: int = 20) -> str:
+    """summarize_meeting and store the result, without a lookup first. Blocking."""
+    from .summarizer import summarize_meeting
+
+    summary = summarize_meeting(text, max_length, min_length)
+    if summary and _enabled(text):
+        try:
+            _put(cache_key(text, max_length, min_length), summary)
+        except Exception as e:
+            print("[summary_cache] store failed:", e)
+            _count("errors")
+    return summary
+
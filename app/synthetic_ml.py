@@ -0,0 +1,202 @@
+# backend/app/synthetic_ml.py
+# Synthetic inference backend for load tests (ML_BACKEND=synthetic). Stand-ins for
+# Whisper, the summarizer, NER, the spaCy extractor and the sentence embedder that return deterministic
+# output after a configurable delay, so the real routers, DB and executors can be
+# driven at high concurrency without loading any weights.
+#
+# Cost per call is two samples from seeded distributions:
+#   ML_SYNTHETIC_<MODEL>_LATENCY_MS   sleep (releases the GIL, like native inference)
+#   ML_SYNTHETIC_<MODEL>_CPU_MS       pure-Python busy loop (holds the GIL)
+# <MODEL> is WHISPER, SUMMARIZER, NER, SPACY or EMBEDDER. Whisper costs are per second of audio.
+# A spec is "const:MS", "uniform:LO:HI", "normal:MEAN:SD" or "lognormal:MEDIAN:SIGMA".
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+import wave
+from types import SimpleNamespace
+from typing import List, Optional
+
+ML_SYNTHETIC_SEED = int(os.getenv("ML_SYNTHETIC_SEED", "1234"))
+
+DEFAULT_COSTS = {
+    "whisper": ("const:40", "const:0"),
+    "summarizer": ("lognormal:150:0.35", "const:0"),
+    "ner": ("lognormal:8:0.3", "const:0"),
+    "spacy": ("lognormal:5:0.3", "const:0"),
+    "embedder": ("lognormal:4:0.3", "const:0"),
+}
+
+WORDS = ("we", "reviewed", "the", "launch", "plan", "budget", "and", "timeline", "for", "next",
+         "quarter", "customer", "feedback", "was", "positive", "overall", "team", "agreed")
+
+
+class Distribution:
+    """A seeded sampler for one spec; thread-safe, deterministic for a given call order."""
+
+    def __init__(self, spec: str, seed: int):
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        if kind not in ("const", "uniform", "normal", "lognormal"):
+            raise ValueError(f"unknown distribution: {spec}")
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        p = self.params
+        if self.kind == "const":
+            return p[0]
+        with self._lock:
+            if self.kind == "uniform":
+                value = self._rnd.uniform(p[0], p[1])
+            elif self.kind == "normal":
+                value = self._rnd.gauss(p[0], p[1])
+            else:
+                value = p[0] * self._rnd.lognormvariate(0.0, p[1])
+        return max(0.0, value)
+
+
+class Cost:
+    def __init__(self, model: str):
+        latency, cpu = DEFAULT_COSTS[model]
+        prefix = f"ML_SYNTHETIC_{model.upper()}"
+        seed = ML_SYNTHETIC_SEED + int(hashlib.md5(model.encode()).hexdigest()[:6], 16)
+        self.latency = Distribution(os.getenv(f"{prefix}_LATENCY_MS", latency), seed)
+        self.cpu = Distribution(os.getenv(f"{prefix}_CPU_MS", cpu), seed + 1)
+
+    def spend(self, units: float = 1.0):
+        cpu_s = self.cpu.sample() * units / 1000.0
+        if cpu_s > 0:
+            deadline = time.perf_counter() + cpu_s
+            x = 0
+            while time.perf_counter() < deadline:
+                x += 1
+        latency_s = self.latency.sample() * units / 1000.0
+        if latency_s > 0:
+            time.sleep(latency_s)
+
+
+def _sentences(text: str) -> List[str]:
+    return [s.strip() for s in re.split(r'(?<=[\.\?\!])\s+', text) if s.strip()]
+
+
+# ===============================
+# MODELS
+# ===============================
+
+class SyntheticWhisper:
+    """Enough of faster_whisper.WhisperModel for asr._sync_transcribe."""
+
+    SEGMENT_SECONDS = 5.0
+
+    def __init__(self):
+        self.cost = Cost("whisper")
+
+    @staticmethod
+    def _duration(path: str) -> float:
+        try:
+            with wave.open(path, "rb") as w:
+                return w.getnframes() / float(w.getframerate())
+        except Exception:
+            # compressed upload: assume ~128 kbit/s
+            return os.path.getsize(path) / 16000.0
+
+    def transcribe(self, audio, **kwargs):
+        duration = self._duration(audio)
+        self.cost.spend(duration)
+        # text depends only on the audio length, so repeated runs match
+        rnd = random.Random(int(duration * 1000))
+        segments = []
+        start = 0.0
+        while start < duration:
+            end = min(duration, start + self.SEGMENT_SECONDS)
+            text = " ".join(rnd.choice(WORDS) for _ in range(max(1, int((end - start) * 2.5))))
+            segments.append(SimpleNamespace(start=start, end=end, text=text.capitalize() + "."))
+            start = end
+        return iter(segments), SimpleNamespace(language="en", duration=duration)
+
+
+class SyntheticSummarizer:
+    """Callable like a transformers summarization pipeline; returns the lead sentences."""
+
+    def __init__(self):
+        self.cost = Cost("summarizer")
+
+    def __call__(self, text, **kwargs):
+        self.cost.spend()
+        lead = " ".join(_sentences(text)[:2])
+        return [{"summary_text": lead[:400]}]
+
+
+class SyntheticNer:
+    """Callable like the aggregated NER pipeline; capitalized words after the first are PER."""
+
+    def __init__(self):
+        self.cost = Cost("ner")
+
+    def __call__(self, inputs):
+        self.cost.spend()
+        words = re.findall(r"\b[A-Z][a-z]+\b", inputs)[1:]
+        return [{"entity_group": "PER", "score": 0.99, "word": w} for w in words]
+
+
+class SyntheticSpacy:
+    """Runs the whole extractor, like the sidecar's RemoteSpacy (no spaCy Docs here)."""
+
+    remote = True
+
+    def __init__(self):
+        self.cost = Cost("spacy")
+
+    def extract_action_items(self, text: str, participants: Optional[List[str]] = None):
+        items = []
+        for s in _sentences(text):
+            self.cost.spend()
+            if any(k in s.lower() for k in ("action", "todo", "please", "will", "should", "by")):
+                from .nlp.tasks import _parse_deadline
+                items.append({"task": s, "assignee": None, "deadline": _parse_deadline(s), "context": s})
+        return items
+
+
+class SyntheticEmbedder:
+    """Hashed bag-of-words vectors (L2-normalized), shaped like MiniLM output.
+
+    Shared words give related texts a positive cosine, so semantic search ranks
+    sensibly under load tests; there is no notion of paraphrase.
+    """
+
+    dim = 384
+
+    def __init__(self):
+        self.cost = Cost("embedder")
+
+    def encode(self, texts: List[str], batch_size: int = 32):
+        import numpy as np
+
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            self.cost.spend()
+            for word in re.findall(r"[a-z0-9]+", text.lower()):
+                h = int.from_bytes(hashlib.blake2b(word[:6].encode(), digest_size=4).digest(), "little")
+                out[i, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.maximum(norms, 1e-9)
+
+
+MODELS = {
+    "whisper": SyntheticWhisper,
+    "summarizer": SyntheticSummarizer,
+    "ner": SyntheticNer,
+    "spacy": SyntheticSpacy,
+    "embedder": SyntheticEmbedder,
+}
+
+
+def load(name: str):
+    model = MODELS[name]()
+    print(f"[synthetic_ml] {name}: latency={model.cost.latency.kind}{model.cost.latency.params} "
+          f"cpu={model.cost.cpu.kind}{model.cost.cpu.params}")
+    return model
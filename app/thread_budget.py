@@ -0,0 +1,125 @@
+# backend/app/thread_budget.py
+# One CPU budget for the inference engines in this process.
+#
+# Whisper (CTranslate2), torch (summarizer, NER, embedder) and spaCy each default
+# to every core, so a transcription overlapping a summarization runs 2x the
+# threads the box has and both slow down. Instead each engine gets a fixed share
+# of CPU_THREAD_BUDGET (ASR_THREADS / TORCH_THREADS / SPACY_THREADS). Every model
+# call runs inside stage(engine), which holds that many slots of a FIFO gate:
+# stages overlap while their shares fit in the budget and queue otherwise.
+#
+# torch.set_num_threads is process-wide, so concurrent torch stages share one
+# pool; the gate makes sure only budget // TORCH_THREADS of them run at once.
+# CPU_THREAD_BUDGET=0 turns all of this off (engine defaults, no gate).
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from . import metrics
+
+CPU_THREAD_BUDGET = int(os.getenv("CPU_THREAD_BUDGET", str(os.cpu_count() or 1)))
+ENABLED = CPU_THREAD_BUDGET > 0
+
+
+def _share(env: str, default: int) -> int:
+    n = int(os.getenv(env, "0")) or default
+    return max(1, min(n, max(1, CPU_THREAD_BUDGET)))
+
+
+# default split: ASR and torch each get half, so one of each runs side by side
+ENGINE_THREADS = {
+    "asr": _share("ASR_THREADS", CPU_THREAD_BUDGET // 2),
+    "torch": _share("TORCH_THREADS", CPU_THREAD_BUDGET - CPU_THREAD_BUDGET // 2),
+    "spacy": _share("SPACY_THREADS", 1),
+}
+
+
+def threads(engine: str) -> int:
+    """Threads to configure an engine with; 0 means the engine's own default."""
+    return ENGINE_THREADS[engine] if ENABLED else 0
+
+
+class _Gate:
+    """Weighted semaphore with FIFO hand-off, so a wide stage is not starved by narrow ones."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self._cond = threading.Condition()
+        self._queue = deque()
+
+    def acquire(self, n: int):
+        with self._cond:
+            ticket = object()
+            self._queue.append(ticket)
+            while self._queue[0] is not ticket or self.in_use + n > self.capacity:
+                self._cond.wait()
+            self._queue.popleft()
+            self.in_use += n
+            # the next waiter may fit in what is left
+            self._cond.notify_all()
+
+    def release(self, n: int):
+        with self._cond:
+            self.in_use -= n
+            self._cond.notify_all()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._queue)
+
+
+gate = _Gate(max(1, CPU_THREAD_BUDGET))
+
+
+@contextmanager
+def stage(engine: str):
+    """Hold the engine's thread share for the duration of a model call.
+
+    A no-op when the budget is off or the model runs in the inference sidecar
+    (the sidecar applies the budget itself). Do not nest stages.
+    """
+    from .ml_registry import use_remote
+
+    if not ENABLED or use_remote():
+        yield
+        return
+    n = ENGINE_THREADS[engine]
+    started = time.perf_counter()
+    gate.acquire(n)
+    metrics.CPU_STAGE_WAIT.observe(time.perf_counter() - started, engine=engine)
+    try:
+        yield
+    finally:
+        gate.release(n)
+
+
+_torch_configured = False
+
+
+def configure_torch():
+    """Apply the torch share; called by the loaders before a torch model runs."""
+    global _torch_configured
+    if not ENABLED or _torch_configured:
+        return
+    import torch
+
+    torch.set_num_threads(ENGINE_THREADS["torch"])
+    try:
+        # inter-op parallelism would add threads outside the share
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # only settable before the first parallel op
+    _torch_configured = True
+
+
+def stats() -> dict:
+    return {"budget": CPU_THREAD_BUDGET, "in_use": gate.in_use, "waiting": gate.waiting}
+
+
+def describe() -> str:
+    if not ENABLED:
+        return "off"
+    return f"{CPU_THREAD_BUDGET} threads ({', '.join(f'{k}={v}' for k, v in ENGINE_THREADS.items())})"
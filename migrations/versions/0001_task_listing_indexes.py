@@ -0,0 +1,30 @@
+"""task listing indexes
+
+Adds the indexes behind GET /tasks/: meetings.owner_id for the per-user join and
+a composite (meeting_id, completed, due_date) on tasks. Tables themselves are
+created by Base.metadata.create_all at startup; IF NOT EXISTS keeps this safe on
+databases where create_all already built the indexes.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE INDEX IF NOT EXISTS ix_meetings_owner_id ON meetings (owner_id)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_meeting_completed_due "
+        "ON tasks (meeting_id, completed, due_date)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_tasks_meeting_completed_due")
+    op.execute("DROP INDEX IF EXISTS ix_meetings_owner_id")
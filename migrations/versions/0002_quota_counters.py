@@ -0,0 +1,41 @@
+"""quota counters
+
+Creates quota_counters and seeds it from the current meeting counts, replacing
+the per-request COUNT(*) quota checks.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+SEEDS = {
+    "anon_meetings": "SELECT COUNT(*) FROM meetings WHERE owner_id IS NULL",
+    "meetings_total": "SELECT COUNT(*) FROM meetings",
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("quota_counters"):
+        op.create_table(
+            "quota_counters",
+            sa.Column("key", sa.String(64), primary_key=True),
+            sa.Column("value", sa.Integer, nullable=False, server_default="0"),
+        )
+
+    for key, count_sql in SEEDS.items():
+        op.execute(
+            f"INSERT INTO quota_counters (key, value) SELECT '{key}', ({count_sql}) "
+            f"WHERE NOT EXISTS (SELECT 1 FROM quota_counters WHERE key = '{key}')"
+        )
+
+
+def downgrade():
+    op.drop_table("quota_counters")
@@ -0,0 +1,31 @@
+"""meeting full-text search
+
+Creates meeting_search (FTS5 on SQLite, tsvector + GIN on Postgres) and fills it
+from the existing meetings. The app keeps it current afterwards (app/search.py).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app import search
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if sa.inspect(bind).has_table(search.TABLE):
+        return
+    for stmt in search.create_index_sql(bind.dialect.name):
+        op.execute(stmt)
+    search.rebuild(bind)
+
+
+def downgrade():
+    op.execute(f"DROP TABLE IF EXISTS {search.TABLE}")
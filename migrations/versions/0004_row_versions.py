@@ -0,0 +1,35 @@
+"""row versions for conditional GET
+
+Adds updated_at to meetings and tasks (ETag / Last-Modified on the meeting and
+task reads) and backfills it: meetings from start_time, tasks with now.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+TABLES = ("meetings", "tasks")
+
+
+def upgrade():
+    bind = op.get_bind()
+    for table in TABLES:
+        columns = {c["name"] for c in sa.inspect(bind).get_columns(table)}
+        if "updated_at" not in columns:
+            op.add_column(table, sa.Column("updated_at", sa.DateTime, nullable=True))
+
+    op.execute("UPDATE meetings SET updated_at = coalesce(start_time, CURRENT_TIMESTAMP) WHERE updated_at IS NULL")
+    op.execute("UPDATE tasks SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL")
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("updated_at")
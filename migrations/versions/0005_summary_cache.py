@@ -0,0 +1,35 @@
+"""summary cache
+
+Creates summary_cache: summaries keyed by a hash of the normalized transcript
+and the summarizer configuration (see app/summary_cache.py).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("summary_cache"):
+        return
+    op.create_table(
+        "summary_cache",
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("summary", sa.Text, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=True),
+        sa.Column("last_used_at", sa.DateTime, nullable=True),
+        sa.Column("hits", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.create_index("ix_summary_cache_last_used_at", "summary_cache", ["last_used_at"])
+
+
+def downgrade():
+    op.drop_index("ix_summary_cache_last_used_at", table_name="summary_cache")
+    op.drop_table("summary_cache")
@@ -0,0 +1,115 @@
+"""Signup/login load benchmark, run in-process against the ASGI app.
+
+Signs up N users, then logs them in with the given concurrency while a second
+group of clients polls GET /meetings/. Reports auth and CRUD latency side by
+side, so you can see whether hashing starves the request threadpool.
+
+    BCRYPT_ROUNDS=12 PASSWORD_HASH_WORKERS=2 python scripts/bench_auth.py --users 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_auth.db'))
+os.environ.setdefault('DISABLE_ML', 'true')
+# /api/auth/stats is admin-only
+os.environ.setdefault('ADMIN_TOKEN', 'bench')
+
+import httpx
+
+from app import database, quota
+from app.main import app
+
+
+def summarize(latencies, elapsed):
+    data = sorted(latencies)
+
+    def pct(p):
+        return round(data[min(len(data) - 1, int(len(data) * p))] * 1000, 2) if data else None
+
+    return {
+        'requests': len(data),
+        'rps': round(len(data) / elapsed, 1) if elapsed else None,
+        'p50_ms': pct(0.50),
+        'p95_ms': pct(0.95),
+        'p99_ms': pct(0.99),
+    }
+
+
+async def timed(coro, sink):
+    t0 = time.perf_counter()
+    r = await coro
+    sink.append(time.perf_counter() - t0)
+    return r
+
+
+async def run(users, concurrency, pollers):
+    database.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    quota.seed_counters(db)
+    db.close()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        sem = asyncio.Semaphore(concurrency)
+        emails = [f'bench{i}-{int(time.time())}@example.com' for i in range(users)]
+
+        async def signup(email, sink):
+            async with sem:
+                await timed(client.post('/api/auth/signup', json={'email': email, 'password': 'pw-' + email}), sink)
+
+        async def login(email, sink):
+            async with sem:
+                r = await timed(client.post('/api/auth/login', data={'username': email, 'password': 'pw-' + email}), sink)
+                if r.status_code != 200:
+                    print('login failed', r.status_code, r.text, file=sys.stderr)
+
+        signup_lat = []
+        t0 = time.perf_counter()
+        await asyncio.gather(*(signup(e, signup_lat) for e in emails))
+        signup_elapsed = time.perf_counter() - t0
+
+        login_lat, crud_lat = [], []
+        done = asyncio.Event()
+
+        async def poll():
+            while not done.is_set():
+                await timed(client.get('/api/meetings/'), crud_lat)
+
+        poll_tasks = [asyncio.create_task(poll()) for _ in range(pollers)]
+        t0 = time.perf_counter()
+        await asyncio.gather(*(login(e, login_lat) for e in emails))
+        login_elapsed = time.perf_counter() - t0
+        done.set()
+        await asyncio.gather(*poll_tasks)
+
+        stats = (await client.get('/api/auth/stats', headers={'X-Admin-Token': os.environ['ADMIN_TOKEN']})).json()
+
+    return {
+        'users': users,
+        'concurrency': concurrency,
+        'bcrypt_rounds': stats.get('bcrypt_rounds'),
+        'hash_workers': stats.get('workers'),
+        'signup': summarize(signup_lat, signup_elapsed),
+        'login': summarize(login_lat, login_elapsed),
+        'crud_during_login': summarize(crud_lat, login_elapsed),
+        'server_stats': stats,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--users', type=int, default=100)
+    ap.add_argument('--concurrency', type=int, default=32)
+    ap.add_argument('--pollers', type=int, default=4)
+    args = ap.parse_args()
+    print(json.dumps(asyncio.run(run(args.users, args.concurrency, args.pollers)), indent=2))
+
+
+if __name__ == '__main__':
+    main()
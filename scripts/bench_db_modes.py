@@ -0,0 +1,128 @@
+"""Compare requests/sec of the hot read/update paths with DB_ASYNC off and on.
+
+Starts uvicorn twice against a fresh SQLite file (ML disabled), seeds one meeting
+with tasks and hammers GET /meetings/{id}, GET /tasks/ and PUT /tasks/{id}.
+
+    python scripts/bench_db_modes.py --concurrency 64 --duration 15
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def start_server(port, db_path, async_mode):
+    env = dict(os.environ)
+    env.update({
+        'DATABASE_URL': f'sqlite:///{db_path}',
+        'DB_ASYNC': 'true' if async_mode else 'false',
+        'DISABLE_ML': 'true',
+    })
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+        cwd=ROOT, env=env,
+    )
+
+
+async def wait_up(client, timeout=30):
+    start = time.time()
+    while time.time() - start < timeout:
+        try:
+            r = await client.get('/api/')
+            if r.status_code == 200:
+                return True
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.3)
+    return False
+
+
+async def seed(client, n_tasks=20):
+    r = await client.post('/api/meetings/', json={'title': 'Bench meeting'})
+    mid = r.json()['id']
+    r = await client.post(f'/api/meetings/{mid}/tasks/bulk', json=[{'title': f'Task {i}'} for i in range(n_tasks)])
+    return mid, [t['id'] for t in r.json()]
+
+
+async def hammer(client, mid, task_ids, concurrency, duration):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(wid):
+        nonlocal errors
+        i = wid
+        while time.perf_counter() < deadline:
+            kind = i % 3
+            t0 = time.perf_counter()
+            if kind == 0:
+                r = await client.get(f'/api/meetings/{mid}')
+            elif kind == 1:
+                r = await client.get('/api/tasks/', params={'meeting_id': mid})
+            else:
+                tid = task_ids[i % len(task_ids)]
+                r = await client.put(f'/api/tasks/{tid}', json={'completed': bool(i % 2)})
+            latencies.append(time.perf_counter() - t0)
+            if r.status_code >= 400:
+                errors += 1
+            i += concurrency
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2) if latencies else None
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': pct(0.50),
+        'p95_ms': pct(0.95),
+        'p99_ms': pct(0.99),
+    }
+
+
+async def run_mode(async_mode, port, concurrency, duration):
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    proc = start_server(port, db_path, async_mode)
+    try:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}', limits=limits, timeout=30) as client:
+            if not await wait_up(client):
+                raise RuntimeError('server did not start')
+            mid, task_ids = await seed(client)
+            return await hammer(client, mid, task_ids, concurrency, duration)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--concurrency', type=int, default=32)
+    ap.add_argument('--duration', type=float, default=10.0)
+    ap.add_argument('--port', type=int, default=8011)
+    args = ap.parse_args()
+
+    results = {}
+    for name, async_mode in (('sync', False), ('async', True)):
+        print(f'running {name} mode...', file=sys.stderr)
+        results[name] = asyncio.run(run_mode(async_mode, args.port, args.concurrency, args.duration))
+
+    print(json.dumps({'concurrency': args.concurrency, 'duration_s': args.duration, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
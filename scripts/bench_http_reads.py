@@ -0,0 +1,89 @@
+"""Benchmark the polled read endpoints: bytes on the wire and CPU per request.
+
+Seeds a scratch SQLite DB with one meeting (a --words transcript plus --tasks
+tasks) and reports:
+
+    serialize     MeetingOut.from_orm + jsonable_encoder + json.dumps (the
+                  response_model path) vs schemas.meeting_out_dict + orjson
+    http          GET /api/meetings/{id} and GET /api/tasks/ through TestClient:
+                  full 200 (identity and gzip) vs a 304 revalidation, with
+                  bytes and process CPU per request
+
+    python scripts/bench_http_reads.py --words 8000 --tasks 200 --repeat 200
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_pipeline import synthetic_transcript
+
+
+def cpu_per_call(fn, repeat):
+    fn()
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return round((time.process_time() - started) / repeat * 1000, 3)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--words', type=int, default=8000)
+    ap.add_argument('--tasks', type=int, default=100)
+    ap.add_argument('--repeat', type=int, default=200)
+    args = ap.parse_args()
+
+    os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-reads-'), 'reads.db')}")
+    os.environ.setdefault('ML_BACKEND', 'synthetic')
+    os.environ.setdefault('ML_WARMUP', 'false')
+    os.environ.setdefault('EVENT_LOOP_MONITOR_INTERVAL', '0')
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.testclient import TestClient
+    from app import crud, database, schemas
+    from app.http_cache import FastJSONResponse
+    from app.main import app
+
+    out = {'words': args.words, 'tasks': args.tasks, 'json_class': FastJSONResponse.__name__}
+    with TestClient(app) as client:
+        db = database.SessionLocal()
+        meeting = crud.create_meeting(db, schemas.MeetingCreate(title='Bench reads'))
+        crud.add_transcript_and_summary(db, meeting.id, synthetic_transcript(args.words), 'Summary.')
+        crud.bulk_create_tasks(db, meeting.id, [{'title': f'Follow up item {i}'} for i in range(args.tasks)])
+        meeting = crud.get_meeting(db, meeting.id)
+        meeting.tasks  # load once, outside the timings
+
+        legacy = lambda: json.dumps(jsonable_encoder(schemas.MeetingOut.from_orm(meeting)), ensure_ascii=False).encode()
+        fast = lambda: FastJSONResponse(schemas.meeting_out_dict(meeting)).body
+        assert json.loads(legacy()) == json.loads(fast())
+        out['serialize_ms'] = {'response_model': cpu_per_call(legacy, args.repeat), 'fast': cpu_per_call(fast, args.repeat)}
+        db.close()
+
+        http = {}
+        for name, url, params in (('meeting', f'/api/meetings/{meeting.id}', None),
+                                  ('tasks', '/api/tasks/', {'meeting_id': meeting.id, 'limit': 1000})):
+            identity = client.get(url, params=params, headers={'Accept-Encoding': 'identity'})
+            gzipped = client.get(url, params=params, headers={'Accept-Encoding': 'gzip'})
+            etag = identity.headers['etag']
+            revalidate = lambda: client.get(url, params=params, headers={'If-None-Match': etag})
+            assert revalidate().status_code == 304
+            http[name] = {
+                'bytes_identity': int(identity.headers['content-length']),
+                'bytes_gzip': int(gzipped.headers['content-length']),
+                'cpu_ms_200': cpu_per_call(lambda: client.get(url, params=params, headers={'Accept-Encoding': 'identity'}), args.repeat),
+                'cpu_ms_200_gzip': cpu_per_call(lambda: client.get(url, params=params, headers={'Accept-Encoding': 'gzip'}), args.repeat),
+                'cpu_ms_304': cpu_per_call(revalidate, args.repeat),
+            }
+        out['http'] = http
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == '__main__':
+    main()
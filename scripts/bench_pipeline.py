@@ -0,0 +1,367 @@
+"""Benchmark the transcription-to-tasks pipeline and emit JSON comparable across commits.
+
+Inputs are synthetic and seeded: meeting transcripts of configurable length
+(in words) and WAV fixtures (16 kHz mono, speech-band tones plus noise) of
+configurable duration. The stages are:
+
+    chunk_text       summarizer._chunk_text
+    summarize        summarizer.summarize_meeting          (needs the summarizer)
+    actions_hf       actions.extract_action_items          (NER if available, regex otherwise)
+    actions_spacy    nlp.tasks.extract_action_items        (spaCy if available, heuristics otherwise)
+    parse_deadline   actions._parse_deadline and nlp.tasks._parse_deadline
+    asr              asr._sync_transcribe on the WAV fixtures (needs Whisper)
+    crud             bulk_create_tasks / bulk_update_tasks / list_tasks on a scratch SQLite DB
+    http             TestClient end to end, N requests at the given concurrency
+
+Stages whose model is unavailable are reported as skipped, not failed.
+
+    python scripts/bench_pipeline.py --sizes 200,1000,5000 --output bench.json
+    python scripts/bench_pipeline.py --stages chunk_text,parse_deadline,crud,http --repeat 20
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+ALL_STAGES = 'chunk_text,summarize,actions_hf,actions_spacy,parse_deadline,asr,crud,http'
+
+NAMES = ['Alice', 'Bob', 'Carol', 'David', 'Priya', 'Wei', 'Fatima', 'Jonas']
+TOPICS = ['the launch plan', 'the Q3 budget', 'hiring', 'the customer escalation', 'the data migration',
+          'onboarding docs', 'the security review', 'pricing']
+CHATTER = [
+    'We went over {topic} and agreed it needs more detail.',
+    '{name} said the numbers for {topic} look better than last month.',
+    'There was a long discussion about {topic} without a final decision.',
+    'Everyone agreed that {topic} is the top priority for this sprint.',
+    '{name} asked whether {topic} affects the roadmap.',
+]
+ACTIONS = [
+    '{name} will send the summary of {topic} by Friday.',
+    'Action: {name} to prepare the slides for {topic} by next Monday.',
+    'Please {name}, follow up with the vendor about {topic} before 5pm.',
+    'We need {name} to schedule a review of {topic} on 12/09/2025.',
+    'TODO: {name} should finalize {topic} by tomorrow.',
+]
+DEADLINES = ['by Friday', 'before 5pm', 'on 12/09/2025', 'next Monday', 'by tomorrow', 'due 3 March',
+             'no deadline here', 'sometime next week']
+
+
+# ===============================
+# FIXTURES
+# ===============================
+
+def synthetic_transcript(words, seed=0, action_ratio=0.25):
+    rnd = random.Random(seed)
+    sentences = []
+    count = 0
+    while count < words:
+        template = rnd.choice(ACTIONS if rnd.random() < action_ratio else CHATTER)
+        s = template.format(name=rnd.choice(NAMES), topic=rnd.choice(TOPICS))
+        sentences.append(s)
+        count += len(s.split())
+    return ' '.join(sentences)
+
+
+def synthetic_wav(path, seconds, seed=0, rate=16000):
+    """Tones in the speech band with syllable-like envelopes and background noise."""
+    rnd = random.Random(seed)
+    frames = bytearray()
+    n = int(seconds * rate)
+    freq, env_period = 220.0, 0.25
+    for i in range(n):
+        t = i / rate
+        if i % int(env_period * rate) == 0:
+            freq = rnd.uniform(120, 400)
+        envelope = abs(math.sin(math.pi * t / env_period))
+        sample = 0.4 * envelope * math.sin(2 * math.pi * freq * t) + rnd.uniform(-0.02, 0.02)
+        frames += struct.pack('<h', int(max(-1.0, min(1.0, sample)) * 32767))
+    with wave.open(path, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(bytes(frames))
+    return path
+
+
+# ===============================
+# TIMING
+# ===============================
+
+def _stats(samples):
+    samples = sorted(samples)
+    n = len(samples)
+    return {
+        'n': n,
+        'min_ms': round(samples[0] * 1000, 3),
+        'median_ms': round(samples[n // 2] * 1000, 3),
+        'p95_ms': round(samples[min(n - 1, int(n * 0.95))] * 1000, 3),
+        'mean_ms': round(sum(samples) / n * 1000, 3),
+    }
+
+
+def timeit(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return _stats(samples)
+
+
+def skipped(reason):
+    return {'skipped': reason}
+
+
+# ===============================
+# STAGES
+# ===============================
+
+def bench_chunk_text(args, transcripts):
+    from app.summarizer import _chunk_text
+    out = {}
+    for words, text in transcripts.items():
+        r = timeit(lambda: _chunk_text(text, chunk_chars=1200), args.repeat)
+        r['chunks'] = len(_chunk_text(text, chunk_chars=1200))
+        out[str(words)] = r
+    return out
+
+
+def bench_summarize(args, transcripts):
+    from app.summarizer import get_summarizer, summarize_meeting
+    if get_summarizer() is None:
+        return skipped('summarizer model unavailable')
+    out = {}
+    for words, text in transcripts.items():
+        r = timeit(lambda: summarize_meeting(text), args.model_repeat, warmup=0)
+        r['words_per_second'] = round(words / (r['median_ms'] / 1000), 1)
+        out[str(words)] = r
+    return out
+
+
+def _bench_actions(args, transcripts, extract, backend):
+    out = {'backend': backend}
+    for words, text in transcripts.items():
+        r = timeit(lambda: extract(text, NAMES), args.model_repeat)
+        r['items'] = len(extract(text, NAMES))
+        out[str(words)] = r
+    return out
+
+
+def bench_actions_hf(args, transcripts):
+    from app import actions
+    backend = 'hf_ner' if actions.get_ner_pipeline() is not None else 'regex'
+    return _bench_actions(args, transcripts, actions.extract_action_items, backend)
+
+
+def bench_actions_spacy(args, transcripts):
+    from app.nlp import tasks
+    backend = 'spacy' if tasks._get_nlp() is not None else 'heuristic'
+    return _bench_actions(args, transcripts, tasks.extract_action_items, backend)
+
+
+def bench_parse_deadline(args, transcripts):
+    from app import actions
+    from app.nlp import tasks
+    phrases = [f'{name} will do it {d}.' for name in NAMES for d in DEADLINES]
+
+    def run(fn):
+        return lambda: [fn(p) for p in phrases]
+
+    return {
+        'phrases': len(phrases),
+        'actions': timeit(run(actions._parse_deadline), args.repeat),
+        'nlp_tasks': timeit(run(tasks._parse_deadline), args.repeat),
+    }
+
+
+def bench_asr(args, wavs):
+    from app import asr
+    if asr.get_model() is None:
+        return skipped('whisper model unavailable')
+    out = {}
+    for seconds, path in wavs.items():
+        r = timeit(lambda: asr._sync_transcribe(path), args.model_repeat, warmup=0)
+        r['realtime_factor'] = round(seconds / (r['median_ms'] / 1000), 2)
+        out[str(seconds)] = r
+    return out
+
+
+def bench_crud(args):
+    from app import crud, database, schemas
+    db = database.SessionLocal()
+    try:
+        meeting = crud.create_meeting(db, schemas.MeetingCreate(title='bench crud'))
+        due = datetime.utcnow() + timedelta(days=3)
+        out = {}
+        for n in args.task_counts:
+            items = [schemas.TaskCreate(title=f'task {i}', assigned_to=NAMES[i % len(NAMES)], due_date=due)
+                     for i in range(n)]
+            created = []
+
+            def create():
+                created[:] = crud.bulk_create_tasks(db, meeting.id, items)
+
+            def update():
+                crud.bulk_update_tasks(db, [{'id': t.id, 'completed': True} for t in created])
+
+            def list_():
+                crud.list_tasks(db, meeting_id=meeting.id, completed=True, limit=1000)
+
+            out[str(n)] = {
+                'bulk_create': timeit(create, args.repeat, warmup=0),
+                'bulk_update': timeit(update, args.repeat),
+                'list_tasks': timeit(list_, args.repeat),
+            }
+        return out
+    finally:
+        db.close()
+
+
+def bench_http(args, transcripts):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    text = transcripts[min(transcripts)]
+    with TestClient(app) as client:
+        mid = client.post('/api/meetings/', json={'title': 'bench http'}).json()['id']
+        client.post(f'/api/meetings/{mid}/tasks/bulk',
+                    json=[{'title': f'task {i}', 'assigned_to': NAMES[i % len(NAMES)]} for i in range(50)])
+        scenarios = {
+            'create_meeting': lambda: client.post('/api/meetings/', json={'title': 'bench'}),
+            'get_meeting': lambda: client.get(f'/api/meetings/{mid}'),
+            'list_tasks': lambda: client.get('/api/tasks/', params={'meeting_id': mid}),
+            'transcribe_text': lambda: client.post('/api/transcribe/text', params={'meeting_id': mid, 'text': text}),
+        }
+        out = {'concurrency': args.concurrency}
+        for name, call in scenarios.items():
+            n = args.model_requests if name == 'transcribe_text' else args.requests
+            out[name] = _drive(call, n, args.concurrency)
+    return out
+
+
+def _drive(call, n, concurrency):
+    def one(_):
+        t0 = time.perf_counter()
+        r = call()
+        return time.perf_counter() - t0, r.status_code
+
+    call()  # warmup
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(n)))
+    elapsed = time.perf_counter() - started
+    r = _stats([lat for lat, _ in results])
+    r['rps'] = round(n / elapsed, 1)
+    r['errors'] = sum(1 for _, code in results if code >= 400)
+    return r
+
+
+# ===============================
+# MAIN
+# ===============================
+
+def git_meta():
+    def git(*cmd):
+        try:
+            return subprocess.check_output(['git', *cmd], cwd=ROOT, stderr=subprocess.DEVNULL).decode().strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {'commit': git('rev-parse', 'HEAD'), 'branch': git('rev-parse', '--abbrev-ref', 'HEAD'),
+            'dirty': bool(status) if status is not None else None}
+
+
+def _ints(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--stages', default=ALL_STAGES)
+    ap.add_argument('--sizes', type=_ints, default=[200, 1000, 5000], help='transcript lengths in words')
+    ap.add_argument('--audio-seconds', type=_ints, default=[10, 60])
+    ap.add_argument('--task-counts', type=_ints, default=[10, 100, 1000])
+    ap.add_argument('--repeat', type=int, default=10, help='iterations for cheap stages')
+    ap.add_argument('--model-repeat', type=int, default=3, help='iterations for model-backed stages')
+    ap.add_argument('--requests', type=int, default=200)
+    ap.add_argument('--model-requests', type=int, default=20)
+    ap.add_argument('--concurrency', type=int, default=8)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--output', help='write JSON here instead of stdout')
+    args = ap.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-pipeline-')
+    # scratch DB unless the caller points at one; must be set before app.database is imported
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(workdir, 'bench.db'))
+    os.environ.setdefault('ANON_MEETING_LIMIT', '1000000000')
+    os.environ.setdefault('ML_WARMUP', 'false')
+
+    from app import database, models  # noqa: F401 (registers the tables)
+    database.Base.metadata.create_all(bind=database.engine)
+    from app import quota
+    db = database.SessionLocal()
+    try:
+        quota.seed_counters(db)
+    finally:
+        db.close()
+
+    transcripts = {w: synthetic_transcript(w, seed=args.seed) for w in args.sizes}
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+
+    results = {}
+    for stage in stages:
+        print(f'[bench] {stage}...', file=sys.stderr)
+        started = time.perf_counter()
+        try:
+            if stage == 'asr':
+                wavs = {s: synthetic_wav(os.path.join(workdir, f'audio_{s}s.wav'), s, seed=args.seed)
+                        for s in args.audio_seconds}
+                results[stage] = bench_asr(args, wavs)
+            elif stage == 'crud':
+                results[stage] = bench_crud(args)
+            else:
+                results[stage] = globals()[f'bench_{stage}'](args, transcripts)
+        except Exception as e:
+            results[stage] = {'error': f'{type(e).__name__}: {e}'}
+        results[stage]['stage_seconds'] = round(time.perf_counter() - started, 2)
+
+    from app.ml_registry import registry
+    report = {
+        'meta': {
+            'git': git_meta(),
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'database': database.DATABASE_URL.split('://')[0],
+            'models': registry.status(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    body = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(body + '\n')
+        print(f'[bench] wrote {args.output}', file=sys.stderr)
+    else:
+        print(body)
+
+
+if __name__ == '__main__':
+    main()
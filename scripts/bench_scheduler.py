@@ -0,0 +1,96 @@
+"""Benchmark the ML scheduler against first-come-first-served on a mixed workload.
+
+One heavy user uploads --long-jobs recordings of --long-seconds audio at t=0;
+--users other users then submit --short-jobs short recordings each, spread over
+the first few seconds. Every job sleeps for audio_seconds * --rtf (scaled by
+--time-scale) while holding an ASR slot, so the run measures queueing only.
+
+    fifo       asyncio.Semaphore(slots): arrival order, what the executor did before
+    scheduler  app.scheduler.Scheduler: shortest job first, fair share, aging
+
+Reports the wait of short jobs (mean / p95) and when the long jobs finished.
+
+    python scripts/bench_scheduler.py --users 8 --short-jobs 4 --long-seconds 10800
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+
+def workload(args):
+    rng = random.Random(args.seed)
+    jobs = [('heavy', args.long_seconds, 0.0) for _ in range(args.long_jobs)]
+    for u in range(args.users):
+        for _ in range(args.short_jobs):
+            jobs.append((f'user{u}', rng.uniform(60, 180), rng.uniform(0.01, args.spread)))
+    return sorted(jobs, key=lambda j: j[2])
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+async def run(policy, args):
+    from app.scheduler import Scheduler
+
+    slots = args.slots
+    sem = asyncio.Semaphore(slots)
+    sched = Scheduler({'asr': {'slots': slots, 'seconds_per_unit': args.rtf * args.time_scale}})
+    started = time.perf_counter()
+    waits, long_done = [], []
+
+    async def job(owner, audio_seconds, delay):
+        await asyncio.sleep(delay)
+        submitted = time.perf_counter()
+        if policy == 'fifo':
+            async with sem:
+                wait = time.perf_counter() - submitted
+                await asyncio.sleep(audio_seconds * args.rtf * args.time_scale)
+        else:
+            async with sched.job('asr', owner, audio_seconds):
+                wait = time.perf_counter() - submitted
+                await asyncio.sleep(audio_seconds * args.rtf * args.time_scale)
+        if owner == 'heavy':
+            long_done.append(time.perf_counter() - started)
+        else:
+            waits.append(wait)
+
+    await asyncio.gather(*(job(*j) for j in workload(args)))
+    return {
+        'short_wait_mean_s': round(sum(waits) / len(waits), 3),
+        'short_wait_p95_s': round(percentile(waits, 0.95), 3),
+        'long_finished_s': [round(t, 2) for t in sorted(long_done)],
+        'makespan_s': round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--users', type=int, default=8)
+    ap.add_argument('--short-jobs', type=int, default=4)
+    ap.add_argument('--long-jobs', type=int, default=2)
+    ap.add_argument('--long-seconds', type=float, default=10800)
+    ap.add_argument('--rtf', type=float, default=0.15, help='processing seconds per audio second')
+    ap.add_argument('--time-scale', type=float, default=0.002, help='shrink simulated time')
+    ap.add_argument('--spread', type=float, default=1.0, help='seconds over which short jobs arrive')
+    ap.add_argument('--slots', type=int, default=1)
+    ap.add_argument('--seed', type=int, default=1)
+    args = ap.parse_args()
+
+    os.environ.setdefault('ML_SCHEDULER', 'true')
+    out = {'jobs': len(workload(args)), 'slots': args.slots}
+    for policy in ('fifo', 'scheduler'):
+        out[policy] = asyncio.run(run(policy, args))
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark semantic-search lookups on a synthetic per-owner vector index.
+
+Builds an index of --meetings meetings with --chunks chunks each (random unit
+vectors, float16 on disk, via app.semantic.OwnerIndex). It then times queries for the
+top --k meetings and reports p50/p95 latency, plus the time to re-index one meeting.
+No embedding model is needed; query embedding time is not included.
+
+    python scripts/bench_semantic.py --meetings 20000 --chunks 8
+    SEMANTIC_CACHE_MB=0 python scripts/bench_semantic.py   # float16 blocks, no RAM copy
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+
+def unit_vectors(rng, n, dim):
+    v = rng.standard_normal((n, dim)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--meetings', type=int, default=20000)
+    ap.add_argument('--chunks', type=int, default=8, help='chunks per meeting')
+    ap.add_argument('--dim', type=int, default=384)
+    ap.add_argument('--queries', type=int, default=200)
+    ap.add_argument('--k', type=int, default=21, help='distinct meetings per query (limit + 1 for limit=20)')
+    args = ap.parse_args()
+
+    from app.semantic import OwnerIndex
+
+    rng = np.random.default_rng(0)
+    index = OwnerIndex(os.path.join(tempfile.mkdtemp(prefix='semantic-bench-'), 'owner'))
+
+    started = time.perf_counter()
+    for mid in range(1, args.meetings + 1):
+        index.replace_meeting(mid, unit_vectors(rng, args.chunks, args.dim))
+    build_s = time.perf_counter() - started
+
+    reindex = []
+    for mid in rng.integers(1, args.meetings + 1, size=50):
+        t0 = time.perf_counter()
+        index.replace_meeting(int(mid), unit_vectors(rng, args.chunks, args.dim))
+        reindex.append(time.perf_counter() - t0)
+
+    queries = unit_vectors(rng, args.queries, args.dim)
+    index.search(queries[0], args.k, per_meeting=True)  # page in the memmap
+    latencies = []
+    for q in queries:
+        t0 = time.perf_counter()
+        index.search(q, args.k, per_meeting=True)
+        latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+    reindex.sort()
+
+    print(json.dumps({
+        'meetings': args.meetings,
+        'rows': index.count,
+        'dim': args.dim,
+        'index_mb': round(index.capacity * args.dim * 2 / 2**20, 1),
+        'build_seconds': round(build_s, 2),
+        'reindex_p50_ms': round(reindex[len(reindex) // 2] * 1000, 2),
+        'query_p50_ms': round(latencies[len(latencies) // 2] * 1000, 2),
+        'query_p95_ms': round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+        'query_max_ms': round(latencies[-1] * 1000, 2),
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark overlapping ASR + summarization with and without the CPU thread budget.
+
+Runs the same mixed batch twice, each in a fresh process (the budget is read at
+import time):
+
+    off     CPU_THREAD_BUDGET=0: every engine uses its own default (all cores)
+    budget  CPU_THREAD_BUDGET=<cores>, split by app.thread_budget
+
+The batch is --jobs jobs at --concurrency, alternating asr._sync_transcribe
+on a synthetic WAV and summarizer.summarize_meeting on a synthetic transcript.
+It reports makespan, jobs/minute and mean latency per stage. The synthetic
+backend is pure Python, so use the real models for meaningful numbers.
+
+    python scripts/bench_thread_budget.py --jobs 16 --concurrency 4
+    python scripts/bench_thread_budget.py --budgets 0,8 --env ASR_THREADS=4 --env TORCH_THREADS=4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_pipeline import synthetic_transcript, synthetic_wav
+
+
+def run_batch(args):
+    """Child process: the actual measurement under the inherited environment."""
+    from app import asr, summarizer, thread_budget
+
+    wav = synthetic_wav(os.path.join(tempfile.mkdtemp(prefix='bench-threads-'), 'job.wav'), args.audio_seconds)
+    text = synthetic_transcript(args.words)
+    if asr.get_model() is None or summarizer.get_summarizer() is None:
+        return {'skipped': 'ASR or summarizer model unavailable'}
+
+    def job(i):
+        t0 = time.perf_counter()
+        if i % 2 == 0:
+            asr._sync_transcribe(wav)
+            stage = 'asr'
+        else:
+            summarizer.summarize_meeting(text)
+            stage = 'summarize'
+        return stage, time.perf_counter() - t0
+
+    job(0), job(1)  # warm caches outside the measurement
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(pool.map(job, range(args.jobs)))
+    makespan = time.perf_counter() - started
+
+    per_stage = {}
+    for stage, seconds in results:
+        per_stage.setdefault(stage, []).append(seconds)
+    return {
+        'budget': thread_budget.describe(),
+        'makespan_s': round(makespan, 2),
+        'jobs_per_min': round(args.jobs / makespan * 60, 1),
+        'mean_latency_s': {k: round(sum(v) / len(v), 2) for k, v in per_stage.items()},
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--jobs', type=int, default=16)
+    ap.add_argument('--concurrency', type=int, default=4)
+    ap.add_argument('--audio-seconds', type=int, default=30)
+    ap.add_argument('--words', type=int, default=1500)
+    ap.add_argument('--budgets', default=f'0,{os.cpu_count() or 1}', help='CPU_THREAD_BUDGET values to compare (0 = off)')
+    ap.add_argument('--env', action='append', default=[], help='extra KEY=VALUE for the runs')
+    ap.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(run_batch(args)))
+        return
+
+    runs = {}
+    for budget in args.budgets.split(','):
+        env = dict(os.environ, CPU_THREAD_BUDGET=budget, ML_WARMUP='false', SEMANTIC_SEARCH='false')
+        env.update(kv.split('=', 1) for kv in args.env)
+        cmd = [sys.executable, __file__, '--child', '--jobs', str(args.jobs), '--concurrency', str(args.concurrency),
+               '--audio-seconds', str(args.audio_seconds), '--words', str(args.words)]
+        print(f'[bench] CPU_THREAD_BUDGET={budget}...', file=sys.stderr)
+        out = subprocess.run(cmd, env=env, cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        runs[budget] = json.loads(out.strip().splitlines()[-1])
+    print(json.dumps({'cpu_count': os.cpu_count(), 'jobs': args.jobs, 'concurrency': args.concurrency, 'runs': runs}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""Memory per worker and throughput: per-worker models vs. the shared inference sidecar.
+
+Layout "per_worker": uvicorn --workers N, every worker loads its own models.
+Layout "sidecar":    python -m app.inference_server + uvicorn --workers N with
+                     INFERENCE_SOCKET set, so the API workers load no weights.
+
+For each layout, it waits for the models to warm up and records RSS and PSS of
+every process (Linux /proc). It then drives POST /api/transcribe/text at the
+given concurrency and prints one JSON document.
+
+    python scripts/bench_workers_memory.py --workers 4 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+TEXT = ('We reviewed the launch plan and the budget. Alice will prepare the slides by Friday. '
+        'Bob should send the pricing proposal to the client next week. ') * 8
+
+
+def proc_mem_kb(pid):
+    mem = {}
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    mem['rss_kb'] = int(line.split()[1])
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    mem['pss_kb'] = int(line.split()[1])
+    except OSError:
+        pass
+    return mem
+
+
+def children(pid):
+    out = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == pid:
+            out.append(int(entry))
+    return out
+
+
+def tree(pid):
+    pids = [pid]
+    for c in children(pid):
+        pids.extend(tree(c))
+    return pids
+
+
+def memory_report(roots):
+    procs = {}
+    for name, pid in roots.items():
+        for p in tree(pid):
+            procs[f'{name}:{p}'] = proc_mem_kb(p)
+    total_pss = sum(m.get('pss_kb', 0) for m in procs.values())
+    return {'processes': procs, 'total_pss_mb': round(total_pss / 1024, 1)}
+
+
+async def wait_ready(client, timeout):
+    start = time.time()
+    while time.time() - start < timeout:
+        try:
+            r = await client.get('/ready')
+            if r.status_code == 200 and r.json().get('models_warm'):
+                return True
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(1)
+    return False
+
+
+async def drive(client, concurrency, duration):
+    r = await client.post('/api/meetings/', json={'title': 'Memory bench'})
+    mid = r.json().get('id', 1)
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            await client.post('/api/transcribe/text', params={'meeting_id': mid, 'text': TEXT})
+            latencies.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+    }
+
+
+async def run_layout(layout, args):
+    env = dict(os.environ)
+    env['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'mem.db')
+    env['ANON_MEETING_LIMIT'] = '1000000'
+    roots = {}
+    procs = []
+
+    if layout == 'sidecar':
+        sock = os.path.join(tempfile.mkdtemp(), 'inference.sock')
+        env['INFERENCE_SOCKET'] = sock
+        env.setdefault('INFERENCE_AUTHKEY', secrets.token_hex(32))
+        side = subprocess.Popen([sys.executable, '-m', 'app.inference_server', '--socket', sock], cwd=ROOT, env=env)
+        procs.append(side)
+        roots['sidecar'] = side.pid
+        for _ in range(600):
+            if os.path.exists(sock):
+                break
+            time.sleep(0.5)
+
+    api = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--host', '127.0.0.1', '--port', str(args.port),
+         '--workers', str(args.workers), '--log-level', 'warning'],
+        cwd=ROOT, env=env,
+    )
+    procs.append(api)
+    roots['api'] = api.pid
+
+    try:
+        async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{args.port}', timeout=600) as client:
+            warm = await wait_ready(client, args.warmup_timeout)
+            # /ready answers from one worker; give the others time to finish their warmup
+            await asyncio.sleep(args.settle)
+            mem = memory_report(roots)
+            load = await drive(client, args.concurrency, args.duration)
+        return {'models_warm': warm, 'memory': mem, 'throughput': load}
+    finally:
+        for p in reversed(procs):
+            p.terminate()
+            try:
+                p.wait(timeout=20)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--workers', type=int, default=4)
+    ap.add_argument('--concurrency', type=int, default=8)
+    ap.add_argument('--duration', type=float, default=20)
+    ap.add_argument('--port', type=int, default=8021)
+    ap.add_argument('--warmup-timeout', type=float, default=600)
+    ap.add_argument('--settle', type=float, default=20)
+    ap.add_argument('--layouts', default='per_worker,sidecar')
+    args = ap.parse_args()
+
+    results = {}
+    for layout in args.layouts.split(','):
+        print(f'running {layout}...', file=sys.stderr)
+        results[layout] = asyncio.run(run_layout(layout, args))
+    print(json.dumps({'workers': args.workers, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
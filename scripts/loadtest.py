@@ -0,0 +1,181 @@
+"""Load-test the API layer against the synthetic ML backend (no model weights).
+
+Starts uvicorn with ML_BACKEND=synthetic on a scratch SQLite DB (or targets
+--base-url). It then steps through the given concurrency levels with a mixed
+workload: text transcription, audio upload, meeting reads and task listing.
+For each level it records throughput and latency per endpoint. It also scrapes
+/metrics for event loop lag, DB pool state and executor queue depth, which
+show queueing, pool exhaustion and event loop stalls.
+
+    python scripts/loadtest.py --levels 8,32,128 --duration 20
+    ML_SYNTHETIC_SUMMARIZER_CPU_MS=lognormal:50:0.5 python scripts/loadtest.py --workers 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from bench_pipeline import synthetic_transcript, synthetic_wav
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+MIX = [('transcribe_text', 0.3), ('transcribe_audio', 0.1), ('get_meeting', 0.35), ('list_tasks', 0.25)]
+SCRAPED = ('event_loop_lag_max_seconds', 'db_pool', 'executor_queue_depth', 'executor_busy')
+
+
+def start_server(args, db_path):
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', f'sqlite:///{db_path}')
+    env.setdefault('ML_BACKEND', 'synthetic')
+    env.setdefault('ANON_MEETING_LIMIT', '1000000000')
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--host', '127.0.0.1', '--port', str(args.port),
+         '--workers', str(args.workers), '--log-level', 'warning'],
+        cwd=ROOT, env=env,
+    )
+
+
+async def wait_ready(client, timeout=120):
+    start = time.time()
+    while time.time() - start < timeout:
+        try:
+            r = await client.get('/ready')
+            if r.status_code == 200 and r.json().get('models_warm'):
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError('server did not become ready')
+
+
+def parse_metrics(text):
+    """The gauges we care about, as {name{labels}: value}."""
+    out = {}
+    for line in text.splitlines():
+        if line.startswith('#') or not line.startswith(SCRAPED):
+            continue
+        name, _, value = line.rpartition(' ')
+        out[name] = float(value)
+    return out
+
+
+async def run_level(client, concurrency, duration, ctx):
+    rnd = random.Random(concurrency)
+    names = [n for n, _ in MIX]
+    weights = [w for _, w in MIX]
+    latencies = {n: [] for n in names}
+    errors = {n: 0 for n in names}
+    snapshots = []
+    deadline = time.perf_counter() + duration
+
+    async def call(name):
+        mid = ctx['meeting_id']
+        if name == 'transcribe_text':
+            return await client.post('/api/transcribe/text', params={'meeting_id': mid, 'text': ctx['text']})
+        if name == 'transcribe_audio':
+            files = {'file': ('bench.wav', ctx['audio'], 'audio/wav')}
+            return await client.post('/api/transcribe/audio', params={'meeting_id': mid}, files=files)
+        if name == 'get_meeting':
+            return await client.get(f'/api/meetings/{mid}')
+        return await client.get('/api/tasks/', params={'meeting_id': mid})
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            name = rnd.choices(names, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                r = await call(name)
+                if r.status_code >= 400:
+                    errors[name] += 1
+            except httpx.HTTPError:
+                errors[name] += 1
+            latencies[name].append(time.perf_counter() - t0)
+
+    async def scraper():
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(1)
+            try:
+                snapshots.append(parse_metrics((await client.get('/metrics')).text))
+            except httpx.HTTPError:
+                pass
+
+    started = time.perf_counter()
+    await asyncio.gather(scraper(), *(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name, lats in latencies.items():
+        lats.sort()
+        if not lats:
+            continue
+        endpoints[name] = {
+            'requests': len(lats),
+            'errors': errors[name],
+            'p50_ms': round(lats[len(lats) // 2] * 1000, 1),
+            'p95_ms': round(lats[int(len(lats) * 0.95)] * 1000, 1),
+            'p99_ms': round(lats[min(len(lats) - 1, int(len(lats) * 0.99))] * 1000, 1),
+        }
+    total = sum(len(v) for v in latencies.values())
+    peaks = {}
+    for snap in snapshots:
+        for k, v in snap.items():
+            peaks[k] = max(peaks.get(k, v), v)
+    return {
+        'concurrency': concurrency,
+        'rps': round(total / elapsed, 1),
+        'endpoints': endpoints,
+        # with several workers each scrape hits one of them
+        'metrics_peak': peaks,
+    }
+
+
+async def run(args):
+    workdir = tempfile.mkdtemp(prefix='loadtest-')
+    server = None if args.base_url else start_server(args, os.path.join(workdir, 'load.db'))
+    base_url = args.base_url or f'http://127.0.0.1:{args.port}'
+    audio_path = synthetic_wav(os.path.join(workdir, 'load.wav'), args.audio_seconds)
+    with open(audio_path, 'rb') as f:
+        audio = f.read()
+
+    limits = httpx.Limits(max_connections=max(args.levels) + 8)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            await wait_ready(client)
+            mid = (await client.post('/api/meetings/', json={'title': 'Load test'})).json()['id']
+            await client.post(f'/api/meetings/{mid}/tasks/bulk', json=[{'title': f'task {i}'} for i in range(50)])
+            ctx = {'meeting_id': mid, 'text': synthetic_transcript(args.words), 'audio': audio}
+            levels = []
+            for c in args.levels:
+                print(f'[loadtest] concurrency {c}...', file=sys.stderr)
+                levels.append(await run_level(client, c, args.duration, ctx))
+            ready = (await client.get('/ready')).json()
+        return {'base_url': base_url, 'workers': args.workers, 'models': ready.get('models'), 'levels': levels}
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=20)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--levels', type=lambda v: [int(x) for x in v.split(',')], default=[8, 32, 128])
+    ap.add_argument('--duration', type=float, default=15)
+    ap.add_argument('--workers', type=int, default=1)
+    ap.add_argument('--port', type=int, default=8031)
+    ap.add_argument('--base-url', help='target a running server instead of starting one')
+    ap.add_argument('--words', type=int, default=600, help='transcript length for /transcribe/text')
+    ap.add_argument('--audio-seconds', type=int, default=30)
+    ap.add_argument('--timeout', type=float, default=120)
+    args = ap.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == '__main__':
+    main()